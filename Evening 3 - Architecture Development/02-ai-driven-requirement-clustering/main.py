@@ -16,6 +16,27 @@ Experiment Configuration:
     - Distance Metric: Cosine (spherical k-means)
     - Bootstrap Samples: 100 iterations per (d, k) configuration
 
+Model Comparison (python3 main.py --models MODEL [MODEL ...]):
+    - Runs the same stability sweep for every given embedding model
+    - Embeddings are cached per model and corpus; the next model is encoded
+      while the current one is being clustered
+    - A model that fails to load or cluster is recorded and skipped
+    - Writes a combined ranking of each model's best configuration
+
+Warm Start (--warm-start, --warm-start-bootstrap, report with --compare-warm-start):
+    - --warm-start: k+1 is seeded by splitting the k solution's widest cluster (single init)
+    - --warm-start-bootstrap: bootstrap fits are seeded from the full-data
+      centroids (single init), about 10x fewer k-means initializations; their
+      ARI/NMI against the full-data labels are biased upwards
+    - The comparison reports cold, k-path-warm and bootstrap-warm ARI/NMI side by side
+
+Bootstrap Plan (--bootstrap-iterations N, default 100):
+    - Resamples are drawn once (a mask of the samples each one contains) and
+      shared by every (d, k), so configurations are compared on identical
+      resamples and their paired differences have low variance
+    - Runners-up whose silhouette gap to the best exceeds 2x the paired SE are
+      flagged, so a lower N can be checked against the ranking it must support
+
 Selection Criteria:
     1. PRIMARY: Maximize Silhouette score (cluster quality)
     2. SECONDARY: Pass adaptive thresholds (p40 Silhouette, p60 DBI, 2× size ratio)
@@ -27,9 +48,14 @@ Rationale:
     - Bootstrap analysis validates statistical stability of chosen k
 """
 
+import argparse
+import hashlib
 import json
+import re
+import time
 import warnings
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
 try:
     import matplotlib
@@ -71,11 +97,15 @@ DIMENSIONS_TO_TEST = [16, 24, 32, 43]  # Max = 43 (< 44 samples)
 K_RANGE = list(range(3, 16))
 
 N_BOOTSTRAP_SAMPLES = 100
+KMEANS_N_INIT = 10
+# (mode, warm k-path, warm bootstrap fits) compared by --compare-warm-start
+WARM_START_MODES = (('cold', False, False), ('warm_k', True, False), ('warm_bootstrap', False, True))
 BOOTSTRAP_SAMPLE_RATIO = 0.8
 RANDOM_STATE = 42
 DATA_PATH = 'data/earlybird_requirements.json'
 OUTPUT_DIR = 'visualizations'
 RESULTS_DIR = 'results'
+EMBEDDING_CACHE_DIR = '.embedding_cache'
 
 # Constants for repeated strings
 TITLE_K = "Number of Clusters (k)"
@@ -90,6 +120,32 @@ def load_requirements(file_path: str = DATA_PATH) -> List[Dict[str, Any]]:
         return json.load(f)
 
 
+def fit_spherical_kmeans(embeddings: np.ndarray, k: int, random_state: int = RANDOM_STATE,
+                         init_centroids: Optional[np.ndarray] = None) -> KMeans:
+    """
+    Fit spherical k-means, from random restarts or from given centroids.
+
+    Args:
+        embeddings: L2-normalized embedding vectors (n_samples, n_features)
+        k: Number of clusters
+        random_state: Random seed
+        init_centroids: Starting centroids (k, n_features) for a single warm-started
+            run; None for KMEANS_N_INIT random restarts
+
+    Returns:
+        Fitted KMeans model (labels_, cluster_centers_)
+    """
+    # Verify nomalization
+    norms = np.linalg.norm(embeddings, axis=1)
+    assert np.allclose(norms, 1.0, atol=1e-6), "Embeddings must be L2-normalized"
+
+    if init_centroids is None:
+        kmeans = KMeans(n_clusters=k, random_state=random_state, n_init=KMEANS_N_INIT)
+    else:
+        kmeans = KMeans(n_clusters=k, random_state=random_state, init=init_centroids, n_init=1)
+    return kmeans.fit(embeddings)
+
+
 def spherical_kmeans(embeddings: np.ndarray, k: int, random_state: int = RANDOM_STATE) -> np.ndarray:
     """
     Spherical k-means clustering using cosine distance.
@@ -105,17 +161,59 @@ def spherical_kmeans(embeddings: np.ndarray, k: int, random_state: int = RANDOM_
     Returns:
         Cluster labels (n_samples,)
     """
-    # Verify nomalization
-    norms = np.linalg.norm(embeddings, axis=1)
-    assert np.allclose(norms, 1.0, atol=1e-6), "Embeddings must be L2-normalized"
+    return fit_spherical_kmeans(embeddings, k, random_state).labels_
 
-    kmeans = KMeans(n_clusters=k, random_state=random_state, n_init=10)
-    labels = kmeans.fit_predict(embeddings)
-    return labels
+
+def split_centroids(embeddings: np.ndarray, kmeans: KMeans) -> np.ndarray:
+    """
+    Seed centroids for k+1 clusters from a k-cluster fit.
+
+    The cluster with the largest within-cluster sum of squares is replaced by
+    two centroids one standard deviation apart along its principal axis.
+    """
+    labels = kmeans.labels_
+    centroids = kmeans.cluster_centers_
+    sse = [np.sum((embeddings[labels == c] - centroids[c]) ** 2) for c in range(len(centroids))]
+    target = int(np.argmax(sse))
+    members = embeddings[labels == target] - centroids[target]
+
+    if len(members) < 2:
+        # Nothing to split: start the new cluster at the point farthest from its centroid.
+        distances = np.min(np.linalg.norm(embeddings[:, None, :] - centroids[None, :, :], axis=2), axis=1)
+        return np.vstack([centroids, embeddings[np.argmax(distances)]])
+
+    _, singular_values, vt = np.linalg.svd(members, full_matrices=False)
+    offset = vt[0] * singular_values[0] / np.sqrt(len(members))
+    return np.vstack([np.delete(centroids, target, axis=0),
+                      centroids[target] + offset, centroids[target] - offset])
+
+
+def make_bootstrap_plan(n_samples: int, n_bootstrap: int = N_BOOTSTRAP_SAMPLES) -> Dict[str, np.ndarray]:
+    """
+    Draw the bootstrap resamples once for all configurations.
+
+    Resample i uses random_state RANDOM_STATE + i, as the per-configuration
+    draws did before, so results are unchanged.
+
+    Only the set of samples each resample drew is kept: duplicates carry no
+    extra information for the fits, which run on the unique samples.
+
+    Returns:
+        Dict with 'unique_masks' (n_bootstrap, n_samples) bool masks of the samples drawn
+    """
+    sample_size = int(n_samples * BOOTSTRAP_SAMPLE_RATIO)
+    unique_masks = np.zeros((n_bootstrap, n_samples), dtype=bool)
+    for i in range(n_bootstrap):
+        drawn = resample(np.arange(n_samples), n_samples=sample_size, random_state=RANDOM_STATE + i, replace=True)
+        unique_masks[i, drawn] = True
+    return {'unique_masks': unique_masks}
 
 
 def bootstrap_stability(embeddings: np.ndarray, k: int,
-                        n_bootstrap: int = N_BOOTSTRAP_SAMPLES) -> Dict[str, Any]:
+                        n_bootstrap: int = N_BOOTSTRAP_SAMPLES,
+                        labels_full: Optional[np.ndarray] = None,
+                        init_centroids: Optional[np.ndarray] = None,
+                        plan: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
     """
     Compute clustering stability via bootstrap resampling.
 
@@ -126,32 +224,44 @@ def bootstrap_stability(embeddings: np.ndarray, k: int,
         embeddings: L2-normalized embedding vectors
         k: Number of clusters
         n_bootstrap: Number of bootstrap iterations
+        labels_full: Labels of the full-data fit, if already computed
+        init_centroids: Full-data centroids to warm-start every bootstrap fit
+            from (single init each); None for random restarts. Seeded fits
+            start at the full-data solution, which biases ARI/NMI upwards.
+        plan: Shared resamples from make_bootstrap_plan; drawn here if None
 
     Returns:
-        Dict with stability metrics and all bootstrap results
+        Dict with stability metrics and all bootstrap results; 'iterations'
+        holds the plan row of every score, for paired comparisons
     """
-    n_samples = len(embeddings)
-    sample_size = int(n_samples * BOOTSTRAP_SAMPLE_RATIO)
+    if plan is None:
+        plan = make_bootstrap_plan(len(embeddings), n_bootstrap)
+    assert len(plan['unique_masks']) >= n_bootstrap, \
+        f"Bootstrap plan has {len(plan['unique_masks'])} resamples, {n_bootstrap} needed"
 
-    labels_full = spherical_kmeans(embeddings, k, random_state=RANDOM_STATE)
+    kmeans_inits = 0
+    if labels_full is None:
+        labels_full = spherical_kmeans(embeddings, k, random_state=RANDOM_STATE)
+        kmeans_inits += KMEANS_N_INIT
 
     ari_scores = []
     nmi_scores = []
     silhouette_scores = []
     db_scores = []
+    iterations = []
 
-    for i in range(n_bootstrap):
-        indices = resample(np.arange(n_samples), n_samples=sample_size,
-                           random_state=RANDOM_STATE + i, replace=True)
-        unique_indices = np.unique(indices)
+    for i, unique_mask in enumerate(plan['unique_masks'][:n_bootstrap]):
+        unique_indices = np.flatnonzero(unique_mask)
 
         if len(unique_indices) < k:
             continue
+        iterations.append(i)
 
         bootstrap_embeddings = embeddings[unique_indices]
 
-        bootstrap_labels = spherical_kmeans(bootstrap_embeddings, k,
-                                            random_state=RANDOM_STATE + i)
+        bootstrap_labels = fit_spherical_kmeans(bootstrap_embeddings, k, random_state=RANDOM_STATE + i,
+                                                init_centroids=init_centroids).labels_
+        kmeans_inits += KMEANS_N_INIT if init_centroids is None else 1
 
         ari = adjusted_rand_score(labels_full[unique_indices], bootstrap_labels)
         nmi = normalized_mutual_info_score(labels_full[unique_indices], bootstrap_labels)
@@ -178,28 +288,47 @@ def bootstrap_stability(embeddings: np.ndarray, k: int,
         'ari_scores': ari_scores,
         'nmi_scores': nmi_scores,
         'silhouette_scores': silhouette_scores,
-        'db_scores': db_scores
+        'db_scores': db_scores,
+        'iterations': iterations,
+        'kmeans_inits': kmeans_inits
     }
 
 
 def test_k_range_with_stability(embeddings: np.ndarray,
-                                k_range: List[int]) -> List[Dict[str, Any]]:
+                                k_range: List[int],
+                                warm_start: bool = False,
+                                plan: Optional[Dict[str, np.ndarray]] = None,
+                                warm_bootstrap: bool = False) -> List[Dict[str, Any]]:
     """
     Test multiple k values with bootstrap stability analysis.
 
     Args:
         embeddings: L2-normalized embedding vectors
         k_range: List of k values to test
+        warm_start: Seed the full-data k+1 fit from a split of the k fit instead
+            of random restarts
+        plan: Shared resamples from make_bootstrap_plan; every row is used
+        warm_bootstrap: Seed every bootstrap fit from the full-data centroids
+            instead of random restarts (biases ARI/NMI upwards)
 
     Returns:
         List of dictionaries containing metrics for each k value
     """
     results = []
+    previous: Optional[KMeans] = None
+    if plan is None:
+        plan = make_bootstrap_plan(len(embeddings))
+    n_bootstrap = len(plan['unique_masks'])
 
     for k in k_range:
-        print(f"    k={k}: Running {N_BOOTSTRAP_SAMPLES} bootstrap iterations...", end=' ')
+        print(f"    k={k}: Running {n_bootstrap} bootstrap iterations...", end=' ')
 
-        labels = spherical_kmeans(embeddings, k)
+        init = None
+        if warm_start and previous is not None and previous.n_clusters == k - 1:
+            init = split_centroids(embeddings, previous)
+        kmeans = fit_spherical_kmeans(embeddings, k, init_centroids=init)
+        labels = kmeans.labels_
+        previous = kmeans
 
         cos_dist = cosine_distances(embeddings)
         silhouette = silhouette_score(cos_dist, labels, metric='precomputed', random_state=RANDOM_STATE)
@@ -210,7 +339,9 @@ def test_k_range_with_stability(embeddings: np.ndarray,
         max_size = np.max(counts)
         size_ratio = max_size / median_size if median_size > 0 else np.inf
 
-        stability = bootstrap_stability(embeddings, k)
+        stability = bootstrap_stability(embeddings, k, n_bootstrap=n_bootstrap, labels_full=labels,
+                                        init_centroids=kmeans.cluster_centers_ if warm_bootstrap else None,
+                                        plan=plan)
 
         results.append({
             'k': k,
@@ -229,6 +360,7 @@ def test_k_range_with_stability(embeddings: np.ndarray,
             'db_bootstrap_mean': stability['db_mean'],
             'db_bootstrap_std': stability['db_std'],
             'labels': labels,
+            'kmeans_inits': (KMEANS_N_INIT if init is None else 1) + stability['kmeans_inits'],
             'bootstrap_data': stability
         })
 
@@ -387,16 +519,34 @@ def plot_tsne_visualization(embeddings: np.ndarray, labels: np.ndarray,
     print(f"Saved: {output_file}")
 
 
-def generate_embeddings(requirements: List[Dict[str, Any]]) -> np.ndarray:
-    """Generate and normalize embeddings from requirements text."""
-    print("\nGenerating embeddings...")
-    model = SentenceTransformer(EMBEDDING_MODEL)
-    texts = [req['text'] for req in requirements]
-    embeddings_native = model.encode(texts, show_progress_bar=False)
-    embeddings_native = embeddings_native / np.linalg.norm(embeddings_native, axis=1, keepdims=True)
+def embedding_cache_path(model_name: str, texts: Sequence[str]) -> str:
+    """Cache file for one model's embeddings of exactly these texts."""
+    digest = hashlib.sha256("\0".join(texts).encode('utf-8')).hexdigest()[:16]
+    slug = re.sub(r'[^A-Za-z0-9._-]+', '_', model_name)
+    return f"{EMBEDDING_CACHE_DIR}/{slug}-{digest}.npy"
 
-    print(f"Native embedding shape: {embeddings_native.shape}")
-    print(f"Embeddings normalized: {np.allclose(np.linalg.norm(embeddings_native, axis=1), 1.0)}")
+
+def generate_embeddings(requirements: List[Dict[str, Any]], model_name: str = EMBEDDING_MODEL,
+                        verbose: bool = True) -> np.ndarray:
+    """Generate and normalize embeddings from requirements text, cached per model and corpus."""
+    texts = [req['text'] for req in requirements]
+    cache_path = embedding_cache_path(model_name, texts)
+    if os.path.exists(cache_path):
+        embeddings_native = np.load(cache_path)
+        if verbose:
+            print(f"\nLoaded cached embeddings: {cache_path}")
+    else:
+        if verbose:
+            print("\nGenerating embeddings...")
+        model = SentenceTransformer(model_name)
+        embeddings_native = model.encode(texts, show_progress_bar=False)
+        embeddings_native = embeddings_native / np.linalg.norm(embeddings_native, axis=1, keepdims=True)
+        os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+        np.save(cache_path, embeddings_native)
+
+    if verbose:
+        print(f"Native embedding shape: {embeddings_native.shape}")
+        print(f"Embeddings normalized: {np.allclose(np.linalg.norm(embeddings_native, axis=1), 1.0)}")
 
     return embeddings_native
 
@@ -485,9 +635,8 @@ def select_global_best(all_results: Dict[int, Dict[str, Any]], thresholds: Dict[
     return best, all_configs
 
 
-def export_results_csv(all_configs: List[Dict[str, Any]]) -> str:
+def export_results_csv(all_configs: List[Dict[str, Any]], csv_path: str = f"{RESULTS_DIR}/experiment_results.csv") -> str:
     """Export all configurations to CSV, sorted by silhouette score."""
-    csv_path = f"{RESULTS_DIR}/experiment_results.csv"
     with open(csv_path, 'w', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=[
             'rank', 'd', 'k', 'ari_mean', 'ari_std', 'nmi_mean', 'nmi_std',
@@ -520,6 +669,69 @@ def export_results_csv(all_configs: List[Dict[str, Any]]) -> str:
     return csv_path
 
 
+def paired_silhouette_difference(reference: Dict[str, Any], other: Dict[str, Any]) -> Tuple[float, float, float]:
+    """
+    Compare two configurations' bootstrap silhouettes on the resamples both used.
+
+    Returns:
+        (mean of other - reference, paired standard error, unpaired standard error)
+    """
+    ref_scores = dict(zip(reference['iterations'], reference['silhouette_scores']))
+    other_scores = dict(zip(other['iterations'], other['silhouette_scores']))
+    shared = sorted(ref_scores.keys() & other_scores.keys())
+    ref = np.array([ref_scores[i] for i in shared])
+    oth = np.array([other_scores[i] for i in shared])
+    n = len(shared)
+    if n < 2:
+        return float(np.mean(oth - ref)) if n else float('nan'), float('nan'), float('nan')
+    paired_se = np.std(oth - ref, ddof=1) / np.sqrt(n)
+    unpaired_se = np.sqrt(np.var(ref, ddof=1) / n + np.var(oth, ddof=1) / n)
+    return float(np.mean(oth - ref)), float(paired_se), float(unpaired_se)
+
+
+def paired_comparison(all_results: Dict[int, Dict[str, Any]], best: Dict[str, Any],
+                      top: int = 5) -> List[Dict[str, Any]]:
+    """
+    Silhouette gap of the top runners-up to the best configuration on shared resamples.
+
+    Returns:
+        One row per runner-up; 'separated' is True when the gap exceeds twice
+        its paired standard error
+    """
+    by_config = {(d, r['k']): r['bootstrap_data'] for d, data in all_results.items() for r in data['results']}
+    reference = by_config[(best['d'], best['k'])]
+    ranked = sorted(by_config, key=lambda c: by_config[c]['silhouette_mean'], reverse=True)
+    runners_up = [c for c in ranked if c != (best['d'], best['k'])][:top]
+
+    rows = []
+    for d, k in runners_up:
+        diff, paired_se, unpaired_se = paired_silhouette_difference(reference, by_config[(d, k)])
+        rows.append({
+            'd': d,
+            'k': k,
+            'diff': diff,
+            'paired_se': paired_se,
+            'unpaired_se': unpaired_se,
+            'separated': bool(abs(diff) > 2 * paired_se)
+        })
+    return rows
+
+
+def print_paired_comparison(all_results: Dict[int, Dict[str, Any]], best: Dict[str, Any], top: int = 5) -> None:
+    """Print the silhouette gap of the runners-up to the best configuration on shared resamples."""
+    rows = paired_comparison(all_results, best, top)
+
+    print(f"\nPaired comparison against d={best['d']}, k={best['k']} (same bootstrap resamples):")
+    print(f"{'d':>4} {'k':>3} {'ΔSilh':>8} {'SE paired':>10} {'SE unpaired':>12} {'>2×SE':>6}")
+    for r in rows:
+        print(f"{r['d']:>4} {r['k']:>3} {r['diff']:>8.3f} {r['paired_se']:>10.4f} {r['unpaired_se']:>12.4f} "
+              f"{'YES' if r['separated'] else 'NO':>6}")
+    separated = sum(r['separated'] for r in rows)
+    print(f"  {separated} of {len(rows)} runners-up are more than 2× paired SE behind the best")
+    if separated < len(rows):
+        print("  Rerun with more --bootstrap-iterations to separate the rest")
+
+
 def print_global_best(best: Dict[str, Any]) -> None:
     """Print the global best configuration summary."""
     print("\nGLOBAL BEST CONFIGURATION:")
@@ -535,8 +747,281 @@ def print_global_best(best: Dict[str, Any]) -> None:
     print(f"  Passes Criteria: {best['passes']}")
 
 
-def main() -> None:
+def run_dimension_sweep(embeddings_native: np.ndarray, warm_start: bool = False,
+                        n_bootstrap: int = N_BOOTSTRAP_SAMPLES,
+                        warm_bootstrap: bool = False) -> Dict[int, Dict[str, Any]]:
+    """PCA-reduce to every tested dimension and run the k-range stability analysis on each."""
+    all_results: Dict[int, Dict[str, Any]] = {}
+    plan = make_bootstrap_plan(len(embeddings_native), n_bootstrap)
+
+    for d in DIMENSIONS_TO_TEST:
+        print(f"\n{'=' * 80}")
+        print(f"TESTING DIMENSION: {d}")
+        print(f"{'=' * 80}")
+
+        print(f"Applying PCA to reduce to {d} dimensions...")
+        pca = PCA(n_components=d, random_state=RANDOM_STATE)
+        embeddings = pca.fit_transform(embeddings_native)
+        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        exp_var = np.sum(pca.explained_variance_ratio_) * 100
+        print(f"Explained variance: {exp_var:.1f}%")
+
+        print("Testing k values with bootstrap stability analysis:")
+        results = test_k_range_with_stability(embeddings, K_RANGE, warm_start=warm_start, plan=plan,
+                                              warm_bootstrap=warm_bootstrap)
+        all_results[d] = {
+            'results': results,
+            'embeddings': embeddings,
+            'explained_variance': exp_var
+        }
+
+    return all_results
+
+
+def compare_models(requirements: List[Dict[str, Any]], model_names: Sequence[str],
+                   warm_start: bool = False, n_bootstrap: int = N_BOOTSTRAP_SAMPLES,
+                   warm_bootstrap: bool = False) -> List[Dict[str, Any]]:
+    """
+    Run the stability sweep for several embedding models and rank their best configurations.
+
+    Encoding runs on a background thread one model ahead of the sweep: the
+    next model is submitted when the current one is taken, so it is encoded
+    (or loaded from the cache) while the current one is clustered and at most
+    two models' embeddings are held at a time. Thresholds are adaptive per
+    model, as in the single-model run. A model that fails to encode or cluster
+    is reported and the comparison continues with the next one.
+
+    Returns:
+        One row per model, ranked: passing configurations first, then by
+        silhouette; failed models last, with only 'model' and 'error' set
+    """
+    def encode(model_name: str) -> Tuple[np.ndarray, float]:
+        started = time.perf_counter()
+        return generate_embeddings(requirements, model_name, verbose=False), time.perf_counter() - started
+
+    def sweep(model_name: str, embeddings_native: np.ndarray, encode_seconds: float) -> Dict[str, Any]:
+        print(f"\n{'=' * 80}")
+        print(f"MODEL: {model_name} ({embeddings_native.shape[1]}d native, encoded in {encode_seconds:.1f}s)")
+        print(f"{'=' * 80}")
+
+        started = time.perf_counter()
+        all_results = run_dimension_sweep(embeddings_native, warm_start=warm_start, n_bootstrap=n_bootstrap,
+                                          warm_bootstrap=warm_bootstrap)
+        thresholds = compute_adaptive_thresholds(all_results)
+        best, all_configs = select_global_best(all_results, thresholds)
+        sweep_seconds = time.perf_counter() - started
+
+        slug = re.sub(r'[^A-Za-z0-9._-]+', '_', model_name)
+        export_results_csv(all_configs, f"{RESULTS_DIR}/experiment_results_{slug}.csv")
+        return {
+            'model': model_name,
+            'native_dimension': int(embeddings_native.shape[1]),
+            'encode_seconds': encode_seconds,
+            'sweep_seconds': sweep_seconds,
+            'passing_configs': sum(1 for c in all_configs if c['passes']),
+            **best,
+        }
+
+    rows = []
+    failed = []
+    with ThreadPoolExecutor(max_workers=1) as encoder:
+        pending = encoder.submit(encode, model_names[0]) if model_names else None
+        for position, model_name in enumerate(model_names):
+            current = pending
+            pending = encoder.submit(encode, model_names[position + 1]) if position + 1 < len(model_names) else None
+            try:
+                rows.append(sweep(model_name, *current.result()))
+            except Exception as e:
+                print(f"\nSkipping {model_name}: {type(e).__name__}: {e}")
+                failed.append({'model': model_name, 'error': f"{type(e).__name__}: {e}"})
+
+    rows.sort(key=lambda r: (r['passes'], r['silhouette']), reverse=True)
+    return rows + failed
+
+
+def export_model_comparison_csv(rows: List[Dict[str, Any]]) -> str:
+    """Export the per-model best configurations in ranking order; failed models are listed unranked."""
+    csv_path = f"{RESULTS_DIR}/model_comparison.csv"
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=[
+            'rank', 'model', 'native_dimension', 'd', 'k', 'silhouette', 'silhouette_std',
+            'ari_mean', 'nmi_mean', 'davies_bouldin', 'size_ratio', 'passes', 'passing_configs',
+            'encode_seconds', 'sweep_seconds', 'error'
+        ])
+        writer.writeheader()
+        for i, r in enumerate(rows, 1):
+            if 'error' in r:
+                writer.writerow({'model': r['model'], 'error': r['error']})
+                continue
+            writer.writerow({
+                'rank': i,
+                'model': r['model'],
+                'native_dimension': r['native_dimension'],
+                'd': r['d'],
+                'k': r['k'],
+                'silhouette': round(r['silhouette'], 3),
+                'silhouette_std': round(r['silhouette_std'], 3),
+                'ari_mean': round(r['ari_mean'], 3),
+                'nmi_mean': round(r['nmi_mean'], 3),
+                'davies_bouldin': round(r['davies_bouldin'], 2),
+                'size_ratio': round(r['size_ratio'], 2),
+                'passes': 'YES' if r['passes'] else 'NO',
+                'passing_configs': r['passing_configs'],
+                'encode_seconds': round(r['encode_seconds'], 1),
+                'sweep_seconds': round(r['sweep_seconds'], 1)
+            })
+
+    print(f"\nSaved: {csv_path}")
+    return csv_path
+
+
+def print_model_comparison(rows: List[Dict[str, Any]]) -> None:
+    """Print the combined model ranking table."""
+    width = max(len('Model'), *(len(r['model']) for r in rows))
+    print(f"\n{'#':>2} {'Model':<{width}} {'Native':>6} {'d':>3} {'k':>3} {'Silh':>7} {'ARI':>7} "
+          f"{'NMI':>7} {'DB':>6} {'Pass':>5}")
+    print("-" * (width + 56))
+    for i, r in enumerate(rows, 1):
+        if 'error' in r:
+            print(f"{'-':>2} {r['model']:<{width}} FAILED: {r['error']}")
+            continue
+        print(f"{i:>2} {r['model']:<{width}} {r['native_dimension']:>6} {r['d']:>3} {r['k']:>3} "
+              f"{r['silhouette']:>7.3f} {r['ari_mean']:>7.3f} {r['nmi_mean']:>7.3f} "
+              f"{r['davies_bouldin']:>6.2f} {'YES' if r['passes'] else 'NO':>5}")
+
+
+def run_model_comparison(model_names: Sequence[str], warm_start: bool = False,
+                         n_bootstrap: int = N_BOOTSTRAP_SAMPLES, warm_bootstrap: bool = False) -> None:
+    """Execute the stability sweep for several embedding models and rank them."""
+    print("=" * 80)
+    print("EMBEDDING MODEL COMPARISON")
+    print("=" * 80)
+
+    requirements = load_requirements()
+    print(f"\nLoaded {len(requirements)} requirements")
+    print(f"Models: {', '.join(model_names)}")
+    print(f"Dimensions to test: {DIMENSIONS_TO_TEST}, cluster range (k): {K_RANGE}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    started = time.perf_counter()
+    rows = compare_models(requirements, model_names, warm_start=warm_start, n_bootstrap=n_bootstrap,
+                          warm_bootstrap=warm_bootstrap)
+
+    print(f"\n{'=' * 80}")
+    print("MODEL RANKING (best configuration per model)")
+    print(f"{'=' * 80}")
+    print_model_comparison(rows)
+    export_model_comparison_csv(rows)
+    failed = sum(1 for r in rows if 'error' in r)
+    print(f"\nCompared {len(rows) - failed} models in {time.perf_counter() - started:.1f}s"
+          + (f" ({failed} failed)" if failed else ""))
+
+
+def compare_warm_start(embeddings_native: np.ndarray, n_bootstrap: int = N_BOOTSTRAP_SAMPLES) -> List[Dict[str, Any]]:
+    """
+    Run the sweep cold, with a warm k-path and with warm bootstrap fits, and compare every (d, k).
+
+    The warm k-path only changes the full-data fits, so its ARI/NMI are
+    directly comparable to the cold ones. Warm bootstrap fits start at the
+    full-data solution, so their ARI/NMI against it are biased upwards; the
+    report shows that bias next to the cold values.
+
+    Returns:
+        One row per (d, k) with the metrics of every mode
+    """
+    sweeps = {}
+    for mode, warm_start, warm_bootstrap in WARM_START_MODES:
+        print(f"\n{'#' * 80}")
+        print(f"{mode.upper().replace('_', ' ')}")
+        print(f"{'#' * 80}")
+        started = time.perf_counter()
+        all_results = run_dimension_sweep(embeddings_native, warm_start=warm_start, warm_bootstrap=warm_bootstrap,
+                                          n_bootstrap=n_bootstrap)
+        seconds = time.perf_counter() - started
+        best, _ = select_global_best(all_results, compute_adaptive_thresholds(all_results))
+        sweeps[mode] = (all_results, best, seconds)
+
+    modes = [mode for mode, _, _ in WARM_START_MODES]
+    rows = []
+    for d in DIMENSIONS_TO_TEST:
+        for results in zip(*(sweeps[mode][0][d]['results'] for mode in modes)):
+            by_mode = dict(zip(modes, results))
+            row: Dict[str, Any] = {'d': d, 'k': by_mode['cold']['k']}
+            for key, metric in (('silhouette', 'silhouette'), ('silhouette_bootstrap', 'silhouette_bootstrap_mean'),
+                                ('ari', 'ari_mean'), ('nmi', 'nmi_mean'), ('inits', 'kmeans_inits')):
+                for mode in modes:
+                    row[f"{mode}_{key}"] = by_mode[mode][metric]
+            row['labels_ari'] = adjusted_rand_score(by_mode['cold']['labels'], by_mode['warm_k']['labels'])
+            rows.append(row)
+
+    inits = {mode: sum(r[f"{mode}_inits"] for r in rows) for mode in modes}
+    print(f"\n{'=' * 80}")
+    print("WARM START VS COLD START")
+    print(f"{'=' * 80}")
+    print(f"\n{'':>7} {'Silhouette':^21} {'ARI':^26} {'NMI':^26}")
+    print(f"{'d':>3} {'k':>3} {'cold':>10} {'k-path':>10} {'cold':>8} {'k-path':>8} {'boot':>8} "
+          f"{'cold':>8} {'k-path':>8} {'boot':>8} {'Agree':>6}")
+    print("-" * 92)
+    for r in rows:
+        print(f"{r['d']:>3} {r['k']:>3} {r['cold_silhouette']:>10.3f} {r['warm_k_silhouette']:>10.3f} "
+              f"{r['cold_ari']:>8.3f} {r['warm_k_ari']:>8.3f} {r['warm_bootstrap_ari']:>8.3f} "
+              f"{r['cold_nmi']:>8.3f} {r['warm_k_nmi']:>8.3f} {r['warm_bootstrap_nmi']:>8.3f} "
+              f"{r['labels_ari']:>6.2f}")
+
+    ari_bias = np.mean([r['warm_bootstrap_ari'] - r['cold_ari'] for r in rows])
+    nmi_bias = np.mean([r['warm_bootstrap_nmi'] - r['cold_nmi'] for r in rows])
+    print(f"\nWarm bootstrap bias (mean over all (d, k)): ARI {ari_bias:+.3f}, NMI {nmi_bias:+.3f}")
+    for mode in modes:
+        best, seconds = sweeps[mode][1], sweeps[mode][2]
+        print(f"  {mode:<15} best d={best['d']}, k={best['k']} (Silhouette {best['silhouette']:.3f}), "
+              f"{inits[mode]:,} k-means initializations ({inits['cold'] / max(inits[mode], 1):.1f}x fewer), "
+              f"{seconds:.1f}s")
+
+    csv_path = f"{RESULTS_DIR}/warm_start_comparison.csv"
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        for r in rows:
+            writer.writerow({key: round(value, 3) if isinstance(value, float) else value for key, value in r.items()})
+    print(f"\nSaved: {csv_path}")
+
+    return rows
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bootstrap stability-based requirements clustering")
+    parser.add_argument("--models", nargs="+", metavar="MODEL",
+                        help="Compare these sentence-transformers models (names or local paths) "
+                             "instead of running the single-model experiment")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="Seed each full-data k+1 fit from a split of the k fit")
+    parser.add_argument("--warm-start-bootstrap", action="store_true",
+                        help="Seed bootstrap fits from the full-data centroids (about 10x fewer fits; "
+                             "biases ARI/NMI upwards)")
+    parser.add_argument("--compare-warm-start", action="store_true",
+                        help="Run the sweep cold, with a warm k-path and with warm bootstrap fits, "
+                             "and report the differences")
+    parser.add_argument("--bootstrap-iterations", type=int, default=N_BOOTSTRAP_SAMPLES, metavar="N",
+                        help="Bootstrap resamples per (d, k); the paired comparison shows whether N "
+                             "still separates the best configuration from the runners-up")
+    args = parser.parse_args(argv)
+    if args.bootstrap_iterations < 2:
+        parser.error("--bootstrap-iterations must be at least 2 for a standard error")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
     """Execute bootstrap stability-based clustering experiment."""
+    args = parse_args(argv)
+    if args.models:
+        run_model_comparison(args.models, warm_start=args.warm_start, n_bootstrap=args.bootstrap_iterations,
+                             warm_bootstrap=args.warm_start_bootstrap)
+        return
+    if args.compare_warm_start:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        compare_warm_start(generate_embeddings(load_requirements()), n_bootstrap=args.bootstrap_iterations)
+        return
+
     print("=" * 80)
     print("BOOTSTRAP STABILITY-BASED REQUIREMENTS CLUSTERING")
     print("Spherical K-Means with Adaptive Quality Thresholds")
@@ -550,8 +1035,10 @@ def main() -> None:
     print(f"  Native dimension: {NATIVE_DIMENSION}d")
     print(f"  Dimensions to test: {DIMENSIONS_TO_TEST}")
     print(f"  Cluster range (k): {K_RANGE}")
-    print(f"  Bootstrap iterations: {N_BOOTSTRAP_SAMPLES}")
+    print(f"  Bootstrap iterations: {args.bootstrap_iterations}")
     print(f"  Bootstrap sample ratio: {BOOTSTRAP_SAMPLE_RATIO}")
+    print(f"  Warm start: k-path {'yes' if args.warm_start else 'no'}, "
+          f"bootstrap {'yes' if args.warm_start_bootstrap else 'no'}")
     print("\nSelection Strategy:")
     print("  1. PRIMARY: Cluster quality (maximize Silhouette score)")
     print("  2. SECONDARY: Pass adaptive thresholds (p40 Silhouette, p60 DBI, 2× size ratio)")
@@ -562,27 +1049,9 @@ def main() -> None:
 
     embeddings_native = generate_embeddings(requirements)
 
-    all_results: Dict[int, Dict[str, Any]] = {}
-
-    for d in DIMENSIONS_TO_TEST:
-        print(f"\n{'=' * 80}")
-        print(f"TESTING DIMENSION: {d}")
-        print(f"{'=' * 80}")
-
-        print(f"Applying PCA to reduce to {d} dimensions...")
-        pca = PCA(n_components=d, random_state=RANDOM_STATE)
-        embeddings = pca.fit_transform(embeddings_native)
-        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
-        exp_var = np.sum(pca.explained_variance_ratio_) * 100
-        print(f"Explained variance: {exp_var:.1f}%")
-
-        print("Testing k values with bootstrap stability analysis:")
-        results = test_k_range_with_stability(embeddings, K_RANGE)
-        all_results[d] = {
-            'results': results,
-            'embeddings': embeddings,
-            'explained_variance': exp_var
-        }
+    all_results = run_dimension_sweep(embeddings_native, warm_start=args.warm_start,
+                                      n_bootstrap=args.bootstrap_iterations,
+                                      warm_bootstrap=args.warm_start_bootstrap)
 
     print(f"\n{'=' * 80}")
     print("COMPUTING ADAPTIVE THRESHOLDS")
@@ -606,6 +1075,7 @@ def main() -> None:
 
     best, all_configs = select_global_best(all_results, thresholds)
     print_global_best(best)
+    print_paired_comparison(all_results, best)
 
     csv_path = export_results_csv(all_configs)
 
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Asynchronous variant of the Qdrant ingest: requirement chunks are vectorised in a
+process pool while earlier chunks are uploaded through the async Qdrant client.
+
+A bounded queue of in-flight chunks provides backpressure, so memory stays flat
+when vectorisation runs ahead of the upload.
+
+The uploads only overlap with vectorisation against a Qdrant server. The local
+mode async client runs every call synchronously on the event loop, so in local
+mode --compare measures about 1.0x; use it with --transport http or grpc.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from qdrant_connection import (
+    LOCAL_PATH,
+    AnyAsyncClient,
+    AnyClient,
+    ClientSettings,
+    add_client_arguments,
+    close_async_clients,
+    get_async_client,
+    get_client,
+    print_metrics,
+    settings_from_args,
+)
+from qdrant_ingest import (
+    COLLECTION_NAME,
+    PAYLOAD_INDEXES,
+    Requirement,
+    VECTORIZER_MODES,
+    Vectorizer,
+    assign_cluster_labels,
+    build_batch,
+    collection_params,
+    create_payload_indexes,
+    embed_requirements,
+    is_local,
+    load_requirements,
+    make_vectorizer,
+    resolve_vectorizer,
+    synthetic_corpus,
+    to_unit_vectors,
+    vector_size,
+)
+
+CHUNK_SIZE = 1000
+QUEUE_SIZE = 4
+N_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+_worker_vectorizer: Optional[Vectorizer] = None
+
+
+def _init_worker(vectorizer: Vectorizer) -> None:
+    global _worker_vectorizer
+    _worker_vectorizer = vectorizer
+
+
+def _vectorise_chunk(texts: List[str]) -> np.ndarray:
+    assert _worker_vectorizer is not None, "worker started without a fitted vectorizer"
+    return to_unit_vectors(_worker_vectorizer.transform(texts))
+
+
+async def _produce(
+        pool: ProcessPoolExecutor,
+        requirements: Sequence[Requirement],
+        chunk_size: int,
+        queue: asyncio.Queue,
+) -> None:
+    loop = asyncio.get_running_loop()
+    for start in range(0, len(requirements), chunk_size):
+        texts = [req.text for req in requirements[start:start + chunk_size]]
+        # put() blocks while QUEUE_SIZE chunks are already in flight.
+        await queue.put((start, loop.run_in_executor(pool, _vectorise_chunk, texts)))
+    await queue.put(None)
+
+
+async def _consume(
+        client: AnyAsyncClient,
+        requirements: Sequence[Requirement],
+        assignments: Sequence[Tuple[int, str]],
+        queue: asyncio.Queue,
+        collection_name: str,
+) -> int:
+    uploaded = 0
+    while (item := await queue.get()) is not None:
+        start, pending = item
+        embeddings = await pending
+        end = start + len(embeddings)
+        batch = build_batch(requirements[start:end], embeddings, assignments[start:end], first_id=start)
+        await client.upsert(collection_name=collection_name, points=batch, wait=True)
+        uploaded += len(batch.ids)
+    return uploaded
+
+
+async def ingest_async(
+        requirements: Sequence[Requirement],
+        assignments: Sequence[Tuple[int, str]],
+        client: Optional[AnyAsyncClient] = None,
+        collection_name: str = COLLECTION_NAME,
+        chunk_size: int = CHUNK_SIZE,
+        queue_size: int = QUEUE_SIZE,
+        workers: int = N_WORKERS,
+        quantization: str = "none",
+        on_disk: bool = False,
+        vectorizer: Optional[Vectorizer] = None,
+) -> AnyAsyncClient:
+    """
+    Vectorise and upload ``requirements`` with overlapping stages.
+
+    Without ``vectorizer`` the TF-IDF vocabulary is fitted once on the whole
+    corpus, so the stored vectors match the sequential ``embed_requirements``
+    path exactly. A persisted or hashing vectorizer skips that fit.
+    """
+    vectorizer = vectorizer or make_vectorizer().fit([req.text for req in requirements])
+    client = client or AsyncQdrantClient(location=":memory:")
+
+    if await client.collection_exists(collection_name):
+        await client.delete_collection(collection_name)
+    await client.create_collection(
+        collection_name=collection_name,
+        **collection_params(vector_size(vectorizer), quantization, on_disk),
+    )
+    if not is_local(client):
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            await client.create_payload_index(collection_name, field_name=field_name, field_schema=field_schema)
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(vectorizer,)) as pool:
+        producer = asyncio.create_task(_produce(pool, requirements, chunk_size, queue))
+        consumer = asyncio.create_task(_consume(client, requirements, assignments, queue, collection_name))
+        try:
+            await asyncio.gather(producer, consumer)
+        except BaseException:
+            # A failed stage never hands over (or takes) the end marker: cancel the other instead of waiting on it.
+            producer.cancel()
+            consumer.cancel()
+            await asyncio.gather(producer, consumer, return_exceptions=True)
+            raise
+        uploaded = consumer.result()
+
+    if uploaded != len(requirements):
+        raise RuntimeError(f"Uploaded {uploaded} of {len(requirements)} requirements.")
+    return client
+
+
+def ingest_sequential(
+        requirements: Sequence[Requirement],
+        assignments: Sequence[Tuple[int, str]],
+        client: Optional[AnyClient] = None,
+        collection_name: str = COLLECTION_NAME,
+        chunk_size: int = CHUNK_SIZE,
+        quantization: str = "none",
+        on_disk: bool = False,
+        vectorizer: Optional[Vectorizer] = None,
+) -> AnyClient:
+    """
+    Baseline for ``ingest_async``: vectorise everything, then upload it chunk by
+    chunk with the same ``upsert`` of a ``Batch`` per chunk, so only the
+    overlap of the two stages differs.
+    """
+    vectorizer = vectorizer or make_vectorizer().fit([req.text for req in requirements])
+    embeddings = embed_requirements(requirements, vectorizer)
+    client = client or QdrantClient(path=":memory:")
+
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    client.create_collection(
+        collection_name=collection_name,
+        **collection_params(vector_size(vectorizer), quantization, on_disk),
+    )
+    create_payload_indexes(client, collection_name)
+
+    for start in range(0, len(requirements), chunk_size):
+        end = start + chunk_size
+        batch = build_batch(requirements[start:end], embeddings[start:end], assignments[start:end], first_id=start)
+        client.upsert(collection_name=collection_name, points=batch, wait=True)
+    return client
+
+
+async def ingest_pooled(
+        requirements: Sequence[Requirement],
+        assignments: Sequence[Tuple[int, str]],
+        settings: ClientSettings,
+        report_metrics: bool = False,
+        **options,
+) -> int:
+    """``ingest_async`` through the pooled async client for ``settings``, closed again on this event loop.
+
+    Returns the number of points stored in the collection afterwards.
+    """
+    try:
+        client = await ingest_async(requirements, assignments, client=get_async_client(settings), **options)
+        stored = await client.count(options.get("collection_name", COLLECTION_NAME), exact=True)
+        return stored.count
+    finally:
+        if report_metrics:
+            print_metrics()
+        await close_async_clients()
+
+
+def compare_throughput(
+        requirements: Sequence[Requirement],
+        assignments: Sequence[Tuple[int, str]],
+        chunk_size: int = CHUNK_SIZE,
+        queue_size: int = QUEUE_SIZE,
+        workers: int = N_WORKERS,
+        settings: Optional[ClientSettings] = None,
+        report_metrics: bool = False,
+        vectorizer: Optional[Vectorizer] = None,
+) -> Dict[str, float]:
+    """Time the sequential and the pipelined ingest; with ``settings`` both use the pooled clients.
+
+    Both paths use ``vectorizer``; without one each fits TF-IDF itself, inside its timing.
+    """
+    started = time.perf_counter()
+    ingest_sequential(requirements, assignments, client=get_client(settings) if settings is not None else None,
+                      chunk_size=chunk_size, vectorizer=vectorizer)
+    sequential = time.perf_counter() - started
+
+    options = dict(chunk_size=chunk_size, queue_size=queue_size, workers=workers, vectorizer=vectorizer)
+    started = time.perf_counter()
+    if settings is not None:
+        asyncio.run(ingest_pooled(requirements, assignments, settings, report_metrics, **options))
+    else:
+        asyncio.run(ingest_async(requirements, assignments, **options))
+    pipelined = time.perf_counter() - started
+
+    n = len(requirements)
+    return {
+        "points": n,
+        "sequential_points_per_sec": n / sequential,
+        "async_points_per_sec": n / pipelined,
+        "speedup": sequential / pipelined,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pipelined async ingest of requirements into Qdrant")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Ingest N synthetic variants of the EarlyBird requirements instead of the originals")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Requirements per vectorised chunk")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="Maximum chunks in flight")
+    parser.add_argument("--workers", type=int, default=N_WORKERS, help="Vectoriser processes")
+    parser.add_argument("--vectorizer", choices=VECTORIZER_MODES, default="fit",
+                        help="Fit TF-IDF on the corpus first, reuse the persisted TF-IDF vocabulary, "
+                             "or stream through the stateless hashing vectorizer")
+    parser.add_argument("--compare", action="store_true",
+                        help="Only time the sequential and the pipelined ingest and report the speedup; "
+                             "the pipeline overlaps uploads against a server only")
+    add_client_arguments(parser)
+    args = parser.parse_args(argv)
+    if not args.compare and args.transport == "local" and args.qdrant_path == LOCAL_PATH:
+        parser.error("an ingest into the in-memory store is discarded on exit: "
+                     "pass --qdrant-path DIR or a server --transport, or --compare to only time it")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    requirements = load_requirements()
+    if args.synthetic:
+        requirements, assignments = synthetic_corpus(requirements, args.synthetic)
+    else:
+        assignments = assign_cluster_labels(requirements)
+
+    settings = settings_from_args(args)
+    vectorizer = resolve_vectorizer(args.vectorizer, requirements) if args.vectorizer != "fit" else None
+    if args.compare:
+        report = compare_throughput(requirements, assignments, args.chunk_size, args.queue_size, args.workers,
+                                    settings=settings, report_metrics=args.metrics, vectorizer=vectorizer)
+        print(f"Ingested {report['points']} requirements")
+        print(f"  sequential: {report['sequential_points_per_sec']:,.0f} points/sec")
+        print(f"  async:      {report['async_points_per_sec']:,.0f} points/sec ({report['speedup']:.2f}x)")
+        if settings.transport == "local":
+            print("  (local mode runs async calls synchronously; compare against a server for the upload overlap)")
+        return
+
+    started = time.perf_counter()
+    stored = asyncio.run(ingest_pooled(requirements, assignments, settings, args.metrics, chunk_size=args.chunk_size,
+                                       queue_size=args.queue_size, workers=args.workers, vectorizer=vectorizer))
+    elapsed = time.perf_counter() - started
+    target = settings.path if settings.transport == "local" else settings.url
+    print(f"Ingested {len(requirements)} requirements in {elapsed:.2f}s "
+          f"({len(requirements) / elapsed:,.0f} points/sec)")
+    print(f"Collection {COLLECTION_NAME} at {target} now holds {stored} points")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Ingest requirements that are missing from COMPONENT_REQUIREMENT_IDS instead of
+rejecting them: the mapped requirements are uploaded first, then every unmapped
+requirement is assigned the component that wins a similarity-weighted vote among
+its nearest hand-labelled neighbours.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from qdrant_ingest import (
+    COLLECTION_NAME,
+    Requirement,
+    assign_cluster_labels,
+    build_payload,
+    load_requirements,
+    make_vectorizer,
+    partition_labelled,
+    synthetic_corpus,
+    to_unit_vectors,
+    upload_to_qdrant,
+)
+from qdrant_connection import AnyClient, add_client_arguments, get_client, print_metrics, settings_from_args
+from qdrant_search import query_batches
+
+K_NEIGHBOURS = 7
+
+# Votes only come from hand-labelled points, so predictions never feed on predictions.
+HAND_LABELLED = qmodels.Filter(
+    must_not=[qmodels.FieldCondition(key="auto_labelled", match=qmodels.MatchValue(value=True))]
+)
+
+
+@dataclass(frozen=True)
+class Vote:
+    req_id: str
+    cluster_id: int
+    label: str
+    margin: float
+
+
+def tally(req_id: str, neighbours: Sequence[qmodels.ScoredPoint]) -> Vote:
+    """
+    Similarity-weighted majority vote over ``neighbours``.
+
+    ``margin`` is the winner's share of the total vote weight minus the
+    runner-up's share: 1.0 for a unanimous vote, near 0.0 for a tie.
+    """
+    if not neighbours:
+        raise ValueError(f"No labelled neighbours found for requirement {req_id}.")
+
+    weights: Dict[Tuple[int, str], float] = defaultdict(float)
+    for point in neighbours:
+        weights[(point.payload["cluster_id"], point.payload["label"])] += point.score if point.score > 0 else 0.0
+    if not any(weights.values()):
+        # No vocabulary overlap with any neighbour: fall back to a plain count.
+        for point in neighbours:
+            weights[(point.payload["cluster_id"], point.payload["label"])] += 1.0
+
+    ranked = sorted(weights.items(), key=lambda kv: (-kv[1], kv[0][0]))
+    total = sum(weights.values())
+    runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+    (cluster_id, label), top = ranked[0]
+    return Vote(req_id=req_id, cluster_id=int(cluster_id), label=label, margin=(top - runner_up) / total)
+
+
+def knn_vote(
+        client: QdrantClient,
+        requirements: Sequence[Requirement],
+        embeddings: np.ndarray,
+        k: int = K_NEIGHBOURS,
+        collection_name: str = COLLECTION_NAME,
+) -> List[Vote]:
+    requests = [
+        qmodels.QueryRequest(
+            query=vector.tolist(),
+            filter=HAND_LABELLED,
+            limit=k,
+            with_payload=["cluster_id", "label"],
+        )
+        for vector in embeddings
+    ]
+    results = query_batches(client, requests, collection_name)
+    return [tally(req.req_id, neighbours) for req, neighbours in zip(requirements, results)]
+
+
+def upload_auto_labelled(
+        client: QdrantClient,
+        requirements: Sequence[Requirement],
+        embeddings: np.ndarray,
+        votes: Sequence[Vote],
+        first_id: int,
+        collection_name: str = COLLECTION_NAME,
+) -> None:
+    payloads = []
+    for req, vote in zip(requirements, votes):
+        payload = build_payload(req, (vote.cluster_id, vote.label))
+        payload.update(auto_labelled=True, vote_margin=vote.margin)
+        payloads.append(payload)
+    client.upsert(
+        collection_name=collection_name,
+        points=qmodels.Batch(
+            ids=list(range(first_id, first_id + len(requirements))),
+            vectors=embeddings.astype(np.float32).tolist(),
+            payloads=payloads,
+        ),
+        wait=True,
+    )
+
+
+def ingest_with_auto_labels(
+        labelled: Sequence[Requirement],
+        labelled_assignments: Sequence[Tuple[int, str]],
+        unlabelled: Sequence[Requirement],
+        k: int = K_NEIGHBOURS,
+        client: Optional[AnyClient] = None,
+) -> Tuple[AnyClient, List[Vote]]:
+    """Upload ``labelled`` as-is, then vote and upload ``unlabelled`` with ``auto_labelled`` set."""
+    if not labelled:
+        raise ValueError("At least one hand-labelled requirement is needed to vote on the others.")
+
+    vectorizer = make_vectorizer().fit([req.text for req in [*labelled, *unlabelled]])
+    labelled_embeddings = to_unit_vectors(vectorizer.transform([req.text for req in labelled]))
+    client = upload_to_qdrant(list(labelled), labelled_embeddings, list(labelled_assignments), client=client)
+    if not unlabelled:
+        return client, []
+
+    unlabelled_embeddings = to_unit_vectors(vectorizer.transform([req.text for req in unlabelled]))
+    votes = knn_vote(client, unlabelled, unlabelled_embeddings, k=k)
+    upload_auto_labelled(client, unlabelled, unlabelled_embeddings, votes, first_id=len(labelled))
+    return client, votes
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ingest requirements, auto-labelling unmapped ones by kNN vote")
+    parser.add_argument("-k", type=int, default=K_NEIGHBOURS, help="Labelled neighbours per vote")
+    parser.add_argument("--holdout", nargs="*", default=[],
+                        help="Treat these mapped requirement IDs as unlabelled and score the predictions")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Add N unlabelled synthetic requirements and score the predictions")
+    add_client_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    requirements = load_requirements()
+    labelled, unlabelled = partition_labelled(requirements)
+    expected: Dict[str, str] = {}
+
+    if args.holdout:
+        held_out = set(args.holdout)
+        for req, (_, label) in zip(labelled, assign_cluster_labels(labelled)):
+            if req.req_id in held_out:
+                expected[req.req_id] = label
+        unlabelled += [req for req in labelled if req.req_id in held_out]
+        labelled = [req for req in labelled if req.req_id not in held_out]
+    if args.synthetic:
+        synthetic, synthetic_assignments = synthetic_corpus(labelled, args.synthetic)
+        expected.update((req.req_id, label) for req, (_, label) in zip(synthetic, synthetic_assignments))
+        unlabelled += synthetic
+
+    _, votes = ingest_with_auto_labels(labelled, assign_cluster_labels(labelled), unlabelled, k=args.k,
+                                       client=get_client(settings_from_args(args)))
+    print(f"Ingested {len(labelled)} mapped and {len(votes)} auto-labelled requirements")
+
+    for vote in votes[:20]:
+        print(f"  - {vote.req_id}: {vote.label} (margin {vote.margin:.2f})")
+    if len(votes) > 20:
+        print(f"  ... {len(votes) - 20} more")
+
+    scored = [vote for vote in votes if vote.req_id in expected]
+    if scored:
+        correct = sum(vote.label == expected[vote.req_id] for vote in scored)
+        print(f"\nAccuracy on {len(scored)} requirements with known components: {correct / len(scored):.1%}")
+        confident = [vote for vote in scored if vote.margin >= 0.5]
+        if confident:
+            correct = sum(vote.label == expected[vote.req_id] for vote in confident)
+            print(f"  margin >= 0.5: {correct / len(confident):.1%} of {len(confident)}")
+    if args.metrics:
+        print_metrics()
+
+
+if __name__ == "__main__":
+    main()
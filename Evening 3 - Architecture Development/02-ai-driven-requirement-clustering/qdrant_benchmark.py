@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Ingest and query benchmark for the Qdrant layer.
+
+Synthetic requirement corpora (variants of the EarlyBird requirements) are
+streamed through the hashing vectoriser into dense, quantized and sparse
+collections, in local mode and against a Qdrant server when one is reachable.
+Per configuration the harness records ingest and scroll throughput, search
+latency percentiles and client-side memory estimates (the server's own memory
+is not measured), and writes everything as JSON so runs can be diffed across
+releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+from importlib.metadata import version
+from pathlib import Path
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from qdrant_connection import (
+    GRPC_PORT,
+    AnyClient,
+    ClientSettings,
+    close_clients,
+    get_client,
+    print_metrics,
+)
+from qdrant_ingest import (
+    Requirement,
+    build_payload,
+    collection_params,
+    is_local,
+    load_requirements,
+    make_hashing_vectorizer,
+    search_params,
+    stream_embeddings,
+    synthetic_corpus,
+    vector_memory_bytes,
+)
+from qdrant_hybrid import SPARSE_VECTOR, sparse_vectors
+
+SIZES = [1_000, 10_000]
+CONFIGURATIONS = ("dense", "dense-scalar", "dense-binary", "sparse")
+N_QUERIES = 200
+TOP_K = 10
+CHUNK_SIZE = 1000
+SERVER_URL = "http://localhost:6333"
+OUTPUT_PATH = Path("results/qdrant_benchmark.json")
+
+
+RSS_KIND = "current" if sys.platform.startswith("linux") else "peak"
+
+
+def _rss_bytes() -> int:
+    """RSS of this process: current on Linux, peak elsewhere (deltas are then upper bounds)."""
+    if RSS_KIND == "current":
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux and the BSDs.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentiles(latencies: Sequence[float]) -> Dict[str, float]:
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000.0, [50, 95, 99])
+    return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+
+def reachable(client: AnyClient) -> bool:
+    try:
+        client.get_collections()
+    except Exception:  # noqa: BLE001 - any failure just means "no server to benchmark"
+        return False
+    return True
+
+
+def server_client(url: str) -> Optional[QdrantClient]:
+    client = QdrantClient(url=url, timeout=5, check_compatibility=False)
+    if not reachable(client):
+        client.close()
+        return None
+    return client
+
+
+def _create(client: QdrantClient, name: str, configuration: str, dim: int) -> None:
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    if configuration == "sparse":
+        client.create_collection(
+            collection_name=name,
+            vectors_config={},
+            sparse_vectors_config={SPARSE_VECTOR: qmodels.SparseVectorParams()},
+        )
+        return
+    quantization = configuration.partition("-")[2] or "none"
+    client.create_collection(collection_name=name, **collection_params(dim, quantization))
+
+
+def _ingest(
+        client: QdrantClient,
+        name: str,
+        configuration: str,
+        requirements: Sequence[Requirement],
+        assignments: Sequence[Tuple[int, str]],
+) -> Tuple[float, int]:
+    """Upload all requirements chunk by chunk; returns (seconds, estimated stored vector bytes).
+
+    Only the vectors the configuration stores are computed: sparse runs never build dense embeddings.
+    """
+    vectorizer = make_hashing_vectorizer()
+    started = time.perf_counter()
+    if configuration == "sparse":
+        stored_bytes = 0
+        for first_id in range(0, len(requirements), CHUNK_SIZE):
+            chunk = requirements[first_id:first_id + CHUNK_SIZE]
+            vectors = sparse_vectors(vectorizer, [req.text for req in chunk])
+            stored_bytes += sum(len(vector.indices) * 8 for vector in vectors)
+            points = [
+                qmodels.PointStruct(id=idx, vector={SPARSE_VECTOR: vector}, payload=build_payload(req, assignment))
+                for idx, req, vector, assignment in zip(
+                    range(first_id, first_id + len(chunk)), chunk, vectors, assignments[first_id:first_id + len(chunk)])
+            ]
+            client.upsert(collection_name=name, points=points, wait=True)
+        return time.perf_counter() - started, stored_bytes
+
+    first_id = 0
+    for chunk, embeddings in stream_embeddings(requirements, vectorizer, CHUNK_SIZE):
+        chunk_assignments = assignments[first_id:first_id + len(chunk)]
+        client.upsert(
+            collection_name=name,
+            points=qmodels.Batch(
+                ids=list(range(first_id, first_id + len(chunk))),
+                vectors=embeddings.tolist(),
+                payloads=[build_payload(req, assignment) for req, assignment in zip(chunk, chunk_assignments)],
+            ),
+            wait=True,
+        )
+        first_id += len(chunk)
+    quantization = configuration.partition("-")[2] or "none"
+    stored_bytes = vector_memory_bytes(len(requirements), vectorizer.n_features, quantization, False)["ram_bytes"]
+    return time.perf_counter() - started, stored_bytes
+
+
+def _scroll(client: QdrantClient, name: str) -> float:
+    started = time.perf_counter()
+    offset = None
+    while True:
+        _, offset = client.scroll(collection_name=name, limit=CHUNK_SIZE, offset=offset, with_payload=True)
+        if offset is None:
+            break
+    return time.perf_counter() - started
+
+
+def _search(
+        client: QdrantClient,
+        name: str,
+        configuration: str,
+        queries: Sequence[Requirement],
+) -> List[float]:
+    vectorizer = make_hashing_vectorizer()
+    texts = [req.text for req in queries]
+    quantization = configuration.partition("-")[2] or "none"
+    # Local mode searches exactly and warns about search params it cannot honour.
+    params = None if is_local(client) else search_params(quantization)
+
+    if configuration == "sparse":
+        requests = [dict(query=vector, using=SPARSE_VECTOR) for vector in sparse_vectors(vectorizer, texts)]
+    else:
+        _, embeddings = next(stream_embeddings(queries, vectorizer, len(queries)))
+        requests = [dict(query=vector.tolist(), search_params=params) for vector in embeddings]
+
+    latencies = []
+    for request in requests:
+        started = time.perf_counter()
+        client.query_points(collection_name=name, limit=TOP_K, **request)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def run_configuration(
+        client: QdrantClient,
+        configuration: str,
+        requirements: Sequence[Requirement],
+        assignments: Sequence[Tuple[int, str]],
+        queries: Sequence[Requirement],
+) -> Dict[str, object]:
+    name = f"benchmark_{configuration.replace('-', '_')}_{len(requirements)}"
+    rss_before = _rss_bytes()
+    _create(client, name, configuration, make_hashing_vectorizer().n_features)
+    ingest_seconds, stored_bytes = _ingest(client, name, configuration, requirements, assignments)
+    rss_after = _rss_bytes()
+    scroll_seconds = _scroll(client, name)
+    latencies = _search(client, name, configuration, queries)
+    client.delete_collection(name)
+
+    n = len(requirements)
+    return {
+        "configuration": configuration,
+        "points": n,
+        "ingest_points_per_sec": n / ingest_seconds,
+        "scroll_points_per_sec": n / scroll_seconds,
+        "search": {"queries": len(latencies), "top_k": TOP_K, **_percentiles(latencies)},
+        # Computed in this process: the vector size model and this process's RSS, not the server's memory.
+        "client_memory_estimate": {
+            "vector_bytes": stored_bytes,
+            "rss_delta_bytes": rss_after - rss_before,
+            "rss_kind": RSS_KIND,
+        },
+        "quantization_applied": configuration.startswith("dense-") and not is_local(client),
+    }
+
+
+def benchmark(
+        sizes: Sequence[int] = SIZES,
+        configurations: Sequence[str] = CONFIGURATIONS,
+        url: Optional[str] = SERVER_URL,
+        n_queries: int = N_QUERIES,
+        seed: int = 42,
+        clients: Optional[Dict[str, AnyClient]] = None,
+) -> Dict[str, object]:
+    """
+    Run every configuration against each target client.
+
+    Without ``clients`` a fresh in-memory client and, when ``url`` is
+    reachable, a server client are created and closed afterwards; passed
+    clients (e.g. pooled ones) are left open.
+    """
+    targets = clients
+    if targets is None:
+        targets = {"local": QdrantClient(location=":memory:")}
+        server = server_client(url) if url else None
+        if server is not None:
+            targets["server"] = server
+
+    base = load_requirements()
+    runs = []
+    for size in sizes:
+        requirements, assignments = synthetic_corpus(base, size, seed=seed)
+        queries, _ = synthetic_corpus(base, n_queries, seed=seed + 1)
+        for target, client in targets.items():
+            for configuration in configurations:
+                print(f"  {target:>6} {configuration:>12} n={size:,}...", end=" ", flush=True)
+                result = run_configuration(client, configuration, requirements, assignments, queries)
+                runs.append({"target": target, **result})
+                print(f"ingest {result['ingest_points_per_sec']:,.0f}/s, "
+                      f"search p95 {result['search']['p95_ms']:.2f} ms")
+
+    if clients is None:
+        for client in targets.values():
+            client.close()
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "qdrant_client": version("qdrant-client"),
+            "server_url": url if "server" in targets else None,
+        },
+        "runs": runs,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark ingest and query performance of the Qdrant layer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="Synthetic corpus sizes (e.g. 1000 10000 100000 1000000)")
+    parser.add_argument("--configurations", nargs="+", choices=CONFIGURATIONS, default=list(CONFIGURATIONS))
+    parser.add_argument("--url", default=SERVER_URL,
+                        help="Qdrant server to benchmark in addition to local mode when reachable ('' to skip)")
+    parser.add_argument("--server-transport", choices=("http", "grpc"), default="http",
+                        help="Reach the server over HTTP or gRPC (prefer_grpc)")
+    parser.add_argument("--grpc-port", type=int, default=GRPC_PORT, help="Server gRPC port")
+    parser.add_argument("--metrics", action="store_true", help="Print Qdrant request timings to stderr")
+    parser.add_argument("--queries", type=int, default=N_QUERIES, help="Search queries per configuration")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH, help="JSON report path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    clients: Dict[str, AnyClient] = {"local": get_client(ClientSettings())}
+    if args.url:
+        server = get_client(ClientSettings(transport=args.server_transport, url=args.url,
+                                           grpc_port=args.grpc_port, timeout=5))
+        if reachable(server):
+            clients["server"] = server
+    report = benchmark(args.sizes, args.configurations, args.url or None, args.queries, clients=clients)
+    if args.metrics:
+        print_metrics()
+    close_clients()
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print("Benchmark report written to", args.output)
+
+
+if __name__ == "__main__":
+    main()
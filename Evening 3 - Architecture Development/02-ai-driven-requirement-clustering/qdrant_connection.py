@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Long-lived Qdrant clients shared by the ingest and query tools.
+
+``get_client`` returns one client per connection setting (local mode, HTTP,
+or gRPC via prefer_grpc) and keeps it for the lifetime of the process, so
+the HTTP connection pool or gRPC channel is reused across calls instead of
+being set up per operation; ``get_async_client`` does the same for the async
+client. Every client call is timed per operation name;
+``client.metrics.snapshot()`` reports count, total and latency percentiles.
+
+The pool is opt-in: the library functions create their own isolated
+in-memory client unless one is passed, and the command line tools pass
+``get_client(settings_from_args(args))``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from typing import Callable, Deque, Dict, Optional, Sequence, TextIO, Tuple, Union
+
+import numpy as np
+
+TRANSPORTS = ("local", "http", "grpc")
+SERVER_URL = "http://localhost:6333"
+GRPC_PORT = 6334
+LOCAL_PATH = ":memory:"
+MAX_SAMPLES = 10_000  # latency samples kept per operation for the percentiles
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    """How to reach Qdrant; equal settings share one pooled client."""
+    transport: str = "local"
+    url: str = SERVER_URL
+    grpc_port: int = GRPC_PORT
+    path: str = LOCAL_PATH
+    timeout: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of {TRANSPORTS}, got {self.transport!r}")
+
+
+class RequestMetrics:
+    """Per-operation call counts and latencies (seconds) of one client."""
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._totals: Dict[str, float] = defaultdict(float)
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=max_samples))
+
+    def record(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            self._counts[operation] += 1
+            self._totals[operation] += seconds
+            self._samples[operation].append(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._totals.clear()
+            self._samples.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Count, total seconds and p50/p95/p99/max milliseconds per operation."""
+        with self._lock:
+            report = {}
+            for operation in sorted(self._counts):
+                samples_ms = np.asarray(self._samples[operation]) * 1000.0
+                p50, p95, p99 = np.percentile(samples_ms, [50, 95, 99])
+                report[operation] = {
+                    "count": self._counts[operation],
+                    "total_seconds": self._totals[operation],
+                    "p50_ms": float(p50),
+                    "p95_ms": float(p95),
+                    "p99_ms": float(p99),
+                    "max_ms": float(samples_ms.max()),
+                }
+            return report
+
+
+class TimedClient:
+    """Wraps a QdrantClient or AsyncQdrantClient and records the duration of every method call.
+
+    Attributes that are not methods (``init_options``, ...) are passed through,
+    so the wrapper can be used wherever the ingest and query code takes a client.
+    Coroutine methods are timed until they complete, not until they are created.
+    """
+
+    def __init__(self, client: Union[QdrantClient, AsyncQdrantClient], metrics: Optional[RequestMetrics] = None):
+        self._client = client
+        self.metrics = metrics or RequestMetrics()
+        self._wrappers: Dict[str, Callable] = {}
+
+    @property
+    def client(self) -> Union[QdrantClient, AsyncQdrantClient]:
+        return self._client
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._client, name)
+        if not callable(attribute) or name.startswith("_"):
+            return attribute
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._wrappers[name] = self._timed(name, attribute)
+        return wrapper
+
+    def _timed(self, name: str, method: Callable) -> Callable:
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await getattr(self._client, name)(*args, **kwargs)
+                finally:
+                    self.metrics.record(name, time.perf_counter() - started)
+        else:
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return getattr(self._client, name)(*args, **kwargs)
+                finally:
+                    self.metrics.record(name, time.perf_counter() - started)
+        return wrapper
+
+
+# What the ingest and query functions accept and return: a plain client or a pooled, timed one.
+AnyClient = Union[QdrantClient, TimedClient]
+AnyAsyncClient = Union[AsyncQdrantClient, TimedClient]
+
+
+def _client_options(settings: ClientSettings) -> Dict[str, object]:
+    if settings.transport == "local":
+        return {"location": LOCAL_PATH} if settings.path == LOCAL_PATH else {"path": settings.path}
+    return {
+        "url": settings.url,
+        "prefer_grpc": settings.transport == "grpc",
+        "grpc_port": settings.grpc_port,
+        "timeout": settings.timeout,
+        "check_compatibility": False,
+    }
+
+
+def create_client(settings: ClientSettings) -> QdrantClient:
+    """A new, unpooled client for ``settings``."""
+    return QdrantClient(**_client_options(settings))
+
+
+def create_async_client(settings: ClientSettings) -> AsyncQdrantClient:
+    """A new, unpooled async client for ``settings``."""
+    return AsyncQdrantClient(**_client_options(settings))
+
+
+_pool: Dict[ClientSettings, TimedClient] = {}
+_async_pool: Dict[ClientSettings, TimedClient] = {}
+_pool_lock = threading.Lock()
+
+
+def _forget_pools() -> None:
+    # A forked worker must not reuse the parent's connections (gRPC channels are not fork-safe).
+    global _pool_lock
+    _pool.clear()
+    _async_pool.clear()
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pools)
+
+
+def get_client(settings: Optional[ClientSettings] = None) -> TimedClient:
+    """The long-lived client for ``settings`` (default: in-memory local mode), created on first use.
+
+    Every caller with equal settings shares the client, and in local mode its store.
+    """
+    settings = settings or ClientSettings()
+    with _pool_lock:
+        client = _pool.get(settings)
+        if client is None:
+            client = _pool[settings] = TimedClient(create_client(settings))
+        return client
+
+
+def get_async_client(settings: Optional[ClientSettings] = None) -> TimedClient:
+    """Like ``get_client`` for AsyncQdrantClient; use it from one event loop only."""
+    settings = settings or ClientSettings()
+    with _pool_lock:
+        client = _async_pool.get(settings)
+        if client is None:
+            client = _async_pool[settings] = TimedClient(create_async_client(settings))
+        return client
+
+
+def pooled_clients() -> Dict[ClientSettings, TimedClient]:
+    with _pool_lock:
+        return dict(_pool)
+
+
+def close_clients() -> None:
+    """Close and forget every pooled sync client (the in-memory local store is discarded)."""
+    with _pool_lock:
+        clients = list(_pool.values())
+        _pool.clear()
+    for client in clients:
+        client.client.close()
+
+
+async def close_async_clients() -> None:
+    """Close and forget every pooled async client; await it on the loop that used them."""
+    with _pool_lock:
+        clients = list(_async_pool.values())
+        _async_pool.clear()
+    for client in clients:
+        await client.client.close()
+
+
+def add_client_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add --transport/--url/--grpc-port/--qdrant-path/--metrics to a tool's command line."""
+    parser.add_argument("--transport", choices=TRANSPORTS, default="local",
+                        help="In-process local mode, or a Qdrant server over HTTP or gRPC (prefer_grpc)")
+    parser.add_argument("--url", default=SERVER_URL, help="Server URL for the http and grpc transports")
+    parser.add_argument("--grpc-port", type=int, default=GRPC_PORT, help="Server gRPC port")
+    parser.add_argument("--qdrant-path", default=LOCAL_PATH,
+                        help="Storage folder for local mode (default: in memory)")
+    parser.add_argument("--metrics", action="store_true", help="Print Qdrant request timings to stderr")
+
+
+def settings_from_args(args: argparse.Namespace) -> ClientSettings:
+    return ClientSettings(transport=args.transport, url=args.url, grpc_port=args.grpc_port, path=args.qdrant_path)
+
+
+def format_metrics(snapshot: Dict[str, Dict[str, float]]) -> str:
+    lines = [f"{'operation':<24} {'count':>6} {'total s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"]
+    for operation, stats in snapshot.items():
+        lines.append(f"{operation:<24} {stats['count']:>6} {stats['total_seconds']:>8.3f} "
+                     f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['max_ms']:>8.2f}")
+    return "\n".join(lines)
+
+
+def print_metrics(file: TextIO = sys.stderr) -> None:
+    """Request timings of every pooled client (sync and async) that made a call."""
+    with _pool_lock:
+        clients = [("", s, c) for s, c in _pool.items()] + [("async ", s, c) for s, c in _async_pool.items()]
+    for kind, settings, client in clients:
+        snapshot = client.metrics.snapshot()
+        if not snapshot:
+            continue
+        target = settings.path if settings.transport == "local" else settings.url
+        print(f"Qdrant requests ({kind}{settings.transport}, {target}):", file=file)
+        print(format_metrics(snapshot), file=file)
+
+
+def transport_overhead(settings: ClientSettings, n_calls: int = 200) -> Tuple[float, float]:
+    """Mean seconds of get_collections on the pooled client vs. a fresh client per call."""
+    pooled = get_client(settings)
+    pooled.get_collections()  # connection setup happens once, outside the measurement
+    started = time.perf_counter()
+    for _ in range(n_calls):
+        pooled.get_collections()
+    pooled_seconds = (time.perf_counter() - started) / n_calls
+
+    started = time.perf_counter()
+    for _ in range(n_calls):
+        client = create_client(settings)
+        client.get_collections()
+        client.close()
+    fresh_seconds = (time.perf_counter() - started) / n_calls
+    return pooled_seconds, fresh_seconds
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare pooled and per-call Qdrant client overhead")
+    add_client_arguments(parser)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args(argv)
+    pooled, fresh = transport_overhead(settings_from_args(args), args.calls)
+    print(f"{args.transport}: pooled {pooled * 1000:.3f} ms/call, new client per call {fresh * 1000:.3f} ms/call "
+          f"({fresh / pooled:.1f}x)")
+    if args.metrics:
+        print_metrics()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Hybrid EarlyBird collection: every point carries a dense semantic vector (the
+sentence-transformers model used by main.py) and a sparse lexical vector (the
+TF-IDF weights used by qdrant_ingest.py) as named vectors. Lookups prefetch
+candidates from both and let Qdrant fuse the rankings with reciprocal rank
+fusion, so one request replaces two collections and client-side merging.
+"""
+
+from __future__ import annotations
+
+import argparse
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from qdrant_connection import AnyClient, add_client_arguments, get_client, print_metrics, settings_from_args
+from qdrant_ingest import (
+    COLLECTION_NAME,
+    Requirement,
+    assign_cluster_labels,
+    build_payload,
+    create_payload_indexes,
+    load_requirements,
+    make_vectorizer,
+    quantization_config,
+)
+from qdrant_search import Neighbour, query_batches, to_neighbours
+
+HYBRID_COLLECTION_NAME = f"{COLLECTION_NAME}_hybrid"
+DENSE_VECTOR = "dense"
+SPARSE_VECTOR = "sparse"
+PREFETCH_LIMIT = 50
+SEARCH_MODES = ("dense", "sparse", "fused")
+
+Encoder = Callable[[Sequence[str]], np.ndarray]
+
+
+def sentence_encoder(model_name: Optional[str] = None) -> Encoder:
+    """Dense encoder with the model and normalization used by main.generate_embeddings."""
+    from sentence_transformers import SentenceTransformer
+    from main import EMBEDDING_MODEL
+
+    model = SentenceTransformer(model_name or EMBEDDING_MODEL)
+
+    def encode(texts: Sequence[str]) -> np.ndarray:
+        return model.encode(list(texts), show_progress_bar=False, normalize_embeddings=True).astype(np.float32)
+
+    return encode
+
+
+def sparse_vectors(vectorizer: TfidfVectorizer, texts: Sequence[str]) -> List[qmodels.SparseVector]:
+    matrix = normalize(vectorizer.transform(list(texts)).astype(np.float32), axis=1)
+    return [
+        qmodels.SparseVector(
+            indices=matrix.indices[start:end].tolist(),
+            values=matrix.data[start:end].tolist(),
+        )
+        for start, end in zip(matrix.indptr[:-1], matrix.indptr[1:])
+    ]
+
+
+def upload_hybrid(
+        requirements: Sequence[Requirement],
+        dense: np.ndarray,
+        sparse: Sequence[qmodels.SparseVector],
+        assignments: Sequence[Tuple[int, str]],
+        client: Optional[AnyClient] = None,
+        collection_name: str = HYBRID_COLLECTION_NAME,
+        quantization: str = "none",
+        on_disk: bool = False,
+) -> AnyClient:
+    client = client or QdrantClient(path=":memory:")
+
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config={
+            DENSE_VECTOR: qmodels.VectorParams(
+                size=dense.shape[1],
+                distance=qmodels.Distance.COSINE,
+                on_disk=on_disk,
+            ),
+        },
+        sparse_vectors_config={
+            SPARSE_VECTOR: qmodels.SparseVectorParams(index=qmodels.SparseIndexParams(on_disk=on_disk)),
+        },
+        quantization_config=quantization_config(quantization),
+    )
+    create_payload_indexes(client, collection_name)
+
+    client.upsert(
+        collection_name=collection_name,
+        points=[
+            qmodels.PointStruct(
+                id=idx,
+                vector={DENSE_VECTOR: dense_vector.tolist(), SPARSE_VECTOR: sparse_vector},
+                payload=build_payload(req, assignment),
+            )
+            for idx, (req, dense_vector, sparse_vector, assignment)
+            in enumerate(zip(requirements, dense, sparse, assignments))
+        ],
+        wait=True,
+    )
+    return client
+
+
+def hybrid_request(
+        dense_query: np.ndarray,
+        sparse_query: qmodels.SparseVector,
+        k: int,
+        mode: str = "fused",
+        prefetch_limit: int = PREFETCH_LIMIT,
+) -> qmodels.QueryRequest:
+    if mode == "dense":
+        return qmodels.QueryRequest(query=dense_query.tolist(), using=DENSE_VECTOR, limit=k, with_payload=True)
+    if mode == "sparse":
+        return qmodels.QueryRequest(query=sparse_query, using=SPARSE_VECTOR, limit=k, with_payload=True)
+    if mode != "fused":
+        raise ValueError(f"Unknown search mode {mode!r}, expected one of {SEARCH_MODES}.")
+    return qmodels.QueryRequest(
+        prefetch=[
+            qmodels.Prefetch(query=dense_query.tolist(), using=DENSE_VECTOR, limit=prefetch_limit),
+            qmodels.Prefetch(query=sparse_query, using=SPARSE_VECTOR, limit=prefetch_limit),
+        ],
+        query=qmodels.FusionQuery(fusion=qmodels.Fusion.RRF),
+        limit=k,
+        with_payload=True,
+    )
+
+
+def hybrid_search(
+        client: QdrantClient,
+        texts: Sequence[str],
+        encode: Encoder,
+        vectorizer: TfidfVectorizer,
+        k: int = 5,
+        mode: str = "fused",
+        collection_name: str = HYBRID_COLLECTION_NAME,
+) -> List[List[Neighbour]]:
+    """Top-k requirements for each text; with ``mode="fused"`` scores are RRF scores, not cosines."""
+    requests = [
+        hybrid_request(dense_query, sparse_query, k, mode)
+        for dense_query, sparse_query in zip(encode(texts), sparse_vectors(vectorizer, texts))
+    ]
+    return [to_neighbours(points) for points in query_batches(client, requests, collection_name)]
+
+
+def label_precision(
+        client: QdrantClient,
+        dense: np.ndarray,
+        sparse: Sequence[qmodels.SparseVector],
+        k: int = 5,
+        collection_name: str = HYBRID_COLLECTION_NAME,
+) -> Dict[str, float]:
+    """
+    Leave-one-out precision@k per search mode: the share of each stored
+    requirement's k nearest other requirements that belong to its component.
+    """
+    points, _ = client.scroll(collection_name=collection_name, limit=len(dense), with_payload=["label"])
+    labels = {point.id: point.payload["label"] for point in points}
+
+    report = {}
+    for mode in SEARCH_MODES:
+        requests = [hybrid_request(dense[idx], sparse[idx], k + 1, mode) for idx in range(len(dense))]
+        hits = 0
+        for idx, found in enumerate(query_batches(client, requests, collection_name)):
+            others = [point for point in found if point.id != idx][:k]
+            hits += sum(point.payload["label"] == labels[idx] for point in others)
+        report[mode] = hits / (len(dense) * k)
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Hybrid dense + sparse Qdrant collection with fused ranking")
+    parser.add_argument("--query", action="append", default=[], help="Requirement text to look up")
+    parser.add_argument("-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--mode", choices=SEARCH_MODES, default="fused", help="Ranking used for --query")
+    parser.add_argument("--evaluate", action="store_true",
+                        help="Report leave-one-out component precision@k for dense, sparse and fused ranking")
+    add_client_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    requirements = load_requirements()
+    texts = [req.text for req in requirements]
+
+    encode = sentence_encoder()
+    vectorizer = make_vectorizer().fit(texts)
+    dense = encode(texts)
+    sparse = sparse_vectors(vectorizer, texts)
+    client = upload_hybrid(requirements, dense, sparse, assign_cluster_labels(requirements),
+                           client=get_client(settings_from_args(args)))
+    print(f"Stored {len(requirements)} requirements with '{DENSE_VECTOR}' ({dense.shape[1]}d) "
+          f"and '{SPARSE_VECTOR}' vectors in {HYBRID_COLLECTION_NAME}")
+
+    for text, found in zip(args.query, hybrid_search(client, args.query, encode, vectorizer, args.k, args.mode)):
+        print(f"\n{text}")
+        for neighbour in found:
+            print(f"  - {neighbour.req_id} [{neighbour.label}] {neighbour.score:.3f}")
+
+    if args.evaluate:
+        print(f"\nComponent precision@{args.k} (leave-one-out)")
+        for mode, precision in label_precision(client, dense, sparse, args.k).items():
+            print(f"  {mode:>6}: {precision:.3f}")
+    if args.metrics:
+        print_metrics()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,19 +6,40 @@ cluster the vectors, and tag each requirement with an existing component label.
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import numpy as np
+import time
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.preprocessing import normalize
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from qdrant_connection import AnyClient, add_client_arguments, get_client, print_metrics, settings_from_args
 
 DATA_PATH = Path("data/earlybird_requirements.json")
+SNAPSHOT_PATH = Path("results/earlybird_requirements.snapshot.npz")
+SNAPSHOT_PAGE_SIZE = 1000
+VECTORIZER_PATH = Path("results/tfidf_vectorizer.json")
+VECTORIZER_MODES = ("fit", "persisted", "hashing")
+N_FEATURES = 1024
+STREAM_CHUNK_SIZE = 1000
 COLLECTION_NAME = "earlybird_requirements"
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+PAYLOAD_INDEXES = {
+    "req_id": qmodels.PayloadSchemaType.KEYWORD,
+    "label": qmodels.PayloadSchemaType.KEYWORD,
+    "cluster_id": qmodels.PayloadSchemaType.INTEGER,
+    "auto_labelled": qmodels.PayloadSchemaType.BOOL,
+}
+RESCORE_OVERSAMPLING = 2.0
+QUERY_BATCH_SIZE = 256
+INDEX_TIMEOUT = 60.0
 COMPONENT_LABELS = [
     "Operations & Fulfillment",
     "SMS Channel",
@@ -59,21 +80,117 @@ def load_requirements(path: Path = DATA_PATH) -> List[Requirement]:
     return [Requirement(req_id=item["id"], text=item["text"]) for item in raw]
 
 
-def embed_requirements(requirements: Iterable[Requirement]) -> np.ndarray:
-    texts = [req.text for req in requirements]
-    vectorizer = TfidfVectorizer(ngram_range=(1, 2), max_features=1024)
-    matrix = vectorizer.fit_transform(texts)
+Vectorizer = Union[TfidfVectorizer, HashingVectorizer]
+
+
+def make_vectorizer() -> TfidfVectorizer:
+    return TfidfVectorizer(ngram_range=(1, 2), max_features=N_FEATURES)
+
+
+def make_hashing_vectorizer() -> HashingVectorizer:
+    """Stateless alternative to TF-IDF: no fit, so any chunk can be transformed on its own."""
+    return HashingVectorizer(ngram_range=(1, 2), n_features=N_FEATURES, alternate_sign=False, norm="l2")
+
+
+def save_vectorizer(vectorizer: TfidfVectorizer, path: Path = VECTORIZER_PATH) -> None:
+    params = vectorizer.get_params()
+    state = {
+        "ngram_range": list(params["ngram_range"]),
+        "vocabulary": {term: int(index) for term, index in vectorizer.vocabulary_.items()},
+        "idf": vectorizer.idf_.tolist(),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state), encoding="utf-8")
+
+
+def load_vectorizer(path: Path = VECTORIZER_PATH) -> TfidfVectorizer:
+    state = json.loads(path.read_text(encoding="utf-8"))
+    vectorizer = TfidfVectorizer(ngram_range=tuple(state["ngram_range"]), vocabulary=state["vocabulary"])
+    vectorizer.idf_ = np.asarray(state["idf"], dtype=np.float64)
+    return vectorizer
+
+
+def resolve_vectorizer(
+        mode: str,
+        requirements: Sequence[Requirement],
+        path: Path = VECTORIZER_PATH,
+) -> Vectorizer:
+    """
+    ``fit`` refits TF-IDF on ``requirements``; ``persisted`` reuses the vocabulary
+    and IDF saved at ``path`` (fitting and saving them on first use); ``hashing``
+    needs no fit at all. Only the latter two keep existing vectors valid when
+    requirements are added.
+    """
+    if mode == "hashing":
+        return make_hashing_vectorizer()
+    if mode == "persisted" and path.exists():
+        return load_vectorizer(path)
+    if mode not in VECTORIZER_MODES:
+        raise ValueError(f"Unknown vectorizer mode {mode!r}, expected one of {VECTORIZER_MODES}.")
+    vectorizer = make_vectorizer().fit([req.text for req in requirements])
+    if mode == "persisted":
+        save_vectorizer(vectorizer, path)
+    return vectorizer
+
+
+def vector_size(vectorizer: Vectorizer) -> int:
+    if isinstance(vectorizer, HashingVectorizer):
+        return vectorizer.n_features
+    return len(vectorizer.vocabulary_)
+
+
+def to_unit_vectors(matrix) -> np.ndarray:
     embeddings = matrix.astype(np.float32).toarray()
     normalize(embeddings, axis=1, copy=False)
     return embeddings
 
 
-def assign_cluster_labels(requirements: List[Requirement]) -> List[Tuple[int, str]]:
+def embed_requirements(
+        requirements: Iterable[Requirement],
+        vectorizer: Optional[Vectorizer] = None,
+) -> np.ndarray:
+    texts = [req.text for req in requirements]
+    if vectorizer is None:
+        return to_unit_vectors(make_vectorizer().fit_transform(texts))
+    return to_unit_vectors(vectorizer.transform(texts))
+
+
+def stream_embeddings(
+        requirements: Iterable[Requirement],
+        vectorizer: Vectorizer,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[Tuple[List[Requirement], np.ndarray]]:
+    """Lazily vectorise ``requirements`` chunk by chunk with an already fitted or stateless vectorizer."""
+    chunk: List[Requirement] = []
+    for req in requirements:
+        chunk.append(req)
+        if len(chunk) == chunk_size:
+            yield chunk, embed_requirements(chunk, vectorizer)
+            chunk = []
+    if chunk:
+        yield chunk, embed_requirements(chunk, vectorizer)
+
+
+def component_assignments() -> Dict[str, Tuple[int, str]]:
     req_to_cluster: Dict[str, Tuple[int, str]] = {}
     for label, req_ids in COMPONENT_REQUIREMENT_IDS.items():
         cluster_id = COMPONENT_LABELS.index(label)
         for req_id in req_ids:
             req_to_cluster[req_id] = (cluster_id, label)
+    return req_to_cluster
+
+
+def partition_labelled(requirements: Iterable[Requirement]) -> Tuple[List[Requirement], List[Requirement]]:
+    """Split requirements into those covered by COMPONENT_REQUIREMENT_IDS and the rest."""
+    req_to_cluster = component_assignments()
+    labelled, unlabelled = [], []
+    for req in requirements:
+        (labelled if req.req_id in req_to_cluster else unlabelled).append(req)
+    return labelled, unlabelled
+
+
+def assign_cluster_labels(requirements: List[Requirement]) -> List[Tuple[int, str]]:
+    req_to_cluster = component_assignments()
 
     assignments = []
     for req in requirements:
@@ -83,51 +200,405 @@ def assign_cluster_labels(requirements: List[Requirement]) -> List[Tuple[int, st
     return assignments
 
 
+def quantization_config(mode: str) -> Optional[qmodels.QuantizationConfig]:
+    if mode == "none":
+        return None
+    if mode == "scalar":
+        return qmodels.ScalarQuantization(
+            scalar=qmodels.ScalarQuantizationConfig(
+                type=qmodels.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            )
+        )
+    if mode == "binary":
+        return qmodels.BinaryQuantization(binary=qmodels.BinaryQuantizationConfig(always_ram=True))
+    raise ValueError(f"Unknown quantization mode {mode!r}, expected one of {QUANTIZATION_MODES}.")
+
+
+def search_params(mode: str) -> Optional[qmodels.SearchParams]:
+    """Search params that rescore quantized candidates against the original vectors."""
+    if mode == "none":
+        return None
+    return qmodels.SearchParams(
+        quantization=qmodels.QuantizationSearchParams(
+            ignore=False,
+            rescore=True,
+            oversampling=RESCORE_OVERSAMPLING,
+        )
+    )
+
+
+def collection_params(dim: int, quantization: str = "none", on_disk: bool = False) -> Dict[str, object]:
+    return {
+        "vectors_config": qmodels.VectorParams(
+            size=dim,
+            distance=qmodels.Distance.COSINE,
+            on_disk=on_disk,
+        ),
+        "quantization_config": quantization_config(quantization),
+    }
+
+
+def build_payload(req: Requirement, assignment: Tuple[int, str]) -> Dict[str, object]:
+    cluster_id, label = assignment
+    return {
+        "req_id": req.req_id,
+        "text": req.text,
+        "cluster_id": int(cluster_id),
+        "label": label,
+    }
+
+
+def build_points(
+        requirements: Sequence[Requirement],
+        embeddings: np.ndarray,
+        assignments: Sequence[Tuple[int, str]],
+        first_id: int = 0,
+) -> List[qmodels.PointStruct]:
+    return [
+        qmodels.PointStruct(
+            id=idx,
+            vector=vector.astype(np.float32).tolist(),
+            payload=build_payload(req, assignment),
+        )
+        for idx, (req, vector, assignment) in enumerate(zip(requirements, embeddings, assignments), start=first_id)
+    ]
+
+
+def build_batch(
+        requirements: Sequence[Requirement],
+        embeddings: np.ndarray,
+        assignments: Sequence[Tuple[int, str]],
+        first_id: int = 0,
+) -> qmodels.Batch:
+    """Columnar equivalent of ``build_points``; much cheaper to validate for upsert calls."""
+    return qmodels.Batch(
+        ids=list(range(first_id, first_id + len(requirements))),
+        vectors=embeddings.astype(np.float32).tolist(),
+        payloads=[build_payload(req, assignment) for req, assignment in zip(requirements, assignments)],
+    )
+
+
+def is_local(client) -> bool:
+    """True for embedded (in-process) clients, which ignore payload indexes and search exactly."""
+    options = client.init_options
+    return options.get("path") is not None or options.get("location") == ":memory:"
+
+
+def create_payload_indexes(client: QdrantClient, collection_name: str = COLLECTION_NAME) -> None:
+    if is_local(client):
+        return
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        client.create_payload_index(collection_name, field_name=field_name, field_schema=field_schema)
+
+
 def upload_to_qdrant(
         requirements: List[Requirement],
         embeddings: np.ndarray,
         assignments: List[Tuple[int, str]],
-) -> QdrantClient:
+        quantization: str = "none",
+        on_disk: bool = False,
+        client: Optional[AnyClient] = None,
+) -> AnyClient:
     dim = embeddings.shape[1]
-    client = QdrantClient(path=":memory:")
+    client = client or QdrantClient(path=":memory:")
 
     if client.collection_exists(COLLECTION_NAME):
         client.delete_collection(COLLECTION_NAME)
 
     client.create_collection(
         collection_name=COLLECTION_NAME,
-        vectors_config=qmodels.VectorParams(size=dim, distance=qmodels.Distance.COSINE),
+        **collection_params(dim, quantization, on_disk),
+    )
+    create_payload_indexes(client)
+
+    points = build_points(requirements, embeddings, assignments)
+    client.upload_points(collection_name=COLLECTION_NAME, points=points)
+    return client
+
+
+def scroll_points(
+        client: QdrantClient,
+        collection_name: str = COLLECTION_NAME,
+        scroll_filter: Optional[qmodels.Filter] = None,
+        with_payload: Union[bool, Sequence[str]] = True,
+        with_vectors: bool = False,
+        page_size: int = SNAPSHOT_PAGE_SIZE,
+) -> Iterator[qmodels.Record]:
+    """Every point matching ``scroll_filter``, fetched page by page until the scroll ends."""
+    offset = None
+    while True:
+        page, offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=scroll_filter,
+            limit=page_size,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+        )
+        yield from page
+        if offset is None:
+            return
+
+
+def req_id_filter(req_ids: Iterable[str]) -> qmodels.Filter:
+    return qmodels.Filter(
+        must=[qmodels.FieldCondition(key="req_id", match=qmodels.MatchAny(any=list(dict.fromkeys(req_ids))))]
     )
 
-    points = []
-    for idx, (req, vector, assignment) in enumerate(zip(requirements, embeddings, assignments)):
-        cluster_id, label = assignment
-        points.append(
-            qmodels.PointStruct(
-                id=idx,
-                vector=vector.astype(np.float32).tolist(),
-                payload={
-                    "req_id": req.req_id,
-                    "text": req.text,
-                    "cluster_id": int(cluster_id),
-                    "label": label,
-                },
+
+def stored_req_ids(
+        client: QdrantClient,
+        req_ids: Sequence[str],
+        collection_name: str = COLLECTION_NAME,
+) -> set:
+    points = scroll_points(client, collection_name, req_id_filter(req_ids), with_payload=["req_id"])
+    return {point.payload["req_id"] for point in points}
+
+
+def next_point_id(client: QdrantClient, collection_name: str = COLLECTION_NAME) -> int:
+    """One past the largest integer point id; ids need not be contiguous, so the count is not enough."""
+    ids = (point.id for point in scroll_points(client, collection_name, with_payload=False))
+    return max((point_id for point_id in ids if isinstance(point_id, int)), default=-1) + 1
+
+
+def add_requirements(
+        client: QdrantClient,
+        requirements: Iterable[Requirement],
+        vectorizer: Vectorizer,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        collection_name: str = COLLECTION_NAME,
+) -> int:
+    """
+    Vectorise and append requirements that are not stored yet, leaving existing points untouched.
+
+    ``vectorizer`` must be the persisted TF-IDF or the hashing vectorizer used for
+    the stored points, otherwise old and new vectors live in different spaces.
+    Requirements missing from COMPONENT_REQUIREMENT_IDS get the component voted by
+    their hand-labelled neighbours (see qdrant_autolabel). Returns the number of points added.
+    """
+    from qdrant_autolabel import knn_vote, upload_auto_labelled  # qdrant_autolabel imports this module
+
+    req_to_cluster = component_assignments()
+    next_id = next_point_id(client, collection_name)
+    added = 0
+    for chunk, embeddings in stream_embeddings(requirements, vectorizer, chunk_size):
+        known = stored_req_ids(client, [req.req_id for req in chunk], collection_name)
+        fresh = [idx for idx, req in enumerate(chunk) if req.req_id not in known]
+        mapped = [idx for idx in fresh if chunk[idx].req_id in req_to_cluster]
+        unmapped = [idx for idx in fresh if chunk[idx].req_id not in req_to_cluster]
+        if mapped:
+            mapped_requirements = [chunk[idx] for idx in mapped]
+            client.upsert(
+                collection_name=collection_name,
+                points=build_batch(mapped_requirements, embeddings[mapped],
+                                   assign_cluster_labels(mapped_requirements), first_id=next_id),
+                wait=True,
             )
+            next_id += len(mapped)
+        if unmapped:
+            # Voted after the mapped ones are stored, so they can already take part in the vote.
+            unmapped_requirements = [chunk[idx] for idx in unmapped]
+            votes = knn_vote(client, unmapped_requirements, embeddings[unmapped], collection_name=collection_name)
+            upload_auto_labelled(client, unmapped_requirements, embeddings[unmapped], votes,
+                                 first_id=next_id, collection_name=collection_name)
+            next_id += len(unmapped)
+        added += len(fresh)
+    return added
+
+
+def source_hash(
+        path: Path = DATA_PATH,
+        quantization: str = "none",
+        on_disk: bool = False,
+        vectorizer: str = "fit",
+        hybrid: bool = False,
+) -> str:
+    """Fingerprint of everything the stored collection is derived from."""
+    digest = hashlib.sha256(path.read_bytes())
+    digest.update(json.dumps(COMPONENT_REQUIREMENT_IDS, sort_keys=True).encode("utf-8"))
+    # Stored cluster_id values are indexes into COMPONENT_LABELS, so its order matters too.
+    digest.update(json.dumps(COMPONENT_LABELS).encode("utf-8"))
+    active = make_hashing_vectorizer() if vectorizer == "hashing" else make_vectorizer()
+    digest.update(repr(sorted(active.get_params().items())).encode("utf-8"))
+    digest.update(f"{quantization}:{on_disk}:{vectorizer}".encode("utf-8"))
+    if vectorizer == "persisted" and VECTORIZER_PATH.exists():
+        digest.update(VECTORIZER_PATH.read_bytes())
+    if hybrid:
+        digest.update(b"hybrid")
+    return digest.hexdigest()
+
+
+def export_snapshot(
+        client: QdrantClient,
+        path: Path,
+        digest: str,
+        quantization: str = "none",
+        on_disk: bool = False,
+        collection_name: str = COLLECTION_NAME,
+) -> None:
+    """
+    Write all points of the collection plus its configuration to one ``.npz`` file.
+
+    Embedded clients have no snapshot API, so this portable format is used for
+    both local and server collections. It holds points, not the HNSW graph:
+    ``import_snapshot`` uploads them again and Qdrant re-indexes. Collections
+    with named dense and sparse vectors (``qdrant_hybrid``) store one array per
+    dense vector and the CSR parts of every sparse vector.
+    """
+    params = client.get_collection(collection_name).config.params
+    named = isinstance(params.vectors, dict)
+    dense_config = params.vectors if named else {"": params.vectors}
+    sparse_config = params.sparse_vectors or {}
+
+    ids, payloads = [], []
+    dense: Dict[str, List[List[float]]] = {name: [] for name in dense_config}
+    sparse: Dict[str, List[qmodels.SparseVector]] = {name: [] for name in sparse_config}
+    for point in scroll_points(client, collection_name, with_vectors=True):
+        ids.append(point.id)
+        payloads.append(point.payload)
+        vectors = point.vector if named or sparse else {"": point.vector}
+        for name, values in dense.items():
+            values.append(vectors[name])
+        for name, values in sparse.items():
+            values.append(vectors.get(name) or qmodels.SparseVector(indices=[], values=[]))
+
+    arrays = {}
+    for name, values in dense.items():
+        key = f"vectors_{name}" if named else "vectors"
+        arrays[key] = np.asarray(values, dtype=np.float32).reshape(-1, dense_config[name].size)
+    for name, values in sparse.items():
+        arrays[f"sparse_{name}_indptr"] = np.cumsum([0] + [len(vector.indices) for vector in values], dtype=np.int64)
+        arrays[f"sparse_{name}_indices"] = np.asarray([i for vector in values for i in vector.indices], dtype=np.int64)
+        arrays[f"sparse_{name}_values"] = np.asarray([v for vector in values for v in vector.values],
+                                                     dtype=np.float32)
+
+    meta = {
+        "source_hash": digest,
+        "collection_name": collection_name,
+        "dim": None if named else params.vectors.size,
+        "quantization": quantization,
+        "on_disk": on_disk,
+        "payload_indexes": {name: schema.value for name, schema in PAYLOAD_INDEXES.items()},
+    }
+    if named or sparse:
+        meta["vectors"] = {name: config.model_dump(mode="json", exclude_none=True)
+                           for name, config in dense_config.items()} if named else None
+        meta["sparse_vectors"] = {name: config.model_dump(mode="json", exclude_none=True)
+                                  for name, config in sparse_config.items()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as handle:
+        np.savez(
+            handle,
+            ids=np.asarray(ids, dtype=np.int64),
+            payloads=np.frombuffer(json.dumps(payloads).encode("utf-8"), dtype=np.uint8),
+            meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+            **arrays,
         )
 
-    client.upload_points(collection_name=COLLECTION_NAME, points=points)
+
+def _snapshot_sparse(snapshot, name: str) -> List[qmodels.SparseVector]:
+    indptr = snapshot[f"sparse_{name}_indptr"]
+    indices = snapshot[f"sparse_{name}_indices"]
+    values = snapshot[f"sparse_{name}_values"]
+    return [
+        qmodels.SparseVector(indices=indices[start:end].tolist(), values=values[start:end].tolist())
+        for start, end in zip(indptr[:-1], indptr[1:])
+    ]
+
+
+def import_snapshot(path: Path, digest: str, client: Optional[AnyClient] = None) -> Optional[AnyClient]:
+    """Restore a collection written by ``export_snapshot``; None if missing or built from other sources.
+
+    The points are uploaded again, so the collection is re-indexed rather than restored with its HNSW graph.
+    """
+    if not path.exists():
+        return None
+    with np.load(path, allow_pickle=False) as snapshot:
+        meta = json.loads(snapshot["meta"].tobytes())
+        if meta["source_hash"] != digest:
+            return None
+        ids = snapshot["ids"].tolist()
+        payloads = json.loads(snapshot["payloads"].tobytes())
+        dense_config = meta.get("vectors")
+        sparse_config = meta.get("sparse_vectors") or {}
+        if dense_config is None:
+            dense = {"": snapshot["vectors"].reshape(-1, meta["dim"])}
+        else:
+            dense = {name: snapshot[f"vectors_{name}"].reshape(-1, config["size"])
+                     for name, config in dense_config.items()}
+        sparse = {name: _snapshot_sparse(snapshot, name) for name in sparse_config}
+
+    collection_name = meta["collection_name"]
+    client = client or QdrantClient(path=":memory:")
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    params = collection_params(meta["dim"], meta["quantization"], meta["on_disk"]) if meta["dim"] else {
+        "quantization_config": quantization_config(meta["quantization"]),
+    }
+    if dense_config is not None:
+        params["vectors_config"] = {name: qmodels.VectorParams(**config) for name, config in dense_config.items()}
+    if sparse_config:
+        params["sparse_vectors_config"] = {name: qmodels.SparseVectorParams(**config)
+                                           for name, config in sparse_config.items()}
+    client.create_collection(collection_name=collection_name, **params)
+    if not is_local(client):
+        for field_name, field_schema in meta["payload_indexes"].items():
+            client.create_payload_index(collection_name, field_name=field_name,
+                                        field_schema=qmodels.PayloadSchemaType(field_schema))
+
+    if ids:
+        if dense_config is None and not sparse:
+            vectors = dense[""]
+        else:
+            vectors = [
+                {**{name: values[idx].tolist() for name, values in dense.items()},
+                 **{name: values[idx] for name, values in sparse.items()}}
+                for idx in range(len(ids))
+            ]
+        client.upload_collection(
+            collection_name=collection_name,
+            vectors=vectors,
+            payload=payloads,
+            ids=ids,
+            batch_size=SNAPSHOT_PAGE_SIZE,
+            wait=True,
+        )
     return client
 
 
-def fetch_cluster_summary(client: QdrantClient) -> Dict[str, List[Dict[str, str]]]:
-    scroll_result, _ = client.scroll(
-        collection_name=COLLECTION_NAME,
-        with_payload=True,
-        limit=100,
-    )
+def synthetic_corpus(
+        base: Sequence[Requirement],
+        n: int,
+        seed: int = 42,
+) -> Tuple[List[Requirement], List[Tuple[int, str]]]:
+    """
+    Generate ``n`` requirement variants for load testing.
 
+    Each variant drops some words of a labelled base requirement and splices in
+    words from another one, and inherits the base requirement's component label.
+    """
+    rng = np.random.default_rng(seed)
+    base_assignments = assign_cluster_labels(list(base))
+    words = [req.text.split() for req in base]
+
+    requirements = []
+    assignments = []
+    for i, (src, donor) in enumerate(rng.integers(0, len(base), size=(n, 2))):
+        keep = [w for w in words[src] if rng.random() > 0.2]
+        graft = rng.choice(words[donor], size=min(5, len(words[donor])), replace=False).tolist()
+        requirements.append(Requirement(req_id=f"S{i}", text=" ".join(keep + graft)))
+        assignments.append(base_assignments[src])
+    return requirements, assignments
+
+
+def fetch_cluster_summary(
+        client: QdrantClient,
+        collection_name: str = COLLECTION_NAME,
+) -> Dict[str, List[Dict[str, str]]]:
     summary: Dict[str, List[Dict[str, str]]] = defaultdict(list)
-    for point in scroll_result:
+    for point in scroll_points(client, collection_name, with_payload=["req_id", "text", "cluster_id", "label"]):
         payload = point.payload or {}
         summary[payload["label"]].append(
             {
@@ -143,11 +614,232 @@ def fetch_cluster_summary(client: QdrantClient) -> Dict[str, List[Dict[str, str]
     return dict(sorted(summary.items(), key=lambda kv: COMPONENT_LABELS.index(kv[0])))
 
 
-def main() -> None:
+def vector_memory_bytes(n_points: int, dim: int, quantization: str, on_disk: bool) -> Dict[str, int]:
+    """Estimate vector storage per tier; quantized codes are pinned in RAM (always_ram)."""
+    original = n_points * dim * 4
+    if quantization == "scalar":
+        quantized = n_points * dim
+    elif quantization == "binary":
+        quantized = n_points * ((dim + 7) // 8)
+    else:
+        quantized = 0
+    return {
+        "ram_bytes": quantized + (0 if on_disk else original),
+        "disk_bytes": original if on_disk else 0,
+    }
+
+
+def _quantized_scores(embeddings: np.ndarray, quantization: str) -> np.ndarray:
+    # Mirrors Qdrant's candidate scoring: int8 codes over the 0.99 quantile
+    # range for scalar, sign bits compared by Hamming agreement for binary.
+    if quantization == "scalar":
+        low, high = np.quantile(embeddings, [0.005, 0.995])
+        scale = (high - low) / 255.0 if high > low else 1.0
+        codes = np.clip(np.rint((embeddings - low) / scale), 0, 255).astype(np.uint8)
+        restored = codes.astype(np.float32) * scale + low
+        return restored @ restored.T
+    bits = embeddings > 0
+    agree = bits.astype(np.float32) @ bits.T.astype(np.float32)
+    agree += (~bits).astype(np.float32) @ (~bits).T.astype(np.float32)
+    return agree
+
+
+def _wait_until_indexed(client: AnyClient, collection_name: str, timeout: float = INDEX_TIMEOUT) -> None:
+    deadline = time.monotonic() + timeout
+    while client.get_collection(collection_name).status != qmodels.CollectionStatus.GREEN:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Collection {collection_name} was not indexed within {timeout:.0f}s.")
+        time.sleep(0.1)
+
+
+def _server_neighbours(client: AnyClient, embeddings: np.ndarray, k: int, mode: str, on_disk: bool) -> np.ndarray:
+    """Leave-one-out top-k ids from a server collection quantized with ``mode``, searched with rescoring."""
+    collection_name = f"{COLLECTION_NAME}_recall_{mode}"
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    client.create_collection(
+        collection_name=collection_name,
+        # Index at once: quantized vectors are only built when a segment is optimized.
+        optimizers_config=qmodels.OptimizersConfigDiff(indexing_threshold=1),
+        **collection_params(embeddings.shape[1], mode, on_disk),
+    )
+    try:
+        client.upload_collection(collection_name=collection_name, vectors=embeddings, ids=range(len(embeddings)),
+                                 batch_size=SNAPSHOT_PAGE_SIZE, wait=True)
+        _wait_until_indexed(client, collection_name)
+        params = search_params(mode)
+        found = []
+        for start in range(0, len(embeddings), QUERY_BATCH_SIZE):
+            requests = [qmodels.QueryRequest(query=vector.tolist(), limit=k + 1, params=params)
+                        for vector in embeddings[start:start + QUERY_BATCH_SIZE]]
+            for idx, response in enumerate(client.query_batch_points(collection_name, requests), start):
+                found.append([point.id for point in response.points if point.id != idx][:k])
+        return np.asarray(found, dtype=np.int64).reshape(len(embeddings), k)
+    finally:
+        client.delete_collection(collection_name)
+
+
+def benchmark_quantization(
+        embeddings: np.ndarray,
+        k: int = 5,
+        modes: Sequence[str] = QUANTIZATION_MODES,
+        on_disk: bool = False,
+        client: Optional[AnyClient] = None,
+) -> List[Dict[str, float]]:
+    """
+    Compare recall@k of quantized search with rescoring against exact cosine search.
+
+    Against a server (``client`` not in local mode) each mode gets a temporary
+    quantized collection, searched with ``query_batch_points`` and the same
+    rescoring ``search_params`` the ingest uses. Local-mode Qdrant ignores
+    quantization and always searches exactly, so without a server the quantized
+    candidate stage is simulated here with the same oversampling and rescoring
+    rules; rows say which (``measured``: "server" or "simulated"). Each
+    requirement queries all others.
+    """
+    n_points, dim = embeddings.shape
+    k = min(k, n_points - 1)
+    exact = embeddings @ embeddings.T
+    np.fill_diagonal(exact, -np.inf)
+    truth = np.argsort(-exact, axis=1)[:, :k]
+    on_server = client is not None and not is_local(client)
+
+    report = []
+    for mode in modes:
+        if mode == "none":
+            found = truth
+        elif on_server:
+            found = _server_neighbours(client, embeddings, k, mode, on_disk)
+        else:
+            approx = _quantized_scores(embeddings, mode)
+            np.fill_diagonal(approx, -np.inf)
+            n_candidates = min(int(np.ceil(k * RESCORE_OVERSAMPLING)), n_points - 1)
+            candidates = np.argsort(-approx, axis=1, kind="stable")[:, :n_candidates]
+            rescored = np.take_along_axis(exact, candidates, axis=1)
+            order = np.argsort(-rescored, axis=1, kind="stable")[:, :k]
+            found = np.take_along_axis(candidates, order, axis=1)
+
+        hits = sum(len(set(row_found) & set(row_truth)) for row_found, row_truth in zip(found, truth))
+        memory = vector_memory_bytes(n_points, dim, mode, on_disk)
+        report.append(
+            {
+                "quantization": mode,
+                "on_disk": on_disk,
+                "k": k,
+                "recall": hits / (n_points * k),
+                "measured": "server" if on_server else "simulated",
+                **memory,
+            }
+        )
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load EarlyBird requirements into Qdrant")
+    parser.add_argument(
+        "--quantization",
+        choices=QUANTIZATION_MODES,
+        default="none",
+        help="Quantize stored vectors (int8 scalar or binary), rescoring with the originals",
+    )
+    parser.add_argument(
+        "--on-disk",
+        action="store_true",
+        help="Keep original float vectors on disk instead of RAM",
+    )
+    parser.add_argument(
+        "--benchmark-quantization",
+        action="store_true",
+        help="Report recall@k and vector memory for every quantization mode "
+             "(measured on a server, simulated in local mode)",
+    )
+    parser.add_argument("--recall-k", type=int, default=5, help="k used for the recall@k benchmark")
+    parser.add_argument(
+        "--vectorizer",
+        choices=VECTORIZER_MODES,
+        default="fit",
+        help=f"Refit TF-IDF every run, reuse the TF-IDF vocabulary persisted at {VECTORIZER_PATH}, "
+             f"or use a stateless hashing vectorizer",
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        nargs="?",
+        const=SNAPSHOT_PATH,
+        default=None,
+        help=f"Restore the collection from this snapshot when the source data is unchanged, "
+             f"otherwise ingest and write it (default: {SNAPSHOT_PATH}); it holds points only, "
+             f"so a restore re-indexes them",
+    )
+    parser.add_argument(
+        "--add",
+        type=Path,
+        metavar="FILE",
+        default=None,
+        help="Append the requirements in FILE that are not stored yet; unmapped ones are labelled by kNN vote "
+             "(needs --vectorizer persisted or hashing)",
+    )
+    parser.add_argument(
+        "--hybrid",
+        action="store_true",
+        help="Store a sentence-transformers 'dense' and a TF-IDF 'sparse' named vector per point, "
+             "for fused lookups with qdrant_hybrid.hybrid_search",
+    )
+    add_client_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.add and args.vectorizer == "fit":
+        parser.error("--add needs --vectorizer persisted or hashing, so stored and added vectors share one space")
+    if args.add and args.hybrid:
+        parser.error("--add appends plain TF-IDF vectors and cannot extend a --hybrid collection")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     requirements = load_requirements()
-    embeddings = embed_requirements(requirements)
-    assignments = assign_cluster_labels(requirements)
-    client = upload_to_qdrant(requirements, embeddings, assignments)
+    # Fitting is the expensive part, so only the reusable vectorizers are resolved before the snapshot check.
+    vectorizer = resolve_vectorizer(args.vectorizer, requirements) if args.vectorizer != "fit" else None
+    digest = source_hash(DATA_PATH, args.quantization, args.on_disk, args.vectorizer, args.hybrid)
+
+    embeddings = None
+    pooled = get_client(settings_from_args(args))
+    client = import_snapshot(args.snapshot, digest, pooled) if args.snapshot else None
+    restored = client is not None
+    if restored:
+        print("Restored collection from snapshot", args.snapshot)
+    elif args.hybrid:
+        # Imported here: qdrant_hybrid builds on this module.
+        from qdrant_hybrid import sentence_encoder, sparse_vectors, upload_hybrid
+
+        texts = [req.text for req in requirements]
+        vectorizer = vectorizer or make_vectorizer().fit(texts)
+        client = upload_hybrid(
+            requirements,
+            sentence_encoder()(texts),
+            sparse_vectors(vectorizer, texts),
+            assign_cluster_labels(requirements),
+            client=pooled,
+            collection_name=COLLECTION_NAME,
+            quantization=args.quantization,
+            on_disk=args.on_disk,
+        )
+    else:
+        embeddings = embed_requirements(requirements, vectorizer)
+        assignments = assign_cluster_labels(requirements)
+        client = upload_to_qdrant(
+            requirements,
+            embeddings,
+            assignments,
+            quantization=args.quantization,
+            on_disk=args.on_disk,
+            client=pooled,
+        )
+    if args.snapshot and not restored:
+        export_snapshot(client, args.snapshot, digest, args.quantization, args.on_disk)
+        print("Snapshot written to", args.snapshot)
+    if args.add:
+        added = add_requirements(client, load_requirements(args.add), vectorizer)
+        print(f"Added {added} requirements from {args.add}")
     summary = fetch_cluster_summary(client)
 
     output_path = Path("results") / "qdrant_clusters.json"
@@ -160,6 +852,21 @@ def main() -> None:
         for entry in items:
             print(f"  - {entry['req_id']}: {entry['text']}")
 
+    if args.benchmark_quantization:
+        if embeddings is None:
+            embeddings = embed_requirements(requirements)
+        rows = benchmark_quantization(embeddings, k=args.recall_k, on_disk=args.on_disk, client=pooled)
+        source = "measured on the server" if rows[-1]["measured"] == "server" else "simulated, local mode"
+        print(f"\nQuantization benchmark (recall@{args.recall_k} vs. exact cosine search, {source})")
+        for row in rows:
+            print(
+                f"  {row['quantization']:>6}: recall={row['recall']:.3f} "
+                f"ram={row['ram_bytes'] / 1024:.1f} KiB disk={row['disk_bytes'] / 1024:.1f} KiB"
+            )
+
+    if args.metrics:
+        print_metrics()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Ingest several requirement corpora at once. Each corpus (one requirements JSON
+file per project) is loaded and vectorised in its own worker process and stored
+either in a collection of its own or in one shared collection partitioned by an
+indexed ``project`` payload key. Load, vectorise and upload times are reported
+per corpus.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from qdrant_connection import (
+    AnyClient,
+    ClientSettings,
+    add_client_arguments,
+    close_clients,
+    get_client,
+    print_metrics,
+    settings_from_args,
+)
+from qdrant_ingest import (
+    COLLECTION_NAME,
+    DATA_PATH,
+    QUANTIZATION_MODES,
+    VECTORIZER_MODES,
+    VECTORIZER_PATH,
+    Requirement,
+    build_payload,
+    collection_params,
+    component_assignments,
+    create_payload_indexes,
+    embed_requirements,
+    is_local,
+    load_requirements,
+    make_hashing_vectorizer,
+    resolve_vectorizer,
+    vector_size,
+)
+
+LAYOUTS = ("collections", "partitioned")
+# Separate from COLLECTION_NAME, so a partitioned ingest never replaces the single-project collection.
+PARTITIONED_COLLECTION_NAME = f"{COLLECTION_NAME}_multi"
+N_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+UPLOAD_BATCH_SIZE = 1000
+UNASSIGNED = (-1, "Unassigned")
+OUTPUT_PATH = Path("results/qdrant_multi_ingest.json")
+PROJECT_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+# Tenant index: the server co-locates each project's points, so filtered searches stay per-project cheap.
+PROJECT_INDEX = qmodels.KeywordIndexParams(type=qmodels.KeywordIndexType.KEYWORD, is_tenant=True)
+
+
+@dataclass(frozen=True)
+class Corpus:
+    project: str
+    path: Path
+
+
+@dataclass(frozen=True)
+class CorpusReport:
+    project: str
+    collection: str
+    points: int
+    labelled: int
+    load_seconds: float
+    vectorise_seconds: float
+    upload_seconds: float
+
+    @property
+    def total_seconds(self) -> float:
+        return self.load_seconds + self.vectorise_seconds + self.upload_seconds
+
+
+def discover_corpora(source: Path) -> List[Corpus]:
+    """
+    Corpora from a directory (every ``*.json`` file, named after its stem) or
+    from a JSON manifest mapping project names to requirement files, with
+    relative paths resolved against the manifest's directory.
+    """
+    if source.is_dir():
+        corpora = [Corpus(path.stem, path) for path in sorted(source.glob("*.json"))]
+    else:
+        manifest = json.loads(source.read_text(encoding="utf-8"))
+        corpora = [Corpus(project, source.parent / path) for project, path in manifest.items()]
+
+    if not corpora:
+        raise ValueError(f"No requirement files found in {source}.")
+    for corpus in corpora:
+        if not PROJECT_NAME.match(corpus.project):
+            raise ValueError(f"Project name {corpus.project!r} must only contain letters, digits, '_' and '-'.")
+    return corpora
+
+
+def collection_for(project: str, layout: str) -> str:
+    if layout == "partitioned":
+        return PARTITIONED_COLLECTION_NAME
+    if layout != "collections":
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {LAYOUTS}.")
+    return f"{COLLECTION_NAME}_{project}"
+
+
+def label_corpus(corpus: Corpus, requirements: Sequence[Requirement]) -> List[Tuple[int, str]]:
+    """
+    Component labels for the EarlyBird corpus; other projects have no
+    component mapping, so their requirements are stored as ``Unassigned``.
+    """
+    if corpus.path.resolve() != DATA_PATH.resolve():
+        return [UNASSIGNED] * len(requirements)
+    req_to_cluster = component_assignments()
+    return [req_to_cluster.get(req.req_id, UNASSIGNED) for req in requirements]
+
+
+def point_id(project: str, req_id: str) -> str:
+    """Deterministic UUID, so projects never collide and re-ingesting a corpus overwrites its points."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{project}/{req_id}"))
+
+
+def create_collection(
+        client: QdrantClient,
+        collection_name: str,
+        dim: int,
+        quantization: str = "none",
+        on_disk: bool = False,
+        partitioned: bool = False,
+) -> None:
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    client.create_collection(collection_name=collection_name, **collection_params(dim, quantization, on_disk))
+    create_payload_indexes(client, collection_name)
+    if partitioned and not is_local(client):
+        client.create_payload_index(collection_name, field_name="project", field_schema=PROJECT_INDEX)
+
+
+def upload_corpus(
+        client: QdrantClient,
+        project: str,
+        requirements: Sequence[Requirement],
+        embeddings: np.ndarray,
+        assignments: Sequence[Tuple[int, str]],
+        collection_name: str,
+        batch_size: int = UPLOAD_BATCH_SIZE,
+) -> None:
+    for start in range(0, len(requirements), batch_size):
+        chunk = requirements[start:start + batch_size]
+        payloads = []
+        for req, assignment in zip(chunk, assignments[start:start + batch_size]):
+            payload = build_payload(req, assignment)
+            payload["project"] = project
+            payloads.append(payload)
+        client.upsert(
+            collection_name=collection_name,
+            points=qmodels.Batch(
+                ids=[point_id(project, req.req_id) for req in chunk],
+                vectors=embeddings[start:start + batch_size].astype(np.float32).tolist(),
+                payloads=payloads,
+            ),
+            wait=True,
+        )
+
+
+def prepare_corpus(
+        corpus: Corpus,
+        layout: str,
+        vectorizer_mode: str,
+        server: Optional[ClientSettings] = None,
+        quantization: str = "none",
+        on_disk: bool = False,
+) -> Tuple[CorpusReport, Optional[tuple]]:
+    """
+    Load and vectorise one corpus; runs in a worker process.
+
+    With a ``server`` the worker also uploads, through one pooled client per
+    worker process, so corpora are stored in parallel, and only the report
+    comes back. Local mode is confined to one process, so the worker returns
+    the vectors for the parent to upload.
+    """
+    started = time.perf_counter()
+    requirements = load_requirements(corpus.path)
+    assignments = label_corpus(corpus, requirements)
+    loaded = time.perf_counter()
+
+    vectorizer_path = VECTORIZER_PATH.with_name(f"{VECTORIZER_PATH.stem}_{corpus.project}{VECTORIZER_PATH.suffix}")
+    vectorizer = resolve_vectorizer(vectorizer_mode, requirements, vectorizer_path)
+    embeddings = embed_requirements(requirements, vectorizer)
+    vectorised = time.perf_counter()
+
+    collection_name = collection_for(corpus.project, layout)
+    upload_seconds = 0.0
+    prepared = None
+    if server is not None:
+        client = get_client(server)
+        if layout == "collections":
+            create_collection(client, collection_name, vector_size(vectorizer), quantization, on_disk)
+        upload_corpus(client, corpus.project, requirements, embeddings, assignments, collection_name)
+        upload_seconds = time.perf_counter() - vectorised
+    else:
+        prepared = (requirements, embeddings, assignments, vector_size(vectorizer))
+
+    report = CorpusReport(
+        project=corpus.project,
+        collection=collection_name,
+        points=len(requirements),
+        labelled=sum(assignment != UNASSIGNED for assignment in assignments),
+        load_seconds=loaded - started,
+        vectorise_seconds=vectorised - loaded,
+        upload_seconds=upload_seconds,
+    )
+    return report, prepared
+
+
+def ingest_corpora(
+        corpora: Sequence[Corpus],
+        layout: str = "collections",
+        vectorizer_mode: str = "fit",
+        url: Optional[str] = None,
+        client: Optional[AnyClient] = None,
+        workers: int = N_WORKERS,
+        quantization: str = "none",
+        on_disk: bool = False,
+        settings: Optional[ClientSettings] = None,
+) -> Tuple[AnyClient, List[CorpusReport]]:
+    """
+    Ingest all ``corpora`` with up to ``workers`` corpora in flight.
+
+    The partitioned layout stores every project in one vector space, so it
+    requires the stateless hashing vectorizer; per-project collections may
+    also fit (or persist) a TF-IDF vocabulary per project.
+
+    Without ``client`` the parent uses the pooled client for ``settings``
+    when given, otherwise a new client for ``url`` or an isolated in-memory one.
+    """
+    if layout == "partitioned" and vectorizer_mode != "hashing":
+        raise ValueError("The partitioned layout shares one collection and needs --vectorizer hashing.")
+    if len({corpus.project for corpus in corpora}) != len(corpora):
+        raise ValueError("Project names must be unique.")
+    if url and settings is not None:
+        raise ValueError("Pass either a server url or client settings, not both.")
+
+    if url:
+        server = ClientSettings(transport="http", url=url)
+    else:
+        server = settings if settings is not None and settings.transport != "local" else None
+    if client is None:
+        if settings is not None:
+            client = get_client(settings)
+        else:
+            client = QdrantClient(url=url) if url else QdrantClient(path=":memory:")
+    if server is not None and is_local(client):
+        raise ValueError("Pass either a server url or a local client, not both.")
+    if layout == "partitioned":
+        dim = vector_size(make_hashing_vectorizer())
+        create_collection(client, PARTITIONED_COLLECTION_NAME, dim, quantization, on_disk, partitioned=True)
+
+    reports = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(corpora))) as pool:
+        futures = [
+            pool.submit(prepare_corpus, corpus, layout, vectorizer_mode, server, quantization, on_disk)
+            for corpus in corpora
+        ]
+        # Upload in completion order so a large corpus does not hold back the small ones.
+        for future in as_completed(futures):
+            report, prepared = future.result()
+            if prepared is not None:
+                requirements, embeddings, assignments, dim = prepared
+                started = time.perf_counter()
+                if layout == "collections":
+                    create_collection(client, report.collection, dim, quantization, on_disk)
+                upload_corpus(client, report.project, requirements, embeddings, assignments, report.collection)
+                report = CorpusReport(**{**asdict(report), "upload_seconds": time.perf_counter() - started})
+            reports.append(report)
+    return client, sorted(reports, key=lambda report: report.project)
+
+
+def project_filter(project: str) -> qmodels.Filter:
+    """Restrict a query on the partitioned collection to one project."""
+    return qmodels.Filter(must=[qmodels.FieldCondition(key="project", match=qmodels.MatchValue(value=project))])
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ingest several requirement corpora into Qdrant in parallel")
+    parser.add_argument("source", type=Path,
+                        help="Directory of requirement JSON files or a JSON manifest {project: path}")
+    parser.add_argument("--layout", choices=LAYOUTS, default="collections",
+                        help="One collection per project, or one collection partitioned by 'project'")
+    parser.add_argument("--vectorizer", choices=VECTORIZER_MODES, default=None,
+                        help="Vectorizer per corpus (default: fit for collections, hashing for partitioned)")
+    parser.add_argument("--workers", type=int, default=N_WORKERS, help="Corpora processed concurrently")
+    parser.add_argument("--quantization", choices=QUANTIZATION_MODES, default="none")
+    parser.add_argument("--on-disk", action="store_true", help="Keep original float vectors on disk")
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH, help="JSON timing report path")
+    # With --transport http or grpc the workers upload to the server in parallel.
+    add_client_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.layout == "partitioned" and args.vectorizer not in (None, "hashing"):
+        parser.error("--layout partitioned stores all projects in one vector space and needs --vectorizer hashing")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    corpora = discover_corpora(args.source)
+    vectorizer_mode = args.vectorizer or ("hashing" if args.layout == "partitioned" else "fit")
+
+    started = time.perf_counter()
+    _, reports = ingest_corpora(corpora, args.layout, vectorizer_mode, workers=args.workers,
+                                quantization=args.quantization, on_disk=args.on_disk,
+                                settings=settings_from_args(args))
+    elapsed = time.perf_counter() - started
+
+    print(f"Ingested {len(reports)} corpora ({args.layout}, {vectorizer_mode} vectorizer)")
+    print(f"  {'project':<24} {'collection':<40} {'points':>8} {'load':>7} {'vector':>7} {'upload':>7}")
+    for report in reports:
+        print(f"  {report.project:<24} {report.collection:<40} {report.points:>8,} "
+              f"{report.load_seconds:>6.2f}s {report.vectorise_seconds:>6.2f}s {report.upload_seconds:>6.2f}s")
+    serial = sum(report.total_seconds for report in reports)
+    print(f"Wall time {elapsed:.2f}s for {serial:.2f}s of per-corpus work")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "layout": args.layout,
+        "vectorizer": vectorizer_mode,
+        "workers": args.workers,
+        "wall_seconds": elapsed,
+        "corpora": [{**asdict(report), "total_seconds": report.total_seconds} for report in reports],
+    }, indent=2), encoding="utf-8")
+    print("Timing report written to", args.output)
+    if args.metrics:
+        print_metrics()  # the parent's requests; workers' uploads are timed in upload_seconds
+    close_clients()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Batch similarity queries over the EarlyBird requirements collection: top-k
+neighbours for stored requirements or new texts, and a near-duplicate report
+that walks the collection once and lets the vector index find candidate pairs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict, dataclass
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Dict, List, Optional, Sequence
+
+from qdrant_connection import add_client_arguments, get_client, print_metrics, settings_from_args
+from qdrant_ingest import (
+    COLLECTION_NAME,
+    assign_cluster_labels,
+    load_requirements,
+    make_vectorizer,
+    req_id_filter,
+    scroll_points,
+    to_unit_vectors,
+    upload_to_qdrant,
+)
+
+BATCH_SIZE = 256
+DUPLICATE_THRESHOLD = 0.8
+
+
+@dataclass(frozen=True)
+class Neighbour:
+    req_id: str
+    label: str
+    score: float
+
+
+@dataclass(frozen=True)
+class DuplicatePair:
+    req_id: str
+    duplicate_req_id: str
+    score: float
+
+
+def point_ids_for(
+        client: QdrantClient,
+        req_ids: Sequence[str],
+        collection_name: str = COLLECTION_NAME,
+) -> Dict[str, int]:
+    points = scroll_points(client, collection_name, req_id_filter(req_ids), with_payload=["req_id"])
+    found = {point.payload["req_id"]: point.id for point in points}
+    missing = [req_id for req_id in req_ids if req_id not in found]
+    if missing:
+        raise ValueError(f"Requirements missing in collection {collection_name}: {', '.join(missing)}.")
+    return found
+
+
+def query_batches(
+        client: QdrantClient,
+        requests: Sequence[qmodels.QueryRequest],
+        collection_name: str = COLLECTION_NAME,
+        batch_size: int = BATCH_SIZE,
+) -> List[List[qmodels.ScoredPoint]]:
+    """Run ``requests`` as ``query_batch_points`` calls of at most ``batch_size`` searches each."""
+    results: List[List[qmodels.ScoredPoint]] = []
+    for start in range(0, len(requests), batch_size):
+        responses = client.query_batch_points(
+            collection_name=collection_name,
+            requests=requests[start:start + batch_size],
+        )
+        results.extend(response.points for response in responses)
+    return results
+
+
+def to_neighbours(points: Sequence[qmodels.ScoredPoint]) -> List[Neighbour]:
+    return [
+        Neighbour(req_id=point.payload["req_id"], label=point.payload["label"], score=float(point.score))
+        for point in points
+    ]
+
+
+def similar_to_requirements(
+        client: QdrantClient,
+        req_ids: Sequence[str],
+        k: int = 5,
+        score_threshold: Optional[float] = None,
+        params: Optional[qmodels.SearchParams] = None,
+        collection_name: str = COLLECTION_NAME,
+) -> Dict[str, List[Neighbour]]:
+    """Top-k stored neighbours of stored requirements; a requirement never matches itself."""
+    point_ids = point_ids_for(client, req_ids, collection_name)
+    requests = [
+        qmodels.QueryRequest(
+            query=point_ids[req_id],
+            limit=k,
+            score_threshold=score_threshold,
+            params=params,
+            with_payload=["req_id", "label"],
+        )
+        for req_id in req_ids
+    ]
+    results = query_batches(client, requests, collection_name)
+    return {req_id: to_neighbours(points) for req_id, points in zip(req_ids, results)}
+
+
+def similar_to_texts(
+        client: QdrantClient,
+        texts: Sequence[str],
+        vectorizer: TfidfVectorizer,
+        k: int = 5,
+        score_threshold: Optional[float] = None,
+        params: Optional[qmodels.SearchParams] = None,
+        collection_name: str = COLLECTION_NAME,
+) -> List[List[Neighbour]]:
+    """Top-k stored neighbours of new requirement texts, in input order."""
+    vectors = to_unit_vectors(vectorizer.transform(list(texts)))
+    requests = [
+        qmodels.QueryRequest(
+            query=vector.tolist(),
+            limit=k,
+            score_threshold=score_threshold,
+            params=params,
+            with_payload=["req_id", "label"],
+        )
+        for vector in vectors
+    ]
+    return [to_neighbours(points) for points in query_batches(client, requests, collection_name)]
+
+
+def near_duplicates(
+        client: QdrantClient,
+        threshold: float = DUPLICATE_THRESHOLD,
+        k: int = 10,
+        params: Optional[qmodels.SearchParams] = None,
+        collection_name: str = COLLECTION_NAME,
+        batch_size: int = BATCH_SIZE,
+) -> List[DuplicatePair]:
+    """
+    All requirement pairs with cosine similarity >= ``threshold``.
+
+    Every point issues one index-backed top-k search bounded by the threshold,
+    so the cost is n searches rather than n² comparisons; a requirement with more
+    than ``k`` duplicates only reports its ``k`` closest. Queries use the scrolled
+    vectors rather than point IDs: an ID query adds an exclude-self filter that
+    local mode evaluates point by point.
+    """
+    pairs: Dict[tuple, DuplicatePair] = {}
+    offset = None
+    while True:
+        page, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=["req_id"],
+            with_vectors=True,
+        )
+        requests = [
+            qmodels.QueryRequest(
+                query=point.vector,
+                limit=k + 1,
+                score_threshold=threshold,
+                params=params,
+                with_payload=["req_id"],
+            )
+            for point in page
+        ]
+        for point, matches in zip(page, query_batches(client, requests, collection_name, batch_size)):
+            for match in matches:
+                if match.id == point.id:
+                    continue
+                first, second = sorted((point.payload["req_id"], match.payload["req_id"]))
+                pairs.setdefault((first, second), DuplicatePair(first, second, float(match.score)))
+        if offset is None:
+            break
+
+    return sorted(pairs.values(), key=lambda pair: (-pair.score, pair.req_id, pair.duplicate_req_id))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Similarity search over the EarlyBird requirements collection")
+    parser.add_argument("--ids", nargs="*", default=[], help="Requirement IDs to find neighbours for")
+    parser.add_argument("--text", action="append", default=[], help="New requirement text to look up")
+    parser.add_argument("-k", type=int, default=5, help="Neighbours per query")
+    parser.add_argument("--duplicates", type=float, metavar="THRESHOLD", default=None,
+                        help=f"Report near-duplicate pairs at or above this cosine similarity "
+                             f"(e.g. {DUPLICATE_THRESHOLD})")
+    add_client_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    requirements = load_requirements()
+    texts = [req.text for req in requirements]
+    vectorizer = make_vectorizer().fit(texts)
+    embeddings = to_unit_vectors(vectorizer.transform(texts))
+    client = upload_to_qdrant(requirements, embeddings, assign_cluster_labels(requirements),
+                              client=get_client(settings_from_args(args)))
+
+    report: Dict[str, object] = {}
+    if args.ids:
+        neighbours = similar_to_requirements(client, args.ids, k=args.k)
+        report["requirements"] = {req_id: [asdict(n) for n in found] for req_id, found in neighbours.items()}
+    if args.text:
+        neighbours = similar_to_texts(client, args.text, vectorizer, k=args.k)
+        report["texts"] = [{"text": text, "neighbours": [asdict(n) for n in found]}
+                           for text, found in zip(args.text, neighbours)]
+    if args.duplicates is not None:
+        report["near_duplicates"] = [asdict(pair) for pair in near_duplicates(client, args.duplicates)]
+
+    print(json.dumps(report, indent=2))
+    if args.metrics:
+        print_metrics()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Test suite for main.py
+
+Tests the warm-started k-path and bootstrap fits, the shared bootstrap plan and the model
+comparison on synthetic L2-normalized embeddings. main imports sentence-transformers at module level;
+when it is not installed, a placeholder module stands in for the import only,
+since no test encodes text.
+"""
+
+import csv
+import importlib.util
+import sys
+import tempfile
+import types
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+if importlib.util.find_spec("sentence_transformers") is None:
+    placeholder = types.ModuleType("sentence_transformers")
+    placeholder.SentenceTransformer = None
+    sys.modules["sentence_transformers"] = placeholder
+    try:
+        import main
+    finally:
+        del sys.modules["sentence_transformers"]
+else:
+    import main
+
+
+def blobs(n_per_blob=10, n_blobs=3, dim=8, spread=0.05, seed=0):
+    """Well-separated clusters on the unit sphere, one per axis."""
+    rng = np.random.default_rng(seed)
+    centres = np.eye(n_blobs, dim)
+    points = np.vstack([centre + rng.normal(scale=spread, size=(n_per_blob, dim)) for centre in centres])
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+class TestSplitCentroids(unittest.TestCase):
+    """Test seeding k+1 centroids from a k-cluster fit"""
+
+    def test_splits_the_widest_cluster(self):
+        embeddings = blobs()
+        kmeans = main.fit_spherical_kmeans(embeddings, 2)
+        centroids = main.split_centroids(embeddings, kmeans)
+        self.assertEqual(centroids.shape, (3, embeddings.shape[1]))
+
+        labels = main.fit_spherical_kmeans(embeddings, 3, init_centroids=centroids).labels_
+        self.assertEqual(len(np.unique(labels)), 3)
+        self.assertEqual(main.adjusted_rand_score(np.repeat([0, 1, 2], 10), labels), 1.0)
+
+    def test_singleton_cluster_gets_the_farthest_point(self):
+        """Test that a one-member widest cluster is kept and the farthest point seeds the new one."""
+        embeddings = np.eye(3, 4)
+        # Labels from the last assignment step, before the singleton's centroid moved onto its point.
+        fit = types.SimpleNamespace(labels_=np.array([0, 1, 1]),
+                                    cluster_centers_=np.array([[0.0, 1.0, 0.0, 0.0], [0.0, 0.5, 0.5, 0.0]]))
+        centroids = main.split_centroids(embeddings, fit)
+        self.assertEqual(centroids.shape, (3, 4))
+        np.testing.assert_array_equal(centroids[:2], fit.cluster_centers_)
+        np.testing.assert_array_equal(centroids[2], embeddings[0])
+
+    def test_all_singletons(self):
+        """Test that k equal to the number of points still yields k+1 finite centroids."""
+        embeddings = blobs(n_per_blob=1, n_blobs=4)
+        centroids = main.split_centroids(embeddings, main.fit_spherical_kmeans(embeddings, 4))
+        self.assertEqual(centroids.shape, (5, embeddings.shape[1]))
+        self.assertTrue(np.all(np.isfinite(centroids)))
+
+
+class TestWarmStart(unittest.TestCase):
+    """Test the warm k-path and the warm bootstrap fits as separate options"""
+
+    def setUp(self):
+        self.embeddings = blobs()
+        self.plan = main.make_bootstrap_plan(len(self.embeddings), 4)
+
+    def run_k_range(self, warm_start, warm_bootstrap=False):
+        with mock.patch("builtins.print"):
+            return main.test_k_range_with_stability(self.embeddings, [2, 3, 4], warm_start=warm_start, plan=self.plan,
+                                                    warm_bootstrap=warm_bootstrap)
+
+    def test_k_path_leaves_bootstrap_fits_cold(self):
+        cold, warm = self.run_k_range(False), self.run_k_range(True)
+        bootstrap_inits = 4 * main.KMEANS_N_INIT
+        self.assertEqual([r['kmeans_inits'] for r in cold], [main.KMEANS_N_INIT + bootstrap_inits] * 3)
+        self.assertEqual([r['kmeans_inits'] for r in warm],
+                         [main.KMEANS_N_INIT + bootstrap_inits] + [1 + bootstrap_inits] * 2)
+
+    def test_same_labels_give_same_stability(self):
+        """Test that where both paths find the same solution, the bootstrap scores are identical."""
+        cold, warm = self.run_k_range(False), self.run_k_range(True)
+        self.assertEqual(main.adjusted_rand_score(cold[1]['labels'], warm[1]['labels']), 1.0)
+        self.assertEqual(cold[1]['bootstrap_data']['ari_scores'], warm[1]['bootstrap_data']['ari_scores'])
+
+    def test_warm_bootstrap_fits_use_one_init(self):
+        warm = self.run_k_range(False, warm_bootstrap=True)
+        self.assertEqual([r['kmeans_inits'] for r in warm], [main.KMEANS_N_INIT + 4] * 3)
+        self.assertTrue(all(0.0 <= r['ari_mean'] <= 1.0 for r in warm))
+
+    def test_compare_warm_start_reports_every_mode(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(main, "DIMENSIONS_TO_TEST", [4]), mock.patch.object(main, "K_RANGE", [2, 3]), \
+                mock.patch.object(main, "RESULTS_DIR", directory), mock.patch("builtins.print"):
+            rows = main.compare_warm_start(blobs(n_per_blob=12, dim=16), n_bootstrap=3)
+            with open(Path(directory, "warm_start_comparison.csv"), newline='', encoding='utf-8') as f:
+                exported = list(csv.DictReader(f))
+        self.assertEqual([(r['d'], r['k']) for r in rows], [(4, 2), (4, 3)])
+        for mode in ("cold", "warm_k", "warm_bootstrap"):
+            self.assertIn(f"{mode}_ari", exported[0])
+            self.assertIn(f"{mode}_nmi", exported[0])
+        self.assertEqual(rows[0]['cold_inits'], main.KMEANS_N_INIT * 4)
+        self.assertEqual(rows[1]['warm_k_inits'], 1 + main.KMEANS_N_INIT * 3)
+        self.assertEqual(rows[1]['warm_bootstrap_inits'], main.KMEANS_N_INIT + 3)
+
+
+
+class TestBootstrapPlan(unittest.TestCase):
+    """Test the shared resamples and paired comparisons on them"""
+
+    def test_plan_masks(self):
+        plan = main.make_bootstrap_plan(40, 6)
+        self.assertEqual(set(plan), {'unique_masks'})
+        self.assertEqual(plan['unique_masks'].shape, (6, 40))
+        self.assertTrue(np.all(plan['unique_masks'].sum(axis=1) <= int(40 * main.BOOTSTRAP_SAMPLE_RATIO)))
+        np.testing.assert_array_equal(main.make_bootstrap_plan(40, 3)['unique_masks'], plan['unique_masks'][:3])
+
+    def test_short_plan_is_rejected(self):
+        embeddings = blobs()
+        with self.assertRaisesRegex(AssertionError, "3 resamples, 5 needed"):
+            main.bootstrap_stability(embeddings, 3, n_bootstrap=5, plan=main.make_bootstrap_plan(len(embeddings), 3))
+
+    def test_paired_difference(self):
+        reference = {'iterations': [0, 1, 2, 3], 'silhouette_scores': [0.50, 0.60, 0.40, 0.55]}
+        other = {'iterations': [0, 2, 3], 'silhouette_scores': [0.45, 0.36, 0.50]}
+        diff, paired_se, unpaired_se = main.paired_silhouette_difference(reference, other)
+        gaps = np.array([-0.05, -0.04, -0.05])
+        self.assertAlmostEqual(diff, gaps.mean())
+        self.assertAlmostEqual(paired_se, np.std(gaps, ddof=1) / np.sqrt(3))
+        self.assertGreater(unpaired_se, paired_se)
+
+    def test_runners_up_separated_by_two_paired_se(self):
+        def result(k, scores):
+            return {'k': k, 'bootstrap_data': {'iterations': list(range(len(scores))), 'silhouette_scores': scores,
+                                               'silhouette_mean': float(np.mean(scores))}}
+
+        best_scores = [0.50, 0.60, 0.40, 0.55]
+        all_results = {8: {'results': [
+            result(3, best_scores),
+            result(4, [s - 0.05 for s in best_scores[:3]] + [best_scores[3] - 0.06]),
+            result(5, [0.51, 0.55, 0.42, 0.50]),
+        ]}}
+        rows = main.paired_comparison(all_results, {'d': 8, 'k': 3})
+        self.assertEqual([(r['k'], r['separated']) for r in rows], [(5, False), (4, True)])
+        with mock.patch("builtins.print") as printed:
+            main.print_paired_comparison(all_results, {'d': 8, 'k': 3})
+        self.assertIn("1 of 2 runners-up", "\n".join(str(call.args[0]) for call in printed.call_args_list))
+
+    def test_bootstrap_iterations_option(self):
+        self.assertEqual(main.parse_args([]).bootstrap_iterations, main.N_BOOTSTRAP_SAMPLES)
+        self.assertEqual(main.parse_args(["--bootstrap-iterations", "30"]).bootstrap_iterations, 30)
+        with mock.patch("sys.stderr"), self.assertRaises(SystemExit):
+            main.parse_args(["--bootstrap-iterations", "1"])
+
+
+
+class TestCompareModels(unittest.TestCase):
+    """Test the multi-model comparison with a stubbed encoder"""
+
+    DIMENSIONS = {"model-a": 8, "model-b": 12, "model-c": 16}
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.encoded = []
+        self.submitted = []
+        self.submitted_before_sweep = []
+        for name, value in (("DIMENSIONS_TO_TEST", [4]), ("K_RANGE", [2, 3]), ("RESULTS_DIR", self.directory.name)):
+            patcher = mock.patch.object(main, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def encode(self, requirements, model_name, verbose=True):
+        self.encoded.append(model_name)
+        if model_name not in self.DIMENSIONS:
+            raise OSError(f"{model_name} is not a sentence-transformers model")
+        return blobs(n_per_blob=8, dim=self.DIMENSIONS[model_name])
+
+    def compare(self, model_names):
+        sweep = main.run_dimension_sweep
+        submitted = self.submitted
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, model_name):
+                submitted.append(model_name)
+                return super().submit(fn, model_name)
+
+        def recorded_sweep(*args, **kwargs):
+            self.submitted_before_sweep.append(list(submitted))
+            return sweep(*args, **kwargs)
+
+        with mock.patch.object(main, "generate_embeddings", side_effect=self.encode), \
+                mock.patch.object(main, "ThreadPoolExecutor", RecordingExecutor), \
+                mock.patch.object(main, "run_dimension_sweep", side_effect=recorded_sweep), \
+                mock.patch("builtins.print"):
+            return main.compare_models([], model_names, n_bootstrap=3)
+
+    def test_encodes_at_most_one_model_ahead(self):
+        rows = self.compare(["model-a", "model-b", "model-c"])
+        self.assertEqual(sorted(r['model'] for r in rows), ["model-a", "model-b", "model-c"])
+        self.assertEqual(self.encoded, ["model-a", "model-b", "model-c"])
+        self.assertEqual(self.submitted_before_sweep, [["model-a", "model-b"], ["model-a", "model-b", "model-c"],
+                                                       ["model-a", "model-b", "model-c"]])
+        self.assertEqual({r['model']: r['native_dimension'] for r in rows}, self.DIMENSIONS)
+
+    def test_failed_model_is_recorded_and_exported(self):
+        rows = self.compare(["model-a", "missing-model", "model-b"])
+        self.assertEqual([r['model'] for r in rows[2:]], ["missing-model"])
+        self.assertIn("OSError", rows[2]['error'])
+        self.assertTrue(all('error' not in r for r in rows[:2]))
+
+        with mock.patch("builtins.print"):
+            csv_path = main.export_model_comparison_csv(rows)
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            exported = list(csv.DictReader(f))
+        self.assertEqual([r['rank'] for r in exported], ["1", "2", ""])
+        self.assertEqual(exported[2]['model'], "missing-model")
+        self.assertIn("not a sentence-transformers model", exported[2]['error'])
+        self.assertTrue(Path(self.directory.name, "experiment_results_model-a.csv").exists())
+
+    def test_failed_sweep_does_not_stop_the_comparison(self):
+        self.DIMENSIONS = {"model-a": 8, "tiny-model": 3}
+        rows = self.compare(["tiny-model", "model-a"])
+        self.assertEqual([r['model'] for r in rows], ["model-a", "tiny-model"])
+        self.assertIn("error", rows[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Test suite for qdrant_async_ingest.py
+
+Tests that the pipelined and the sequential ingest store the same points, that
+a failing stage surfaces its error instead of hanging the pipeline, and that the
+command line stores into the configured local folder and times both paths with
+the chosen vectoriser.
+"""
+
+import asyncio
+import contextlib
+import io
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+import qdrant_async_ingest
+from qdrant_async_ingest import ingest_async, ingest_sequential, main, parse_args
+from qdrant_ingest import COLLECTION_NAME, COMPONENT_LABELS, Requirement, make_hashing_vectorizer
+
+REQUIREMENTS = [Requirement(f"R{idx}", f"Customers track order {idx} and pay invoice {idx % 4}") for idx in range(25)]
+ASSIGNMENTS = [(idx % 3, COMPONENT_LABELS[idx % 3]) for idx in range(25)]
+
+
+class TestIngestAsync(unittest.IsolatedAsyncioTestCase):
+    """Test the pipelined ingest against its sequential baseline"""
+
+    async def test_matches_sequential_ingest(self):
+        client = await ingest_async(REQUIREMENTS, ASSIGNMENTS, chunk_size=4, queue_size=2, workers=2)
+        baseline = ingest_sequential(REQUIREMENTS, ASSIGNMENTS, chunk_size=4)
+        try:
+            pipelined, _ = await client.scroll(COLLECTION_NAME, limit=100, with_payload=True, with_vectors=True)
+            sequential, _ = baseline.scroll(COLLECTION_NAME, limit=100, with_payload=True, with_vectors=True)
+            self.assertEqual([(p.id, p.payload) for p in pipelined], [(p.id, p.payload) for p in sequential])
+            np.testing.assert_allclose([p.vector for p in pipelined], [p.vector for p in sequential], rtol=1e-6)
+        finally:
+            await client.close()
+            baseline.close()
+
+    async def test_failing_producer_does_not_hang(self):
+        """Test that the consumer is cancelled when the producer dies before queueing the end marker."""
+        client = AsyncQdrantClient(location=":memory:")
+        failing = mock.AsyncMock(side_effect=RuntimeError("vectoriser pool broke"))
+        try:
+            with mock.patch.object(qdrant_async_ingest, "_produce", failing):
+                with self.assertRaisesRegex(RuntimeError, "vectoriser pool broke"):
+                    await asyncio.wait_for(ingest_async(REQUIREMENTS, ASSIGNMENTS, client=client, workers=1), 30)
+        finally:
+            await client.close()
+
+    async def test_failing_upload_does_not_hang(self):
+        """Test that the producer is cancelled when the upload fails with chunks still queued."""
+        client = AsyncQdrantClient(location=":memory:")
+        try:
+            with mock.patch.object(client, "upsert", mock.AsyncMock(side_effect=ConnectionError("server gone"))):
+                with self.assertRaisesRegex(ConnectionError, "server gone"):
+                    await asyncio.wait_for(ingest_async(REQUIREMENTS, ASSIGNMENTS, client=client, chunk_size=1,
+                                                        queue_size=1, workers=1), 30)
+        finally:
+            await client.close()
+
+
+class TestMain(unittest.TestCase):
+    """Test the command line"""
+
+    def run_main(self, argv):
+        output = io.StringIO()
+        with mock.patch.object(qdrant_async_ingest, "load_requirements", return_value=REQUIREMENTS), \
+                mock.patch.object(qdrant_async_ingest, "assign_cluster_labels", return_value=ASSIGNMENTS), \
+                contextlib.redirect_stdout(output):
+            main(argv)
+        return output.getvalue()
+
+    def test_stores_into_the_local_folder(self):
+        """Test that the ingested points outlive the run in the --qdrant-path folder."""
+        with tempfile.TemporaryDirectory() as path:
+            output = self.run_main(["--qdrant-path", path, "--chunk-size", "4", "--workers", "1"])
+            self.assertIn(f"now holds {len(REQUIREMENTS)} points", output)
+            client = QdrantClient(path=path)
+            try:
+                self.assertEqual(client.count(COLLECTION_NAME).count, len(REQUIREMENTS))
+            finally:
+                client.close()
+
+    def test_refuses_to_ingest_into_memory(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            parse_args([])
+        self.assertTrue(parse_args(["--compare"]).compare)
+
+    def test_compare_uses_the_chosen_vectorizer(self):
+        hashing = make_hashing_vectorizer()
+        with mock.patch.object(qdrant_async_ingest, "resolve_vectorizer", return_value=hashing), \
+                mock.patch.object(qdrant_async_ingest, "compare_throughput", return_value={
+                    "points": 25, "sequential_points_per_sec": 1.0, "async_points_per_sec": 1.0, "speedup": 1.0,
+                }) as compare:
+            output = self.run_main(["--compare", "--vectorizer", "hashing"])
+        self.assertIs(compare.call_args.kwargs["vectorizer"], hashing)
+        self.assertIn("local mode runs async calls synchronously", output)
+
+    def test_compare_passes_the_vectorizer_to_both_paths(self):
+        hashing = make_hashing_vectorizer()
+        with mock.patch.object(qdrant_async_ingest, "ingest_sequential") as sequential, \
+                mock.patch.object(qdrant_async_ingest, "ingest_async", mock.AsyncMock()) as pipelined:
+            qdrant_async_ingest.compare_throughput(REQUIREMENTS, ASSIGNMENTS, vectorizer=hashing)
+        self.assertIs(sequential.call_args.kwargs["vectorizer"], hashing)
+        self.assertIs(pipelined.call_args.kwargs["vectorizer"], hashing)
+
+
+if __name__ == "__main__":
+    unittest.main()
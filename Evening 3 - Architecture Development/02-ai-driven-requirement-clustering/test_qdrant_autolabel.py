@@ -0,0 +1,80 @@
+"""
+Test suite for qdrant_autolabel.py
+
+Tests the similarity-weighted vote and that kNN voting only listens to
+hand-labelled points, on an in-memory local client with synthetic embeddings.
+"""
+
+import unittest
+
+import numpy as np
+from qdrant_client.http import models as qmodels
+
+from qdrant_autolabel import knn_vote, tally, upload_auto_labelled
+from qdrant_ingest import Requirement, upload_to_qdrant
+
+
+def neighbour(cluster_id, label, score):
+    return qmodels.ScoredPoint(id=0, version=0, score=score, payload={"cluster_id": cluster_id, "label": label})
+
+
+class TestTally(unittest.TestCase):
+    """Test the weighted vote over one requirement's neighbours"""
+
+    def test_unanimous_vote(self):
+        vote = tally("R1", [neighbour(1, "Orders", 0.9), neighbour(1, "Orders", 0.4)])
+        self.assertEqual((vote.req_id, vote.cluster_id, vote.label), ("R1", 1, "Orders"))
+        self.assertAlmostEqual(vote.margin, 1.0)
+
+    def test_weights_beat_counts(self):
+        """Test that one close neighbour outvotes two distant ones."""
+        vote = tally("R1", [neighbour(0, "Payments", 0.9), neighbour(1, "Orders", 0.2), neighbour(1, "Orders", 0.1)])
+        self.assertEqual(vote.label, "Payments")
+        self.assertAlmostEqual(vote.margin, 0.5)
+
+    def test_tie_goes_to_the_lower_cluster_id(self):
+        vote = tally("R1", [neighbour(2, "Reports", 0.5), neighbour(1, "Orders", 0.5)])
+        self.assertEqual(vote.cluster_id, 1)
+        self.assertAlmostEqual(vote.margin, 0.0)
+
+    def test_no_overlap_falls_back_to_counts(self):
+        vote = tally("R1", [neighbour(0, "Payments", 0.0), neighbour(1, "Orders", 0.0), neighbour(1, "Orders", -0.1)])
+        self.assertEqual(vote.label, "Orders")
+        self.assertAlmostEqual(vote.margin, 1 / 3)
+
+    def test_no_neighbours(self):
+        with self.assertRaisesRegex(ValueError, "R1"):
+            tally("R1", [])
+
+
+class TestKnnVote(unittest.TestCase):
+    """Test voting against a small collection of orthogonal clusters"""
+
+    def setUp(self):
+        self.requirements = [Requirement(f"R{idx}", f"Requirement {idx}") for idx in range(6)]
+        self.embeddings = np.repeat(np.eye(3, 4, dtype=np.float32), 2, axis=0)
+        self.assignments = [(idx // 2, f"Component {idx // 2}") for idx in range(6)]
+        self.client = upload_to_qdrant(self.requirements, self.embeddings, self.assignments)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_nearest_cluster_wins(self):
+        queries = np.array([[0.9, 0.1, 0, 0], [0, 0.2, 0.9, 0]], dtype=np.float32)
+        votes = knn_vote(self.client, [Requirement("N1", ""), Requirement("N2", "")], queries, k=2)
+        self.assertEqual([(vote.req_id, vote.label) for vote in votes], [("N1", "Component 0"), ("N2", "Component 2")])
+        self.assertTrue(all(vote.margin == 1.0 for vote in votes))
+
+    def test_auto_labelled_points_do_not_vote(self):
+        """Test that predictions never feed on earlier predictions."""
+        wrong = [tally(f"A{idx}", [neighbour(2, "Component 2", 1.0)]) for idx in range(3)]
+        same_direction = np.tile(np.array([[1, 0, 0, 0]], dtype=np.float32), (3, 1))
+        upload_auto_labelled(self.client, [Requirement(vote.req_id, "") for vote in wrong], same_direction, wrong,
+                             first_id=len(self.requirements))
+
+        votes = knn_vote(self.client, [Requirement("N1", "")], np.array([[1, 0, 0, 0]], dtype=np.float32), k=3)
+        self.assertEqual(votes[0].label, "Component 0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Test suite for qdrant_benchmark.py
+
+Tests one small run per storage configuration on an in-memory local client.
+"""
+
+import unittest
+from unittest import mock
+
+from qdrant_client import QdrantClient
+
+import qdrant_benchmark
+from qdrant_benchmark import CONFIGURATIONS, run_configuration
+from qdrant_ingest import COMPONENT_LABELS, Requirement
+
+REQUIREMENTS = [Requirement(f"R{idx}", f"Customers manage order {idx} by SMS and email") for idx in range(30)]
+ASSIGNMENTS = [(idx % 3, COMPONENT_LABELS[idx % 3]) for idx in range(30)]
+
+
+class TestRunConfiguration(unittest.TestCase):
+    """Test the per-configuration report"""
+
+    def setUp(self):
+        self.client = QdrantClient(location=":memory:")
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_every_configuration(self):
+        for configuration in CONFIGURATIONS:
+            with self.subTest(configuration=configuration):
+                result = run_configuration(self.client, configuration, REQUIREMENTS, ASSIGNMENTS, REQUIREMENTS[:5])
+                self.assertEqual(result["points"], len(REQUIREMENTS))
+                self.assertEqual(result["search"]["queries"], 5)
+                self.assertGreater(result["client_memory_estimate"]["vector_bytes"], 0)
+                self.assertIn(result["client_memory_estimate"]["rss_kind"], ("current", "peak"))
+        self.assertEqual(self.client.get_collections().collections, [])
+
+    def test_sparse_ingest_builds_no_dense_vectors(self):
+        """Test that the sparse configuration only vectorises what it stores."""
+        with mock.patch.object(qdrant_benchmark, "stream_embeddings") as stream:
+            qdrant_benchmark._create(self.client, "sparse", "sparse", 0)
+            qdrant_benchmark._ingest(self.client, "sparse", "sparse", REQUIREMENTS, ASSIGNMENTS)
+        stream.assert_not_called()
+        self.assertEqual(self.client.count("sparse").count, len(REQUIREMENTS))
+
+    def test_rss_bytes(self):
+        self.assertGreater(qdrant_benchmark._rss_bytes(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
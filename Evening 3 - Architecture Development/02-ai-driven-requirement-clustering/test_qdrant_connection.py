@@ -0,0 +1,178 @@
+"""
+Test suite for qdrant_connection.py
+
+Tests request timing of wrapped clients, the client pool keyed by settings,
+and that library functions keep using isolated clients unless given one.
+"""
+
+import argparse
+import io
+import unittest
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+from qdrant_connection import (
+    ClientSettings,
+    RequestMetrics,
+    TimedClient,
+    add_client_arguments,
+    close_async_clients,
+    close_clients,
+    get_async_client,
+    get_client,
+    pooled_clients,
+    print_metrics,
+    settings_from_args,
+)
+from qdrant_ingest import COLLECTION_NAME, Requirement, upload_to_qdrant
+
+
+class TestRequestMetrics(unittest.TestCase):
+    """Test per-operation counts and percentiles"""
+
+    def test_snapshot(self):
+        metrics = RequestMetrics()
+        for seconds in (0.001, 0.002, 0.003):
+            metrics.record("search", seconds)
+        stats = metrics.snapshot()["search"]
+        self.assertEqual(stats["count"], 3)
+        self.assertAlmostEqual(stats["total_seconds"], 0.006)
+        self.assertAlmostEqual(stats["p50_ms"], 2.0)
+        self.assertAlmostEqual(stats["max_ms"], 3.0)
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_samples_are_bounded(self):
+        metrics = RequestMetrics(max_samples=2)
+        for seconds in (1.0, 0.001, 0.001):
+            metrics.record("upsert", seconds)
+        stats = metrics.snapshot()["upsert"]
+        self.assertEqual(stats["count"], 3)
+        self.assertAlmostEqual(stats["max_ms"], 1.0)
+
+
+class TestTimedClient(unittest.TestCase):
+    """Test the timing wrapper around a local client"""
+
+    def setUp(self):
+        self.client = TimedClient(QdrantClient(location=":memory:"))
+
+    def tearDown(self):
+        self.client.client.close()
+
+    def test_records_each_call_by_operation(self):
+        """Test that method calls are forwarded and counted per name."""
+        self.assertFalse(self.client.collection_exists("missing"))
+        self.assertFalse(self.client.collection_exists("missing"))
+        self.client.get_collections()
+        snapshot = self.client.metrics.snapshot()
+        self.assertEqual({name: stats["count"] for name, stats in snapshot.items()},
+                         {"collection_exists": 2, "get_collections": 1})
+
+    def test_failed_calls_are_timed(self):
+        """Test that a call that raises is still recorded."""
+        with self.assertRaises(Exception):
+            self.client.get_collection("missing")
+        self.assertEqual(self.client.metrics.snapshot()["get_collection"]["count"], 1)
+
+    def test_attributes_pass_through(self):
+        """Test that non-callable attributes are returned as-is, so is_local() works on the wrapper."""
+        self.assertEqual(self.client.init_options["location"], ":memory:")
+        self.assertIs(self.client.collection_exists, self.client.collection_exists)
+
+
+class TestTimedAsyncClient(unittest.IsolatedAsyncioTestCase):
+    """Test that coroutine methods are timed until they complete"""
+
+    async def test_async_calls_are_awaited_and_recorded(self):
+        client = TimedClient(AsyncQdrantClient(location=":memory:"))
+        try:
+            self.assertFalse(await client.collection_exists("missing"))
+        finally:
+            await client.client.close()
+        self.assertEqual(client.metrics.snapshot()["collection_exists"]["count"], 1)
+
+
+class TestPool(unittest.TestCase):
+    """Test the process-wide client pool"""
+
+    def tearDown(self):
+        close_clients()
+
+    def test_equal_settings_share_a_client(self):
+        first = get_client(ClientSettings())
+        self.assertIs(get_client(ClientSettings(transport="local")), first)
+        self.assertIs(get_client(), first)
+        self.assertIsInstance(first, TimedClient)
+
+    def test_different_settings_get_different_clients(self):
+        memory = get_client(ClientSettings())
+        http = get_client(ClientSettings(transport="http", url="http://localhost:1"))
+        self.assertIsNot(memory, http)
+        self.assertEqual(set(pooled_clients()), {ClientSettings(), ClientSettings(transport="http",
+                                                                                  url="http://localhost:1")})
+        self.assertFalse(http.init_options.get("prefer_grpc"))
+
+    def test_grpc_prefers_grpc(self):
+        client = get_client(ClientSettings(transport="grpc", url="http://localhost:1", grpc_port=1))
+        self.assertTrue(client.init_options["prefer_grpc"])
+        self.assertEqual(client.init_options["grpc_port"], 1)
+
+    def test_close_clients_empties_the_pool(self):
+        first = get_client()
+        close_clients()
+        self.assertEqual(pooled_clients(), {})
+        self.assertIsNot(get_client(), first)
+
+    def test_invalid_transport(self):
+        with self.assertRaises(ValueError):
+            ClientSettings(transport="carrier-pigeon")
+
+    def test_settings_from_args(self):
+        parser = argparse.ArgumentParser()
+        add_client_arguments(parser)
+        args = parser.parse_args(["--transport", "grpc", "--grpc-port", "7000", "--metrics"])
+        self.assertEqual(settings_from_args(args), ClientSettings(transport="grpc", grpc_port=7000))
+        self.assertTrue(args.metrics)
+
+    def test_print_metrics_skips_idle_clients(self):
+        get_client(ClientSettings(transport="http", url="http://localhost:1"))
+        get_client().get_collections()
+        output = io.StringIO()
+        print_metrics(output)
+        self.assertIn("Qdrant requests (local, :memory:)", output.getvalue())
+        self.assertIn("get_collections", output.getvalue())
+        self.assertNotIn("localhost:1", output.getvalue())
+
+
+class TestAsyncPool(unittest.IsolatedAsyncioTestCase):
+    """Test the pool of async clients"""
+
+    async def test_equal_settings_share_an_async_client(self):
+        client = get_async_client()
+        self.assertIs(get_async_client(ClientSettings()), client)
+        self.assertIsInstance(client.client, AsyncQdrantClient)
+        self.assertIsNot(client, get_client())
+        await close_async_clients()
+        self.assertIsNot(get_async_client(), client)
+        await close_async_clients()
+        close_clients()
+
+
+class TestLibraryDefaults(unittest.TestCase):
+    """Test that library calls without a client do not share the pooled store"""
+
+    def test_upload_without_client_is_isolated(self):
+        requirements = [Requirement("R1", "Users log in"), Requirement("R2", "Admins export reports")]
+        embeddings = np.eye(2, 4, dtype=np.float32)
+        assignments = [(0, "Auth"), (1, "Reports")]
+        first = upload_to_qdrant(requirements, embeddings, assignments)
+        second = upload_to_qdrant(requirements[:1], embeddings[:1], assignments[:1])
+        self.assertIsNot(first, second)
+        self.assertEqual(first.count(COLLECTION_NAME).count, 2)
+        self.assertEqual(pooled_clients(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
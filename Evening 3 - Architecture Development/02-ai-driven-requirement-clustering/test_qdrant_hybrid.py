@@ -0,0 +1,131 @@
+"""
+Test suite for qdrant_hybrid.py
+
+Tests the query built for each search mode and dense, sparse and fused ranking
+on an in-memory local client, with a stub encoder returning synthetic dense
+vectors so no sentence-transformers model is needed.
+"""
+
+import unittest
+
+import numpy as np
+from qdrant_client.http import models as qmodels
+
+from qdrant_hybrid import (
+    DENSE_VECTOR,
+    SPARSE_VECTOR,
+    hybrid_request,
+    hybrid_search,
+    label_precision,
+    sparse_vectors,
+    upload_hybrid,
+)
+from qdrant_ingest import Requirement, make_vectorizer
+
+# A ranks first by meaning only, B first by keywords only, C second by both.
+TEXTS = {
+    "A": "The courier confirms the address",
+    "B": "Refund the card payment",
+    "C": "Card delivery",
+    "D": "The courier picks a slot",
+}
+DENSE = {
+    "A": [1.0, 0.0, 0.0],
+    "B": [-0.1, 0.0, 1.0],
+    "C": [0.9, 0.43, 0.0],
+    "D": [0.1, 1.0, 0.0],
+}
+QUERY = "refund card"
+QUERY_VECTOR = [1.0, 0.0, 0.0]
+
+
+def stub_encoder(vectors):
+    def encode(texts):
+        dense = np.array([vectors[text] for text in texts], dtype=np.float32)
+        return dense / np.linalg.norm(dense, axis=1, keepdims=True)
+
+    return encode
+
+
+class TestHybridRequest(unittest.TestCase):
+    """Test the query request per search mode"""
+
+    def setUp(self):
+        self.dense = np.array([0.6, 0.8], dtype=np.float32)
+        self.sparse = qmodels.SparseVector(indices=[3], values=[1.0])
+
+    def test_single_vector_modes(self):
+        dense = hybrid_request(self.dense, self.sparse, 5, mode="dense")
+        self.assertEqual((dense.using, dense.limit), (DENSE_VECTOR, 5))
+        self.assertEqual(dense.query, self.dense.tolist())
+        sparse = hybrid_request(self.dense, self.sparse, 5, mode="sparse")
+        self.assertEqual((sparse.using, sparse.query), (SPARSE_VECTOR, self.sparse))
+
+    def test_fused_prefetches_both_vectors(self):
+        request = hybrid_request(self.dense, self.sparse, 5, prefetch_limit=20)
+        self.assertEqual([(prefetch.using, prefetch.limit) for prefetch in request.prefetch],
+                         [(DENSE_VECTOR, 20), (SPARSE_VECTOR, 20)])
+        self.assertEqual(request.query, qmodels.FusionQuery(fusion=qmodels.Fusion.RRF))
+        self.assertEqual(request.limit, 5)
+
+    def test_unknown_mode(self):
+        with self.assertRaisesRegex(ValueError, "keyword"):
+            hybrid_request(self.dense, self.sparse, 5, mode="keyword")
+
+
+class TestHybridSearch(unittest.TestCase):
+    """Test ranking per mode on a hybrid collection"""
+
+    def setUp(self):
+        self.requirements = [Requirement(req_id, text) for req_id, text in TEXTS.items()]
+        self.vectorizer = make_vectorizer().fit(list(TEXTS.values()))
+        vectors = {TEXTS[req_id]: vector for req_id, vector in DENSE.items()}
+        vectors[QUERY] = QUERY_VECTOR
+        self.encode = stub_encoder(vectors)
+        texts = [req.text for req in self.requirements]
+        self.client = upload_hybrid(self.requirements, self.encode(texts), sparse_vectors(self.vectorizer, texts),
+                                    [(0, "Delivery"), (1, "Payments"), (0, "Delivery"), (0, "Delivery")])
+
+    def tearDown(self):
+        self.client.close()
+
+    def search(self, mode):
+        (found,) = hybrid_search(self.client, [QUERY], self.encode, self.vectorizer, k=4, mode=mode)
+        return [neighbour.req_id for neighbour in found]
+
+    def test_dense_and_sparse_disagree(self):
+        self.assertEqual(self.search("dense"), ["A", "C", "D", "B"])
+        self.assertEqual(self.search("sparse"), ["B", "C"])
+
+    def test_fusion_rewards_agreement(self):
+        """Test that RRF puts the results both rankings found above the one only dense search found."""
+        fused = self.search("fused")
+        self.assertEqual(set(fused[:2]), {"B", "C"})
+        self.assertLess(fused.index("C"), fused.index("A"))
+
+    def test_sparse_vectors_are_unit_length(self):
+        for vector in sparse_vectors(self.vectorizer, [QUERY, "no overlap at all"]):
+            self.assertAlmostEqual(float(np.dot(vector.values, vector.values)), 1.0 if vector.values else 0.0,
+                                   places=5)
+
+
+class TestLabelPrecision(unittest.TestCase):
+    """Test leave-one-out precision on two well-separated components"""
+
+    def test_separated_components(self):
+        texts = ["Customers pay by card", "Customers pay by invoice", "Couriers deliver parcels",
+                 "Couriers deliver letters"]
+        requirements = [Requirement(f"R{idx}", text) for idx, text in enumerate(texts)]
+        dense = np.repeat(np.eye(2, 3, dtype=np.float32), 2, axis=0)
+        vectorizer = make_vectorizer().fit(texts)
+        sparse = sparse_vectors(vectorizer, texts)
+        client = upload_hybrid(requirements, dense, sparse, [(0, "Payments")] * 2 + [(1, "Delivery")] * 2)
+        try:
+            self.assertEqual(label_precision(client, dense, sparse, k=1),
+                             {"dense": 1.0, "sparse": 1.0, "fused": 1.0})
+        finally:
+            client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
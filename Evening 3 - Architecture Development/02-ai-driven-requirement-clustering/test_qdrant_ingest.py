@@ -0,0 +1,331 @@
+"""
+Test suite for qdrant_ingest.py
+
+Tests incremental ingest, paged lookups, the snapshot round trip (plain and
+named dense and sparse vectors), the quantization benchmark and the --hybrid
+ingest on an in-memory local client with the stateless hashing vectorizer and
+small hand-written requirements.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import qdrant_hybrid
+import qdrant_ingest
+from qdrant_hybrid import DENSE_VECTOR, HYBRID_COLLECTION_NAME, SPARSE_VECTOR, sparse_vectors, upload_hybrid
+from qdrant_ingest import (
+    COLLECTION_NAME,
+    COMPONENT_LABELS,
+    Requirement,
+    add_requirements,
+    assign_cluster_labels,
+    benchmark_quantization,
+    collection_params,
+    embed_requirements,
+    export_snapshot,
+    fetch_cluster_summary,
+    import_snapshot,
+    make_hashing_vectorizer,
+    make_vectorizer,
+    next_point_id,
+    source_hash,
+    stored_req_ids,
+    synthetic_corpus,
+    upload_to_qdrant,
+)
+from qdrant_search import point_ids_for
+
+STORED = [
+    Requirement("R24", "The courier delivers the order to the customer address"),
+    Requirement("R25", "The courier confirms the delivery of the order at the address"),
+    Requirement("R10", "The administrator manages user roles and access permissions"),
+    Requirement("R34", "Only users with the administrator role may change access permissions"),
+]
+
+
+def payloads_by_req_id(client):
+    points, _ = client.scroll(collection_name=COLLECTION_NAME, limit=100, with_payload=True)
+    return {point.payload["req_id"]: (point.id, point.payload) for point in points}
+
+
+class TestAddRequirements(unittest.TestCase):
+    """Test appending requirements to a stored collection"""
+
+    def setUp(self):
+        self.vectorizer = make_hashing_vectorizer()
+        self.client = upload_to_qdrant(STORED, embed_requirements(STORED, self.vectorizer),
+                                       assign_cluster_labels(STORED))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_unmapped_requirement_is_labelled_by_vote(self):
+        """Test that a requirement missing from the component mapping is voted instead of rejected."""
+        added = add_requirements(self.client, [Requirement("R45", "The courier delivers the order quickly")],
+                                 self.vectorizer)
+        self.assertEqual(added, 1)
+        _, payload = payloads_by_req_id(self.client)["R45"]
+        self.assertEqual(payload["label"], "Delivery Management")
+        self.assertTrue(payload["auto_labelled"])
+        self.assertGreater(payload["vote_margin"], 0)
+
+    def test_mapped_requirement_keeps_its_component(self):
+        added = add_requirements(self.client, [Requirement("R32", "Delivery slots are shown to the customer")],
+                                 self.vectorizer)
+        self.assertEqual(added, 1)
+        _, payload = payloads_by_req_id(self.client)["R32"]
+        self.assertEqual(payload["label"], "Delivery Management")
+        self.assertNotIn("auto_labelled", payload)
+
+    def test_ids_continue_after_the_largest_id(self):
+        """Test that a gap in the ids does not make new points overwrite existing ones."""
+        self.client.delete(COLLECTION_NAME, points_selector=qmodels.PointIdsList(points=[0]), wait=True)
+        self.assertEqual(next_point_id(self.client), len(STORED))
+        add_requirements(self.client, [Requirement("R32", "Delivery slots are shown to the customer"),
+                                       Requirement("R46", "The administrator reviews access permissions")],
+                         self.vectorizer, chunk_size=1)
+        stored = payloads_by_req_id(self.client)
+        self.assertEqual(set(stored), {"R25", "R10", "R34", "R32", "R46"})
+        self.assertEqual(stored["R32"][0], len(STORED))
+        self.assertEqual(stored["R46"][0], len(STORED) + 1)
+        self.assertEqual(stored["R46"][1]["label"], "Access Control")
+
+    def test_stored_requirements_are_skipped(self):
+        self.assertEqual(add_requirements(self.client, STORED, self.vectorizer), 0)
+        self.assertEqual(self.client.count(COLLECTION_NAME).count, len(STORED))
+
+
+class TestScrolling(unittest.TestCase):
+    """Test that lookups and the summary see every stored point, not just the first page"""
+
+    def test_summary_covers_the_whole_collection(self):
+        requirements, assignments = synthetic_corpus(STORED, 1500)
+        client = upload_to_qdrant(requirements, embed_requirements(requirements, make_hashing_vectorizer()),
+                                  assignments)
+        try:
+            summary = fetch_cluster_summary(client)
+        finally:
+            client.close()
+        self.assertEqual(sum(len(entries) for entries in summary.values()), len(requirements))
+        self.assertEqual(len(summary["Delivery Management"]),
+                         sum(label == "Delivery Management" for _, label in assignments))
+
+    def test_lookups_with_repeated_req_ids(self):
+        """Test that a req_id stored twice does not crowd the others out of the lookup."""
+        stored = STORED[:1] + STORED
+        client = upload_to_qdrant(stored, embed_requirements(stored, make_hashing_vectorizer()),
+                                  assign_cluster_labels(stored))
+        try:
+            self.assertEqual(stored_req_ids(client, ["R24", "R10"]), {"R24", "R10"})
+            self.assertEqual(stored_req_ids(client, ["R10", "R10", "R10"]), {"R10"})
+            self.assertEqual(set(point_ids_for(client, ["R24", "R10"])), {"R24", "R10"})
+        finally:
+            client.close()
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test export_snapshot / import_snapshot and the source fingerprint"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "snapshot.npz"
+        self.embeddings = embed_requirements(STORED, make_hashing_vectorizer())
+        self.client = upload_to_qdrant(STORED, self.embeddings, assign_cluster_labels(STORED))
+
+    def tearDown(self):
+        self.client.close()
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Test that ids, payloads and vectors survive export and import."""
+        export_snapshot(self.client, self.path, "digest")
+        restored = import_snapshot(self.path, "digest")
+        try:
+            points, _ = restored.scroll(COLLECTION_NAME, limit=100, with_payload=True, with_vectors=True)
+            original, _ = self.client.scroll(COLLECTION_NAME, limit=100, with_payload=True, with_vectors=True)
+            self.assertEqual([(p.id, p.payload) for p in points], [(p.id, p.payload) for p in original])
+            np.testing.assert_allclose([p.vector for p in points], [p.vector for p in original], rtol=1e-6)
+        finally:
+            restored.close()
+
+    def test_empty_collection_round_trip(self):
+        """Test that an empty collection keeps its dimension through the snapshot."""
+        empty = QdrantClient(location=":memory:")
+        empty.create_collection(COLLECTION_NAME, **collection_params(self.embeddings.shape[1]))
+        export_snapshot(empty, self.path, "digest")
+        empty.close()
+        restored = import_snapshot(self.path, "digest")
+        try:
+            self.assertEqual(restored.count(COLLECTION_NAME).count, 0)
+            self.assertEqual(restored.get_collection(COLLECTION_NAME).config.params.vectors.size,
+                             self.embeddings.shape[1])
+        finally:
+            restored.close()
+
+    def test_named_vectors_round_trip(self):
+        """Test that a collection with named dense and sparse vectors survives export and import."""
+        texts = [req.text for req in STORED]
+        vectorizer = make_vectorizer().fit(texts)
+        hybrid = upload_hybrid(STORED, self.embeddings[:, :8] + 0.01, sparse_vectors(vectorizer, texts),
+                               assign_cluster_labels(STORED))
+        export_snapshot(hybrid, self.path, "digest", collection_name=HYBRID_COLLECTION_NAME)
+        restored = import_snapshot(self.path, "digest")
+        try:
+            params = restored.get_collection(HYBRID_COLLECTION_NAME).config.params
+            self.assertEqual(params.vectors[DENSE_VECTOR].size, 8)
+            self.assertEqual(list(params.sparse_vectors), [SPARSE_VECTOR])
+            points, _ = restored.scroll(HYBRID_COLLECTION_NAME, limit=100, with_payload=True, with_vectors=True)
+            original, _ = hybrid.scroll(HYBRID_COLLECTION_NAME, limit=100, with_payload=True, with_vectors=True)
+            self.assertEqual([(p.id, p.payload) for p in points], [(p.id, p.payload) for p in original])
+            for point, expected in zip(points, original):
+                np.testing.assert_allclose(point.vector[DENSE_VECTOR], expected.vector[DENSE_VECTOR], rtol=1e-6)
+                self.assertEqual(point.vector[SPARSE_VECTOR].indices, expected.vector[SPARSE_VECTOR].indices)
+                np.testing.assert_allclose(point.vector[SPARSE_VECTOR].values, expected.vector[SPARSE_VECTOR].values,
+                                           rtol=1e-6)
+        finally:
+            hybrid.close()
+            restored.close()
+
+    def test_stale_or_missing_snapshot(self):
+        export_snapshot(self.client, self.path, "digest")
+        self.assertIsNone(import_snapshot(self.path, "other digest"))
+        self.assertIsNone(import_snapshot(self.path.with_name("missing.npz"), "digest"))
+
+    def test_source_hash_covers_label_order(self):
+        """Test that reordering COMPONENT_LABELS, which changes stored cluster ids, invalidates snapshots."""
+        data = Path(self.directory.name) / "requirements.json"
+        data.write_text("[]", encoding="utf-8")
+        digest = source_hash(data)
+        self.assertEqual(source_hash(data), digest)
+        with mock.patch("qdrant_ingest.COMPONENT_LABELS", COMPONENT_LABELS[::-1]):
+            self.assertNotEqual(source_hash(data), digest)
+        self.assertNotEqual(source_hash(data, quantization="scalar"), digest)
+
+    def test_source_hash_covers_the_active_vectorizer(self):
+        """Test that each vectorizer mode hashes its own settings."""
+        data = Path(self.directory.name) / "requirements.json"
+        data.write_text("[]", encoding="utf-8")
+        hashing, tfidf = source_hash(data, vectorizer="hashing"), source_hash(data)
+        with mock.patch("qdrant_ingest.N_FEATURES", 2048):
+            self.assertNotEqual(source_hash(data, vectorizer="hashing"), hashing)
+        with mock.patch("qdrant_ingest.make_vectorizer", lambda: TfidfVectorizer(max_features=10)):
+            self.assertEqual(source_hash(data, vectorizer="hashing"), hashing)
+            self.assertNotEqual(source_hash(data), tfidf)
+
+
+class TestBenchmarkQuantization(unittest.TestCase):
+    """Test where recall@k of the quantization modes comes from"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        embeddings = rng.normal(size=(40, 16)).astype(np.float32)
+        self.embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    def test_local_mode_is_simulated(self):
+        client = QdrantClient(location=":memory:")
+        try:
+            rows = benchmark_quantization(self.embeddings, k=3, client=client)
+        finally:
+            client.close()
+        self.assertEqual([(row["quantization"], row["measured"]) for row in rows],
+                         [("none", "simulated"), ("scalar", "simulated"), ("binary", "simulated")])
+        self.assertEqual(rows[0]["recall"], 1.0)
+        self.assertTrue(all(0.0 < row["recall"] <= 1.0 for row in rows))
+
+    def test_server_searches_a_quantized_collection(self):
+        """Test that a server client gets one quantized collection per mode, queried with rescoring, then dropped."""
+        client = QdrantClient(location=":memory:")
+        created, queried = [], []
+        create, query = client.create_collection, client.query_batch_points
+
+        def record_create(collection_name, **kwargs):
+            created.append((collection_name, kwargs["quantization_config"]))
+            return create(collection_name, **kwargs)
+
+        def record_query(collection_name, requests, **kwargs):
+            queried.append({request.params.quantization.rescore for request in requests})
+            return query(collection_name, requests, **kwargs)
+
+        try:
+            with mock.patch.object(qdrant_ingest, "is_local", return_value=False), \
+                    mock.patch.object(client, "create_collection", record_create), \
+                    mock.patch.object(client, "query_batch_points", record_query), \
+                    self.assertWarnsRegex(UserWarning, "search_params"):
+                rows = benchmark_quantization(self.embeddings, k=3, modes=("scalar", "binary"), client=client)
+            self.assertEqual([row["measured"] for row in rows], ["server", "server"])
+            # Local mode searches exactly, so the "server" here finds the true neighbours.
+            self.assertEqual([row["recall"] for row in rows], [1.0, 1.0])
+            self.assertEqual([type(config) for _, config in created],
+                             [qmodels.ScalarQuantization, qmodels.BinaryQuantization])
+            self.assertEqual(queried, [{True}, {True}])
+            self.assertEqual(client.get_collections().collections, [])
+        finally:
+            client.close()
+
+
+class TestHybridIngest(unittest.TestCase):
+    """Test qdrant_ingest.py --hybrid with a stub sentence encoder"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        data = self.directory / "requirements.json"
+        data.write_text("[]", encoding="utf-8")
+        self.client = QdrantClient(location=":memory:")
+        self.addCleanup(self.client.close)
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.addCleanup(os.chdir, cwd)
+
+        def encoder():
+            return lambda texts: np.tile(np.eye(1, 8, dtype=np.float32), (len(texts), 1))
+
+        for patch in (
+            mock.patch.object(qdrant_ingest, "DATA_PATH", data),
+            mock.patch.object(qdrant_ingest, "load_requirements", return_value=STORED),
+            mock.patch.object(qdrant_ingest, "get_client", return_value=self.client),
+            mock.patch.object(qdrant_hybrid, "sentence_encoder", encoder),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def run_main(self, argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            qdrant_ingest.main(argv)
+        return output.getvalue()
+
+    def test_stores_named_vectors_in_the_main_collection(self):
+        self.run_main(["--hybrid"])
+        params = self.client.get_collection(COLLECTION_NAME).config.params
+        self.assertEqual(params.vectors[DENSE_VECTOR].size, 8)
+        self.assertEqual(list(params.sparse_vectors), [SPARSE_VECTOR])
+        self.assertEqual(self.client.count(COLLECTION_NAME).count, len(STORED))
+        summary = json.loads((self.directory / "results" / "qdrant_clusters.json").read_text(encoding="utf-8"))
+        self.assertEqual(sorted(entry["req_id"] for items in summary.values() for entry in items),
+                         sorted(req.req_id for req in STORED))
+
+    def test_snapshot_round_trip(self):
+        """Test that a --hybrid snapshot is restored by a later --hybrid run, but not by a plain one."""
+        snapshot = str(self.directory / "hybrid.npz")
+        self.assertIn("Snapshot written", self.run_main(["--hybrid", "--snapshot", snapshot]))
+        self.assertIn("Restored collection", self.run_main(["--hybrid", "--snapshot", snapshot]))
+        self.assertIn("Snapshot written", self.run_main(["--snapshot", snapshot]))
+        self.assertEqual(self.client.get_collection(COLLECTION_NAME).config.params.vectors.size,
+                         len(make_vectorizer().fit([req.text for req in STORED]).vocabulary_))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Test suite for qdrant_multi_ingest.py
+
+Tests collection naming per layout, point ids, and a partitioned ingest of two
+small corpora into an in-memory local client.
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+
+from qdrant_ingest import COLLECTION_NAME, collection_params
+from qdrant_multi_ingest import (
+    PARTITIONED_COLLECTION_NAME,
+    collection_for,
+    discover_corpora,
+    ingest_corpora,
+    point_id,
+    project_filter,
+)
+
+
+class TestNaming(unittest.TestCase):
+    """Test collection names and point ids"""
+
+    def test_collection_for(self):
+        self.assertEqual(collection_for("shop", "collections"), f"{COLLECTION_NAME}_shop")
+        self.assertEqual(collection_for("shop", "partitioned"), PARTITIONED_COLLECTION_NAME)
+        self.assertNotEqual(PARTITIONED_COLLECTION_NAME, COLLECTION_NAME)
+        with self.assertRaises(ValueError):
+            collection_for("shop", "sharded")
+
+    def test_point_id(self):
+        """Test that ids are stable per (project, requirement) and differ across projects."""
+        self.assertEqual(point_id("shop", "R1"), point_id("shop", "R1"))
+        self.assertNotEqual(point_id("shop", "R1"), point_id("bank", "R1"))
+
+
+class TestPartitionedIngest(unittest.TestCase):
+    """Test that the partitioned layout leaves the single-project collection alone"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = Path(self.directory.name)
+        for project, texts in {"shop": ["Customers add items to the cart", "Customers pay by card"],
+                               "bank": ["Clerks open accounts"]}.items():
+            items = [{"id": f"R{idx}", "text": text} for idx, text in enumerate(texts, start=1)]
+            (root / f"{project}.json").write_text(json.dumps(items), encoding="utf-8")
+        self.corpora = discover_corpora(root)
+        self.client = QdrantClient(location=":memory:")
+
+    def tearDown(self):
+        self.client.close()
+        self.directory.cleanup()
+
+    def test_single_project_collection_survives(self):
+        self.client.create_collection(COLLECTION_NAME, **collection_params(4))
+        self.client.upsert(COLLECTION_NAME, points=[qmodels.PointStruct(id=0, vector=np.ones(4).tolist())])
+
+        _, reports = ingest_corpora(self.corpora, layout="partitioned", vectorizer_mode="hashing",
+                                    client=self.client, workers=1)
+
+        self.assertEqual(self.client.count(COLLECTION_NAME).count, 1)
+        self.assertEqual({report.collection for report in reports}, {PARTITIONED_COLLECTION_NAME})
+        self.assertEqual(self.client.count(PARTITIONED_COLLECTION_NAME).count, 3)
+        shop = self.client.count(PARTITIONED_COLLECTION_NAME, count_filter=project_filter("shop")).count
+        self.assertEqual(shop, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""Microbenchmark: calls/sec of the moon() engines in mars_moon_core.py
+
+Usage:
+  python3 bench_mars_moon_core.py [--calls N] [--repeat R]
+"""
+
+import argparse
+import random
+import timeit
+
+from mars_moon_core import MOON_ENGINE, MOON_ENGINES
+
+
+def random_queries(count: int, seed: int = 0) -> list[tuple[int, ...]]:
+    """Random valid moon() argument tuples (hours 0-25, minutes 0-99)."""
+    rng = random.Random(seed)
+    return [
+        tuple(rng.randint(0, 25) if i % 2 == 0 else rng.randint(0, 99) for i in range(8))
+        for _ in range(count)
+    ]
+
+
+def calls_per_second(engine, queries: list[tuple[int, ...]], repeat: int) -> float:
+    """Best of ``repeat`` runs over all queries."""
+    best = min(timeit.repeat(lambda: [engine(*query) for query in queries], number=1, repeat=repeat))
+    return len(queries) / best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Calls/sec of the moon() engines")
+    parser.add_argument("--calls", type=int, default=200_000, help="Random queries per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per engine; the best is reported")
+    args = parser.parse_args(argv)
+
+    queries = random_queries(args.calls)
+    rates = {name: calls_per_second(engine, queries, args.repeat) for name, engine in MOON_ENGINES.items()}
+    print(f"moon() is bound to the {MOON_ENGINE!r} engine")
+    for name, rate in rates.items():
+        print(f"  {name:>8}: {rate:>12,.0f} calls/sec ({rate / rates['pipeline']:.1f}x pipeline)")
+
+
+if __name__ == "__main__":
+    main()
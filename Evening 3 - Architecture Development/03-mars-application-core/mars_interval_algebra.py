@@ -0,0 +1,133 @@
+"""Mars Moon Visibility Calculator - interval algebra for many bodies and windows
+
+Generalizes components C and D from one Deimos and one Phobos window to any
+number of named bodies, each with any number of windows. Windows are
+normalized with the TimeWindowNormalizer rules; unions and intersections are
+computed with a sort-and-sweep in O(n log n) instead of comparing every pair
+of intervals.
+"""
+
+from collections.abc import Iterable, Mapping
+
+from mars_moon_core import (
+    MARS_MINUTES_PER_DAY,
+    DurationExtractor,
+    Interval,
+    TimeWindow,
+    TimeWindowNormalizer,
+)
+
+_normalizer = TimeWindowNormalizer()
+
+
+# ===== Normalization =====
+
+def normalize_windows(windows: Iterable[TimeWindow]) -> list[Interval]:
+    """Normalize every window of one body into half-open minute intervals."""
+    intervals: list[Interval] = []
+    for window in windows:
+        intervals.extend(_normalizer.normalize_window(window))
+    return intervals
+
+
+# ===== Set operations =====
+
+def union(intervals: Iterable[Interval]) -> list[Interval]:
+    """Sorted, disjoint intervals covering the same minutes; touching intervals are merged."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def intersection(*interval_sets: Iterable[Interval]) -> list[Interval]:
+    """Minutes covered by every interval set, as sorted disjoint intervals.
+
+    Each set is merged first, then one sweep over all start/end events tracks
+    how many sets cover the current minute.
+    """
+    if not interval_sets:
+        raise ValueError("Expected at least one interval set")
+
+    events: list[tuple[int, int]] = []
+    for intervals in interval_sets:
+        for start, end in union(intervals):
+            events.append((start, 1))
+            events.append((end, -1))
+    # Ends sort before starts at the same minute: [a, b) and [b, c) do not overlap.
+    events.sort()
+
+    required = len(interval_sets)
+    active = 0
+    opened = 0
+    result: list[Interval] = []
+    for position, delta in events:
+        if delta < 0 and active == required and position > opened:
+            result.append((opened, position))
+        active += delta
+        if active == required:
+            opened = position
+    return result
+
+
+def duration(intervals: Iterable[Interval]) -> int:
+    """Total minutes of disjoint intervals."""
+    return sum(end - start for start, end in intervals)
+
+
+# ===== Joint visibility (components C + D for many bodies) =====
+
+def boundary_points(intervals: Iterable[Interval]) -> set[int]:
+    """Boundary points in circular time (0 ≡ 2500), as in DurationExtractor."""
+    points: set[int] = set()
+    for start, end in intervals:
+        points.add(start % MARS_MINUTES_PER_DAY)
+        points.add(end % MARS_MINUTES_PER_DAY)
+    return points
+
+
+def joint_intervals(bodies: Mapping[str, Iterable[TimeWindow]]) -> list[Interval]:
+    """Minutes during which every body is visible."""
+    return intersection(*(normalize_windows(windows) for windows in bodies.values()))
+
+
+def joint_visibility(bodies: Mapping[str, Iterable[TimeWindow]]) -> int:
+    """Joint visibility of all bodies in Mars-minutes, with the Twilight Rule.
+
+    If no minute is common to all bodies, the result is 1 when every body has
+    a window boundary at the same point in circular time (REQ3), else 0. For
+    one Deimos and one Phobos window this equals ``moon(...)``.
+    """
+    normalized = [normalize_windows(windows) for windows in bodies.values()]
+    if not normalized:
+        raise ValueError("Expected at least one body")
+
+    minutes = duration(intersection(*normalized))
+    if minutes > 0:
+        return minutes
+
+    shared = set.intersection(*(boundary_points(intervals) for intervals in normalized))
+    return DurationExtractor.TWILIGHT_MINUTES if shared else 0
+
+
+def visible_minutes(windows: Iterable[TimeWindow]) -> int:
+    """Minutes per sol during which a body is visible in at least one of its windows."""
+    return duration(union(normalize_windows(windows)))
+
+
+# ===== Examples =====
+
+if __name__ == "__main__":
+    bodies = {
+        "Deimos": [TimeWindow(1, 0, 4, 0), TimeWindow(20, 0, 2, 0)],
+        "Phobos": [TimeWindow(3, 0, 6, 0), TimeWindow(24, 0, 0, 50)],
+        "Sun": [TimeWindow(0, 30, 12, 30)],
+    }
+    print("Joint intervals:", joint_intervals(bodies))
+    print("Joint visibility:", joint_visibility(bodies), "minutes")
+    for name, windows in bodies.items():
+        print(f"  {name} visible {visible_minutes(windows)} minutes per sol")
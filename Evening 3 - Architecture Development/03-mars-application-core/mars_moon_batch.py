@@ -0,0 +1,93 @@
+"""Mars Moon Visibility Calculator - vectorised batch evaluation
+
+Evaluates many Deimos/Phobos window pairs at once with NumPy. Every row of the
+input is one ``moon(...)`` call; the result is identical to calling ``moon``
+row by row, including midnight wraparound and the Twilight Rule, but without
+building the per-call component objects.
+"""
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from mars_moon_core import MARS_MINUTES_PER_DAY, MARS_MINUTES_PER_HOUR, DurationExtractor
+
+
+# ===== Component B (vectorised): window -> up to two intervals =====
+
+def _to_minutes(hours: NDArray[np.int64], minutes: NDArray[np.int64]) -> NDArray[np.int64]:
+    """Vectorised ``TimeWindowNormalizer._to_minutes``."""
+    return (hours * MARS_MINUTES_PER_HOUR + minutes) % MARS_MINUTES_PER_DAY
+
+
+def _split(start: NDArray[np.int64], end: NDArray[np.int64]) -> tuple[NDArray[np.int64], ...]:
+    """Normalize windows into a first and an (optionally empty) second interval.
+
+    Mirrors ``TimeWindowNormalizer.normalize_window``: a full sol becomes
+    ``[0, 2500)``, a wraparound window ``[start, 2500)`` plus ``[0, end)``.
+    Missing second intervals are encoded as the empty interval ``[0, 0)``.
+    """
+    full = start == end
+    wraps = start > end
+    first_start = np.where(full, 0, start)
+    first_end = np.where(full | wraps, MARS_MINUTES_PER_DAY, end)
+    second_end = np.where(wraps, end, 0)
+    return first_start, first_end, np.zeros_like(second_end), second_end
+
+
+# ===== Component C (vectorised): pairwise overlap =====
+
+def _overlap(a_start, a_end, b_start, b_end) -> NDArray[np.int64]:
+    return np.maximum(np.minimum(a_end, b_end) - np.maximum(a_start, b_start), 0)
+
+
+# ===== Public batch API =====
+
+def moon_batch(values: ArrayLike) -> NDArray[np.int64]:
+    """Calculate joint visibility for every row of an (N, 8) integer array.
+
+    Columns follow ``moon``: D_start_h, D_start_m, D_end_h, D_end_m,
+    P_start_h, P_start_m, P_end_h, P_end_m. Returns an int64 array of length N.
+    """
+    rows = np.asarray(values, dtype=np.int64)
+    if rows.ndim != 2 or rows.shape[1] != 8:
+        raise ValueError(f"Expected an (N, 8) array of integers, got shape {rows.shape}")
+
+    d_start = _to_minutes(rows[:, 0], rows[:, 1])
+    d_end = _to_minutes(rows[:, 2], rows[:, 3])
+    p_start = _to_minutes(rows[:, 4], rows[:, 5])
+    p_end = _to_minutes(rows[:, 6], rows[:, 7])
+
+    d1s, d1e, d2s, d2e = _split(d_start, d_end)
+    p1s, p1e, p2s, p2e = _split(p_start, p_end)
+    minutes = (
+            _overlap(d1s, d1e, p1s, p1e)
+            + _overlap(d1s, d1e, p2s, p2e)
+            + _overlap(d2s, d2e, p1s, p1e)
+            + _overlap(d2s, d2e, p2s, p2e)
+    )
+
+    # Twilight Rule (component D). Boundary points in circular time are
+    # {start, end}, plus midnight for wraparound windows. Full-sol windows
+    # always overlap, so they never reach this check.
+    d_points = (d_start, d_end, np.where(d_start > d_end, 0, d_start))
+    p_points = (p_start, p_end, np.where(p_start > p_end, 0, p_start))
+    shared = np.zeros(rows.shape[0], dtype=bool)
+    for d_point in d_points:
+        for p_point in p_points:
+            shared |= d_point == p_point
+
+    twilight = (minutes == 0) & shared
+    return np.where(twilight, DurationExtractor.TWILIGHT_MINUTES, minutes)
+
+
+# ===== Examples =====
+
+if __name__ == "__main__":
+    examples = np.array([
+        [13, 91, 23, 5, 22, 5, 24, 45],
+        [24, 53, 7, 12, 5, 12, 8, 45],
+        [12, 32, 17, 6, 17, 6, 19, 78],
+        [5, 0, 6, 0, 7, 0, 8, 0],
+        [10, 0, 25, 0, 0, 0, 5, 0],
+    ])
+    print("Examples 1-5 ->", moon_batch(examples).tolist())
@@ -0,0 +1,149 @@
+"""Mars Moon Visibility Calculator - bitset engine
+
+Alternative to components C and D: a window is a packed bitset over the
+2500 minutes of a sol (bit t set while the body is visible during minute t),
+so joint visibility is an AND plus a popcount, for any number of bodies.
+A second bitset holds the window's boundary points in circular time for the
+Twilight Rule. Python integers are the bitsets; no third-party packages.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from functools import reduce
+
+from mars_moon_core import MARS_MINUTES_PER_DAY, MARS_MINUTES_PER_HOUR, DurationExtractor, moon_pipeline
+
+DAY_MASK: int = (1 << MARS_MINUTES_PER_DAY) - 1
+
+
+# ===== Data structures =====
+
+@dataclass(frozen=True)
+class WindowBits:
+    """A visibility window as two 2500-bit sets: visible minutes and boundary points."""
+    coverage: int
+    boundaries: int
+
+    def __and__(self, other: "WindowBits") -> "WindowBits":
+        return WindowBits(self.coverage & other.coverage, self.boundaries & other.boundaries)
+
+    def __or__(self, other: "WindowBits") -> "WindowBits":
+        return WindowBits(self.coverage | other.coverage, self.boundaries | other.boundaries)
+
+
+# ===== Encoding =====
+
+def interval_mask(start: int, end: int) -> int:
+    """Bits ``start`` .. ``end - 1`` set: the half-open interval [start, end)."""
+    return ((1 << (end - start)) - 1) << start
+
+
+def _encode(start_h: int, start_m: int, end_h: int, end_m: int) -> tuple[int, int]:
+    """(coverage, boundaries) of one window, following the TimeWindowNormalizer rules.
+
+    A full sol is [0, 2500) with its only boundary at midnight; a wraparound
+    window covers everything but [end, start) and has midnight as a boundary.
+    """
+    start = (start_h * MARS_MINUTES_PER_HOUR + start_m) % MARS_MINUTES_PER_DAY
+    end = (end_h * MARS_MINUTES_PER_HOUR + end_m) % MARS_MINUTES_PER_DAY
+    if start == end:
+        return DAY_MASK, 1
+    if start < end:
+        return interval_mask(start, end), (1 << start) | (1 << end)
+    return DAY_MASK ^ interval_mask(end, start), (1 << start) | (1 << end) | 1
+
+
+def window_bits(start_h: int, start_m: int, end_h: int, end_m: int) -> WindowBits:
+    """Encode one Mars window given in hours/minutes."""
+    return WindowBits(*_encode(start_h, start_m, end_h, end_m))
+
+
+# ===== Joint visibility =====
+
+def joint_visibility(*windows: WindowBits) -> int:
+    """Minutes during which all windows are visible, with the Twilight Rule.
+
+    Without a common visible minute the result is 1 if all windows share a
+    boundary point (REQ3), else 0. For two windows this is exactly what
+    components C and D compute. To intersect bodies with several windows each,
+    OR each body's windows together first.
+    """
+    if not windows:
+        raise ValueError("Expected at least one window")
+    joint = reduce(WindowBits.__and__, windows)
+    if joint.coverage:
+        return joint.coverage.bit_count()
+    if joint.boundaries:
+        return DurationExtractor.TWILIGHT_MINUTES
+    return 0
+
+
+def moon_bitset(
+        D_start_h: int,
+        D_start_m: int,
+        D_end_h: int,
+        D_end_m: int,
+        P_start_h: int,
+        P_start_m: int,
+        P_end_h: int,
+        P_end_m: int,
+) -> int:
+    """Drop-in equivalent of ``moon(...)`` using the bitset engine."""
+    d_coverage, d_boundaries = _encode(D_start_h, D_start_m, D_end_h, D_end_m)
+    p_coverage, p_boundaries = _encode(P_start_h, P_start_m, P_end_h, P_end_m)
+    joint = d_coverage & p_coverage
+    if joint:
+        return joint.bit_count()
+    return DurationExtractor.TWILIGHT_MINUTES if d_boundaries & p_boundaries else 0
+
+
+# ===== Benchmark against the component pipeline =====
+
+def random_queries(count: int, seed: int = 0) -> list[tuple[int, ...]]:
+    """Random valid moon() argument tuples (hours 0-25, minutes 0-99)."""
+    rng = random.Random(seed)
+    return [
+        tuple(rng.randint(0, 25) if i % 2 == 0 else rng.randint(0, 99) for i in range(8))
+        for _ in range(count)
+    ]
+
+
+def benchmark(count: int = 100_000, seed: int = 0) -> dict[str, float]:
+    """Calls per second on the same random inputs.
+
+    Compares moon_pipeline() with moon_bitset() for two bodies, and times a three-body
+    intersection of pre-encoded windows, which the pipeline cannot express.
+    """
+    queries = random_queries(count, seed)
+    results: dict[str, float] = {}
+
+    started = time.perf_counter()
+    expected = [moon_pipeline(*query) for query in queries]
+    results["pipeline_calls_per_sec"] = count / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    actual = [moon_bitset(*query) for query in queries]
+    results["bitset_calls_per_sec"] = count / (time.perf_counter() - started)
+    if actual != expected:
+        raise AssertionError("Bitset engine disagrees with the component pipeline")
+
+    encoded = [(window_bits(*query[:4]), window_bits(*query[4:])) for query in queries]
+    third = window_bits(6, 0, 18, 0)
+    started = time.perf_counter()
+    for d_bits, p_bits in encoded:
+        joint_visibility(d_bits, p_bits, third)
+    results["bitset_three_body_calls_per_sec"] = count / (time.perf_counter() - started)
+    return results
+
+
+# ===== Examples =====
+
+if __name__ == "__main__":
+    print("Example 1: D[13:91, 23:05], P[22:05, 24:45] ->", moon_bitset(13, 91, 23, 5, 22, 5, 24, 45))
+    print("Example 3: D[12:32, 17:06], P[17:06, 19:78] ->", moon_bitset(12, 32, 17, 6, 17, 6, 19, 78))
+    print("Three windows: [5:00, 9:00] ∩ [6:00, 8:00] ∩ [7:50, 12:00] ->",
+          joint_visibility(window_bits(5, 0, 9, 0), window_bits(6, 0, 8, 0), window_bits(7, 50, 12, 0)))
+    print()
+    for name, rate in benchmark().items():
+        print(f"{name:>32}: {rate:,.0f}")
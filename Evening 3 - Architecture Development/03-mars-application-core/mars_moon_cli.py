@@ -0,0 +1,218 @@
+"""Mars Moon Visibility Calculator - bulk command line interface
+
+Reads moon() records (8 integers: D_start_h, D_start_m, D_end_h, D_end_m,
+P_start_h, P_start_m, P_end_h, P_end_m) from files or stdin, evaluates them
+in chunks across a process pool with moon_batch, and writes one result per
+record in input order.
+
+Usage:
+  python3 mars_moon_cli.py [FILE ...] [--input-format text|binary] [--output-format text|binary]
+                           [--output PATH] [--chunk-size N] [--workers N]
+
+Formats:
+  text    one record per line, integers separated by whitespace or commas;
+          results are written one per line
+  binary  little-endian int16, 8 values per input record and 1 per result
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import BinaryIO, NamedTuple
+
+import numpy as np
+
+from mars_moon_batch import moon_batch
+
+FORMATS = ("text", "binary")
+CHUNK_SIZE = 100_000
+N_WORKERS = os.cpu_count() or 1
+BINARY_DTYPE = np.dtype("<i2")
+VALUES_PER_RECORD = 8
+
+
+class Chunk(NamedTuple):
+    """Raw records read from one input, with where they start in it for error messages."""
+    data: bytes
+    source: str = ""
+    first_line: int = 1
+
+
+# ===== Chunk evaluation (runs in the worker processes) =====
+
+def parse_text(data: bytes, first_line: int = 1) -> np.ndarray:
+    """Parse whitespace or comma separated records, one per non-blank line.
+
+    Errors name the offending line, numbering the first line of ``data`` as
+    ``first_line``.
+    """
+    lines = data.replace(b",", b" ").decode("ascii").splitlines()
+    if not any(line.strip() for line in lines):
+        return np.empty((0, VALUES_PER_RECORD), dtype=np.int64)
+    try:
+        values = np.loadtxt(lines, dtype=np.int64, ndmin=2)
+    except ValueError:
+        values = None
+    if values is None or values.shape[1] != VALUES_PER_RECORD:
+        raise ValueError(_describe_bad_line(lines, first_line))
+    return values
+
+
+def _describe_bad_line(lines: list[str], first_line: int = 1) -> str:
+    """The first line that is not a record of 8 int64 values, as an error message."""
+    for number, line in enumerate(lines, start=first_line):
+        tokens = line.split()
+        if tokens and len(tokens) != VALUES_PER_RECORD:
+            return f"Line {number}: expected {VALUES_PER_RECORD} integers, got {len(tokens)}"
+        for token in tokens:
+            try:
+                np.int64(int(token))
+            except (ValueError, OverflowError):
+                return f"Line {number}: {token!r} is not a 64-bit integer"
+    return "Malformed text input"
+
+
+def parse_binary(data: bytes) -> np.ndarray:
+    if len(data) % (VALUES_PER_RECORD * BINARY_DTYPE.itemsize):
+        raise ValueError(f"Binary input must be a whole number of {VALUES_PER_RECORD}-value int16 records")
+    return np.frombuffer(data, dtype=BINARY_DTYPE).reshape(-1, VALUES_PER_RECORD)
+
+
+def evaluate_chunk(chunk: Chunk, input_format: str, output_format: str) -> tuple[bytes, int]:
+    """Parse, evaluate and serialize one chunk; returns (output bytes, record count).
+
+    Parse errors are prefixed with the chunk's source and count lines from
+    the start of that input, not from the start of the chunk.
+    """
+    try:
+        if input_format == "binary":
+            rows = parse_binary(chunk.data)
+        else:
+            rows = parse_text(chunk.data, chunk.first_line)
+    except ValueError as error:
+        if chunk.source:
+            raise ValueError(f"{chunk.source}: {error}") from None
+        raise
+    results = moon_batch(rows)
+    if output_format == "binary":
+        return results.astype(BINARY_DTYPE).tobytes(), len(results)
+    if not len(results):
+        return b"", 0
+    return ("\n".join(map(str, results.tolist())) + "\n").encode("ascii"), len(results)
+
+
+# ===== Input chunking =====
+
+def read_chunks(streams: Iterable[BinaryIO], input_format: str, chunk_size: int) -> Iterator[Chunk]:
+    """Raw chunks of at most ``chunk_size`` records from each stream in turn.
+
+    Each chunk carries the stream's name and its first line number in that
+    stream (the first record number for binary input).
+    """
+    record_bytes = VALUES_PER_RECORD * BINARY_DTYPE.itemsize
+    for stream in streams:
+        source = str(getattr(stream, "name", ""))
+        first_line = 1
+        if input_format == "binary":
+            while data := stream.read(chunk_size * record_bytes):
+                yield Chunk(data, source, first_line)
+                first_line += chunk_size
+            continue
+        lines: list[bytes] = []
+        for line in stream:
+            lines.append(line)
+            if len(lines) == chunk_size:
+                yield Chunk(b"".join(lines), source, first_line)
+                first_line += len(lines)
+                lines = []
+        if lines:
+            yield Chunk(b"".join(lines), source, first_line)
+
+
+def process(
+        chunks: Iterable[Chunk],
+        output: BinaryIO,
+        input_format: str = "text",
+        output_format: str = "text",
+        executor: Executor | None = None,
+        max_in_flight: int = 2 * N_WORKERS,
+) -> int:
+    """Evaluate chunks, in parallel when an executor is given, writing results in input order.
+
+    At most ``max_in_flight`` chunks are pending at once, so memory stays
+    bounded however large the input is. Returns the number of records.
+    """
+    records = 0
+    if executor is None:
+        for chunk in chunks:
+            result, count = evaluate_chunk(chunk, input_format, output_format)
+            output.write(result)
+            records += count
+        return records
+
+    pending: deque[Future] = deque()
+    for chunk in chunks:
+        if len(pending) >= max_in_flight:
+            result, count = pending.popleft().result()
+            output.write(result)
+            records += count
+        pending.append(executor.submit(evaluate_chunk, chunk, input_format, output_format))
+    while pending:
+        result, count = pending.popleft().result()
+        output.write(result)
+        records += count
+    return records
+
+
+# ===== Command line =====
+
+def _open_inputs(paths: list[str]) -> Iterator[BinaryIO]:
+    for path in paths or ["-"]:
+        if path == "-":
+            yield sys.stdin.buffer
+        else:
+            with open(path, "rb") as stream:
+                yield stream
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate moon() for many records from files or stdin")
+    parser.add_argument("files", nargs="*", help="Input files ('-' or none: stdin)")
+    parser.add_argument("--input-format", choices=FORMATS, default="text")
+    parser.add_argument("--output-format", choices=FORMATS, default="text")
+    parser.add_argument("--output", "-o", default="-", help="Output file ('-': stdout)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Records per chunk")
+    parser.add_argument("--workers", type=int, default=N_WORKERS,
+                        help="Worker processes (0: evaluate in this process)")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    started = time.perf_counter()
+    try:
+        chunks = read_chunks(_open_inputs(args.files), args.input_format, args.chunk_size)
+        if args.workers > 0:
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                records = process(chunks, output, args.input_format, args.output_format,
+                                  executor, max_in_flight=2 * args.workers)
+        else:
+            records = process(chunks, output, args.input_format, args.output_format)
+    except ValueError as error:
+        print(f"mars_moon_cli: {error}", file=sys.stderr)
+        return 1
+    finally:
+        output.flush()
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Processed {records:,} records in {elapsed:.2f}s ({records / elapsed if elapsed else 0:,.0f} records/sec)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 """Mars Moon Visibility Calculator - Application Core"""
 
+import os
 from collections.abc import Iterable
 from dataclasses import dataclass
 
@@ -75,8 +76,8 @@ class TimeWindowNormalizer:
     def normalize(self, windows: ParsedWindows) -> NormalizedWindows:
         """Normalize both Deimos and Phobos windows."""
         return NormalizedWindows(
-            deimos_intervals=self._normalize_single(windows.deimos),
-            phobos_intervals=self._normalize_single(windows.phobos),
+            deimos_intervals=self.normalize_window(windows.deimos),
+            phobos_intervals=self.normalize_window(windows.phobos),
         )
 
     @staticmethod
@@ -84,7 +85,7 @@ class TimeWindowNormalizer:
         """Convert Mars timestamp (hour 0-25, minute 0-99) to minutes since midnight."""
         return (hour * MARS_MINUTES_PER_HOUR + minute) % MARS_MINUTES_PER_DAY
 
-    def _normalize_single(self, window: TimeWindow) -> list[Interval]:
+    def normalize_window(self, window: TimeWindow) -> list[Interval]:
         """Normalize a single time window, handling wraparound cases."""
         start = self._to_minutes(window.start_h, window.start_m)
         end = self._to_minutes(window.end_h, window.end_m)
@@ -166,7 +167,27 @@ _overlap_calculator = OverlapCalculator()
 _duration_extractor = DurationExtractor()
 
 
-def moon(
+def use_components(
+        parser: TimeWindowParser | None = None,
+        normalizer: TimeWindowNormalizer | None = None,
+        overlap_calculator: OverlapCalculator | None = None,
+        duration_extractor: DurationExtractor | None = None,
+) -> tuple[TimeWindowParser, TimeWindowNormalizer, OverlapCalculator, DurationExtractor]:
+    """Replace the component instances used by moon_pipeline; returns the previous ones.
+
+    Components left as None are kept. Used to plug in instrumented
+    components without adding any cost to the default pipeline.
+    """
+    global _parser, _normalizer, _overlap_calculator, _duration_extractor
+    previous = (_parser, _normalizer, _overlap_calculator, _duration_extractor)
+    _parser = parser or _parser
+    _normalizer = normalizer or _normalizer
+    _overlap_calculator = overlap_calculator or _overlap_calculator
+    _duration_extractor = duration_extractor or _duration_extractor
+    return previous
+
+
+def moon_pipeline(
         D_start_h: int,
         D_start_m: int,
         D_end_h: int,
@@ -179,6 +200,7 @@ def moon(
     """Calculate joint visibility of Deimos and Phobos in Mars-minutes.
 
     Returns total overlap in minutes, or 1 if windows share a boundary.
+    Reference implementation running components A -> B -> C -> D.
     """
     parsed = _parser.parse([
         D_start_h, D_start_m, D_end_h, D_end_m,
@@ -189,6 +211,69 @@ def moon(
     return _duration_extractor.extract(overlap, normalized)
 
 
+def moon_fast(
+        D_start_h: int,
+        D_start_m: int,
+        D_end_h: int,
+        D_end_m: int,
+        P_start_h: int,
+        P_start_m: int,
+        P_end_h: int,
+        P_end_m: int,
+) -> int:
+    """Same result as moon_pipeline using plain integer arithmetic, without intermediate objects.
+
+    Each window is unrolled into [start, end) plus the wraparound part [0, end2).
+    """
+    d_start = (D_start_h * MARS_MINUTES_PER_HOUR + D_start_m) % MARS_MINUTES_PER_DAY
+    d_end = (D_end_h * MARS_MINUTES_PER_HOUR + D_end_m) % MARS_MINUTES_PER_DAY
+    p_start = (P_start_h * MARS_MINUTES_PER_HOUR + P_start_m) % MARS_MINUTES_PER_DAY
+    p_end = (P_end_h * MARS_MINUTES_PER_HOUR + P_end_m) % MARS_MINUTES_PER_DAY
+
+    # Full sol: the overlap is the other window's length, which is never 0.
+    if d_start == d_end:
+        if p_start == p_end:
+            return MARS_MINUTES_PER_DAY
+        return p_end - p_start if p_start < p_end else MARS_MINUTES_PER_DAY - p_start + p_end
+    if p_start == p_end:
+        return d_end - d_start if d_start < d_end else MARS_MINUTES_PER_DAY - d_start + d_end
+
+    d_wraps = d_start > d_end
+    p_wraps = p_start > p_end
+    d_end1, d_end2 = (MARS_MINUTES_PER_DAY, d_end) if d_wraps else (d_end, 0)
+    p_end1, p_end2 = (MARS_MINUTES_PER_DAY, p_end) if p_wraps else (p_end, 0)
+
+    minutes = 0
+    low = d_start if d_start > p_start else p_start
+    high = d_end1 if d_end1 < p_end1 else p_end1
+    if high > low:
+        minutes += high - low
+    if p_end2 > d_start:
+        minutes += (d_end1 if d_end1 < p_end2 else p_end2) - d_start
+    if d_end2 > p_start:
+        minutes += (d_end2 if d_end2 < p_end1 else p_end1) - p_start
+    minutes += d_end2 if d_end2 < p_end2 else p_end2
+    if minutes:
+        return minutes
+
+    # Twilight Rule: boundary points are {start, end}, plus midnight for wraparound windows.
+    if d_start == p_start or d_start == p_end or d_end == p_start or d_end == p_end:
+        return DurationExtractor.TWILIGHT_MINUTES
+    if d_wraps and (p_wraps or p_start == 0 or p_end == 0):
+        return DurationExtractor.TWILIGHT_MINUTES
+    if p_wraps and (d_start == 0 or d_end == 0):
+        return DurationExtractor.TWILIGHT_MINUTES
+    return 0
+
+
+# moon() is bound once at import: set MARS_MOON_ENGINE=pipeline to run the components A-D instead.
+MOON_ENGINES = {"fast": moon_fast, "pipeline": moon_pipeline}
+MOON_ENGINE: str = os.environ.get("MARS_MOON_ENGINE", "fast")
+if MOON_ENGINE not in MOON_ENGINES:
+    raise ValueError(f"MARS_MOON_ENGINE must be one of {sorted(MOON_ENGINES)}, got {MOON_ENGINE!r}")
+moon = MOON_ENGINES[MOON_ENGINE]
+
+
 # ===== Examples =====
 
 if __name__ == "__main__":
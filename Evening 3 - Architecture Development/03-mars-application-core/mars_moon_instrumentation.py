@@ -0,0 +1,216 @@
+"""Mars Moon Visibility Calculator - per-component instrumentation
+
+Counts calls, branch outcomes and cumulative time of components A-D while
+enabled. Enabling swaps instrumented subclasses into the pipeline through
+``use_components``; disabling restores the plain components, so nothing is
+measured, and nothing costs anything, while instrumentation is off.
+
+Only the component pipeline has components to instrument, so while enabled
+``mars_moon_core.moon`` is also rebound to ``moon_pipeline`` (and restored on
+disable). Modules that imported ``moon`` by name keep their own binding; call
+``mars_moon_core.moon`` or ``moon_pipeline`` to be measured.
+
+Branch outcomes:
+  TimeWindowNormalizer  per window: simple, full_sol, wraparound_split, wraparound_to_midnight
+  OverlapCalculator     overlap, no_overlap
+  DurationExtractor     overlap, twilight_hit, no_visibility
+"""
+
+import json
+import random
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+
+import mars_moon_core
+from mars_moon_core import (
+    MARS_MINUTES_PER_DAY,
+    DurationExtractor,
+    Interval,
+    NormalizedWindows,
+    OverlapCalculator,
+    OverlapResult,
+    ParsedWindows,
+    TimeWindow,
+    TimeWindowNormalizer,
+    TimeWindowParser,
+    moon_pipeline,
+    use_components,
+)
+
+
+# ===== Statistics =====
+
+@dataclass
+class ComponentStats:
+    """Calls, branch outcomes and cumulative wall time of one component."""
+    calls: int = 0
+    seconds: float = 0.0
+    branches: Counter = field(default_factory=Counter)
+
+    def as_dict(self) -> dict[str, object]:
+        return {"calls": self.calls, "seconds": self.seconds, "branches": dict(sorted(self.branches.items()))}
+
+
+class Instrumentation:
+    """Statistics for all four components."""
+    __slots__ = ("parser", "normalizer", "overlap_calculator", "duration_extractor")
+
+    def __init__(self):
+        self.parser = ComponentStats()
+        self.normalizer = ComponentStats()
+        self.overlap_calculator = ComponentStats()
+        self.duration_extractor = ComponentStats()
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """Plain-dict copy of the current statistics, keyed by component name."""
+        return {
+            "TimeWindowParser": self.parser.as_dict(),
+            "TimeWindowNormalizer": self.normalizer.as_dict(),
+            "OverlapCalculator": self.overlap_calculator.as_dict(),
+            "DurationExtractor": self.duration_extractor.as_dict(),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+
+# ===== Instrumented components =====
+
+class InstrumentedParser(TimeWindowParser):
+    __slots__ = ("stats",)
+
+    def __init__(self, stats: ComponentStats):
+        self.stats = stats
+
+    def parse(self, values: Iterable[int]) -> ParsedWindows:
+        started = perf_counter()
+        result = super().parse(values)
+        self.stats.seconds += perf_counter() - started
+        self.stats.calls += 1
+        return result
+
+
+class InstrumentedNormalizer(TimeWindowNormalizer):
+    __slots__ = ("stats",)
+
+    def __init__(self, stats: ComponentStats):
+        self.stats = stats
+
+    def normalize(self, windows: ParsedWindows) -> NormalizedWindows:
+        started = perf_counter()
+        result = super().normalize(windows)
+        self.stats.seconds += perf_counter() - started
+        self.stats.calls += 1
+        return result
+
+    def normalize_window(self, window: TimeWindow) -> list[Interval]:
+        intervals = super().normalize_window(window)
+        self.stats.branches[self._branch(intervals)] += 1
+        return intervals
+
+    @staticmethod
+    def _branch(intervals: list[Interval]) -> str:
+        if len(intervals) == 2:
+            return "wraparound_split"
+        start, end = intervals[0]
+        if end < MARS_MINUTES_PER_DAY:
+            return "simple"
+        return "full_sol" if start == 0 else "wraparound_to_midnight"
+
+
+class InstrumentedOverlapCalculator(OverlapCalculator):
+    __slots__ = ("stats",)
+
+    def __init__(self, stats: ComponentStats):
+        self.stats = stats
+
+    def calculate(self, windows: NormalizedWindows) -> OverlapResult:
+        started = perf_counter()
+        result = super().calculate(windows)
+        self.stats.seconds += perf_counter() - started
+        self.stats.calls += 1
+        self.stats.branches["overlap" if result.minutes > 0 else "no_overlap"] += 1
+        return result
+
+
+class InstrumentedDurationExtractor(DurationExtractor):
+    __slots__ = ("stats",)
+
+    def __init__(self, stats: ComponentStats):
+        self.stats = stats
+
+    def extract(self, overlap: OverlapResult, windows: NormalizedWindows) -> int:
+        started = perf_counter()
+        result = super().extract(overlap, windows)
+        self.stats.seconds += perf_counter() - started
+        self.stats.calls += 1
+        if overlap.minutes > 0:
+            self.stats.branches["overlap"] += 1
+        elif result:
+            self.stats.branches["twilight_hit"] += 1
+        else:
+            self.stats.branches["no_visibility"] += 1
+        return result
+
+
+# ===== Enabling and disabling =====
+
+_previous_components: tuple | None = None
+_previous_moon = None
+
+
+def enable(instrumentation: Instrumentation | None = None) -> Instrumentation:
+    """Install instrumented components in the pipeline, route ``moon`` through it and return the statistics."""
+    global _previous_components, _previous_moon
+    if _previous_components is not None:
+        raise RuntimeError("Instrumentation is already enabled")
+    instrumentation = instrumentation or Instrumentation()
+    _previous_components = use_components(
+        InstrumentedParser(instrumentation.parser),
+        InstrumentedNormalizer(instrumentation.normalizer),
+        InstrumentedOverlapCalculator(instrumentation.overlap_calculator),
+        InstrumentedDurationExtractor(instrumentation.duration_extractor),
+    )
+    _previous_moon, mars_moon_core.moon = mars_moon_core.moon, moon_pipeline
+    return instrumentation
+
+
+def disable() -> None:
+    """Restore the components and the ``moon`` engine that were installed before ``enable``."""
+    global _previous_components, _previous_moon
+    if _previous_components is None:
+        return
+    use_components(*_previous_components)
+    mars_moon_core.moon = _previous_moon
+    _previous_components = _previous_moon = None
+
+
+def is_enabled() -> bool:
+    return _previous_components is not None
+
+
+@contextmanager
+def instrumented(instrumentation: Instrumentation | None = None) -> Iterator[Instrumentation]:
+    """Enable instrumentation for the duration of a ``with`` block."""
+    stats = enable(instrumentation)
+    try:
+        yield stats
+    finally:
+        disable()
+
+
+# ===== Example workload =====
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    queries = [
+        [rng.randint(0, 25) if i % 2 == 0 else rng.randint(0, 99) for i in range(8)]
+        for _ in range(100_000)
+    ]
+    with instrumented() as stats:
+        for query in queries:
+            moon_pipeline(*query)
+    print(stats.to_json())
@@ -0,0 +1,364 @@
+"""Mars Moon Visibility Calculator - asyncio query service
+
+A localhost TCP service for many clients that each send a few ``moon(...)``
+queries. Queries arriving within ``max_delay`` seconds of each other
+(at most ``max_batch_size`` of them) are evaluated together by one
+``moon_batch`` call, and each result is sent back to its own connection.
+
+Protocol (newline-delimited text, like the text format of mars_moon_cli.py):
+  request   8 integers separated by whitespace or commas
+            (hours 0-25, minutes 0-99)
+  response  the result, one line per request in request order,
+            or ``ERR <message>`` for a malformed request; a line longer
+            than 64 KiB is answered with ``ERR line too long`` and the
+            connection is closed
+  STATS     returns one line of JSON: batch and latency histograms
+
+Usage:
+  python3 mars_moon_service.py [--host 127.0.0.1] [--port 8765]
+                               [--max-batch-size N] [--max-delay-ms MS]
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import time
+from collections.abc import Callable, Sequence
+
+import numpy as np
+
+from mars_moon_batch import moon_batch
+from mars_moon_core import MARS_MINUTES_PER_HOUR
+
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_BATCH_SIZE = 1024
+MAX_DELAY = 0.002
+MAX_LINE_BYTES = 64 * 1024
+# Unanswered requests one connection may have queued before the server stops reading from it.
+MAX_PENDING_RESPONSES = 4096
+VALUES_PER_RECORD = 8
+MAX_HOUR = 25
+MAX_MINUTE = MARS_MINUTES_PER_HOUR - 1
+# Upper bucket bounds: latencies in milliseconds, batch sizes in requests.
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+# ===== Histograms =====
+
+class Histogram:
+    """Counts of observations per bucket, plus count, sum and max."""
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket: above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (``max`` for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> dict[str, object]:
+        labels = [f"le_{bound:g}" for bound in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+# ===== Micro-batching =====
+
+class MicroBatcher:
+    """Coalesces concurrent queries into single vectorised evaluations.
+
+    A batch is evaluated when it reaches ``max_batch_size`` queries or
+    ``max_delay`` seconds after its first query, whichever comes first.
+    Evaluation runs on the event loop: a moon_batch call over a thousand
+    rows takes tens of microseconds, less than handing it to a thread.
+    """
+
+    def __init__(
+            self,
+            max_batch_size: int = MAX_BATCH_SIZE,
+            max_delay: float = MAX_DELAY,
+            evaluate: Callable[[np.ndarray], np.ndarray] = moon_batch,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._evaluate = evaluate
+        self._rows: list[Sequence[int]] = []
+        self._pending: list[tuple[asyncio.Future, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.evaluation_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+
+    def submit(self, row: Sequence[int]) -> asyncio.Future:
+        """Queue one query of 8 integers; the future resolves to its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._rows.append(row)
+        self._pending.append((future, time.perf_counter()))
+        if len(self._rows) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+        return future
+
+    async def evaluate(self, row: Sequence[int]) -> int:
+        return await self.submit(row)
+
+    def flush(self) -> None:
+        """Evaluate everything queued so far."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._rows:
+            return
+        rows, pending = self._rows, self._pending
+        self._rows, self._pending = [], []
+
+        started = time.perf_counter()
+        try:
+            results = self._evaluate(np.array(rows, dtype=np.int64)).tolist()
+        except Exception:
+            # One bad row must not fail the whole batch: retry row by row so only it gets the error.
+            results = [self._evaluate_one(row) for row in rows]
+        finished = time.perf_counter()
+
+        self.evaluation_ms.observe((finished - started) * 1000)
+        self.batch_size.observe(len(rows))
+        for (future, submitted), result in zip(pending, results):
+            self.latency_ms.observe((finished - submitted) * 1000)
+            if future.done():  # the client may have gone away
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _evaluate_one(self, row: Sequence[int]) -> int | Exception:
+        try:
+            return self._evaluate(np.array([row], dtype=np.int64)).tolist()[0]
+        except Exception as error:
+            return error
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_delay_ms": self.max_delay * 1000,
+            "latency_ms": self.latency_ms.snapshot(),
+            "evaluation_ms": self.evaluation_ms.snapshot(),
+            "batch_size": self.batch_size.snapshot(),
+        }
+
+
+# ===== TCP service =====
+
+def parse_request(line: bytes) -> list[int]:
+    """Parse one request line; rejects wrong field counts and out-of-range hours or minutes."""
+    values = [int(value) for value in line.replace(b",", b" ").split()]
+    if len(values) != VALUES_PER_RECORD:
+        raise ValueError(f"Expected {VALUES_PER_RECORD} integers, got {len(values)}")
+    for position, value in enumerate(values):
+        limit = MAX_HOUR if position % 2 == 0 else MAX_MINUTE
+        if not 0 <= value <= limit:
+            field = "hour" if position % 2 == 0 else "minute"
+            raise ValueError(f"Value {position + 1} ({field}) must be between 0 and {limit}, got {value}")
+    return values
+
+
+class MoonService:
+    """Line-protocol TCP server in front of a MicroBatcher."""
+
+    def __init__(self, batcher: MicroBatcher | None = None, max_pending: int = MAX_PENDING_RESPONSES):
+        self.batcher = batcher or MicroBatcher()
+        self.max_pending = max_pending
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+
+    async def start(self, host: str = HOST, port: int = PORT) -> tuple[str, int]:
+        """Start listening; port 0 picks a free port. Returns the bound (host, port)."""
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE_BYTES)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening, answer queued queries and drop open connections."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        self.batcher.flush()
+        for connection in self._connections:
+            connection.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            await self._serve_connection(reader, writer)
+        except asyncio.CancelledError:
+            pass  # closed by close()
+        finally:
+            writer.close()
+            self._connections.discard(task)
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Requests are answered in order; a writer task awaits them so a client may pipeline many lines.
+        # The queue is bounded, so a client that does not read its answers stops being read from.
+        responses: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        sender = asyncio.create_task(self._send(responses, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than MAX_LINE_BYTES; the rest of the stream cannot be framed
+                    await self._queue(responses, sender, f"ERR line too long (limit {MAX_LINE_BYTES} bytes)")
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                if line.upper() == b"STATS":
+                    response = json.dumps(self.batcher.stats())
+                else:
+                    try:
+                        response = self.batcher.submit(parse_request(line))
+                    except ValueError as error:
+                        response = f"ERR {error}"
+                if not await self._queue(responses, sender, response):
+                    break  # the client is gone; nobody would read further answers
+            await self._queue(responses, sender, None)
+            await sender
+        finally:
+            sender.cancel()
+
+    @staticmethod
+    async def _queue(responses: asyncio.Queue, sender: asyncio.Task, response: object) -> bool:
+        """Queue a response for the sender, waiting while the queue is full; False once the sender has stopped."""
+        if sender.done():
+            return False
+        try:
+            responses.put_nowait(response)
+            return True
+        except asyncio.QueueFull:
+            pass
+        put = asyncio.ensure_future(responses.put(response))
+        await asyncio.wait((put, sender), return_when=asyncio.FIRST_COMPLETED)
+        if put.done():
+            return True
+        put.cancel()
+        return False
+
+    @staticmethod
+    async def _send(responses: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        while (response := await responses.get()) is not None:
+            if isinstance(response, asyncio.Future):
+                try:
+                    response = await response
+                except Exception as error:
+                    response = f"ERR {error}"
+            writer.write(f"{response}\n".encode("ascii"))
+            try:
+                # Returns at once unless the client has stopped reading and the write buffer is full.
+                await writer.drain()
+            except ConnectionError:
+                return
+
+
+# ===== Client =====
+
+async def query(host: str, port: int, rows: Sequence[Sequence[int]]) -> list[int]:
+    """Send queries over one connection, pipelined, and return their results."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(b"".join(b" ".join(str(value).encode("ascii") for value in row) + b"\n" for row in rows))
+        await writer.drain()
+        results = []
+        for _ in rows:
+            line = (await reader.readline()).decode("ascii").strip()
+            if line.startswith("ERR"):
+                raise ValueError(line[4:])
+            results.append(int(line))
+        return results
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def fetch_stats(host: str, port: int) -> dict[str, object]:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(b"STATS\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+# ===== Command line =====
+
+async def _serve(args: argparse.Namespace) -> None:
+    service = MoonService(MicroBatcher(args.max_batch_size, args.max_delay_ms / 1000))
+    host, port = await service.start(args.host, args.port)
+    print(f"mars_moon_service listening on {host}:{port} "
+          f"(max batch {args.max_batch_size}, max delay {args.max_delay_ms} ms)")
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve moon() queries over TCP with micro-batching")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE,
+                        help="Evaluate as soon as this many queries are waiting")
+    parser.add_argument("--max-delay-ms", type=float, default=MAX_DELAY * 1000,
+                        help="Longest time a query waits for others to join its batch")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""Mars Moon Visibility Calculator - multi-sol timeline
+
+Streams joint visibility over many sols. Each sol is a mapping of body names
+to that sol's windows, taken from any iterable (a file reader, a schedule
+generator) or produced by a drift rule. Every sol is evaluated with the
+single-sol rules of the core (wraparound within the reference sol, Twilight
+Rule), and the generators hold only the current sol, so multi-year schedules
+run in constant memory.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from itertools import count, islice
+
+from mars_interval_algebra import joint_visibility
+from mars_moon_core import MARS_MINUTES_PER_DAY, MARS_MINUTES_PER_HOUR, TimeWindow
+
+Sol = Mapping[str, Iterable[TimeWindow]]
+
+
+@dataclass(frozen=True)
+class SolVisibility:
+    """Joint visibility of one sol and of all sols streamed so far, in Mars-minutes."""
+    sol: int
+    minutes: int
+    cumulative_minutes: int
+
+
+# ===== Drift rule =====
+
+def shift_window(window: TimeWindow, minutes: int) -> TimeWindow:
+    """Move a window by ``minutes`` (negative: earlier), wrapping around midnight."""
+    start = (window.start_h * MARS_MINUTES_PER_HOUR + window.start_m + minutes) % MARS_MINUTES_PER_DAY
+    end = (window.end_h * MARS_MINUTES_PER_HOUR + window.end_m + minutes) % MARS_MINUTES_PER_DAY
+    return TimeWindow(*divmod(start, MARS_MINUTES_PER_HOUR), *divmod(end, MARS_MINUTES_PER_HOUR))
+
+
+def drifting_sols(
+        windows: Mapping[str, TimeWindow],
+        drift: Mapping[str, int],
+        sols: int | None = None,
+) -> Iterator[dict[str, list[TimeWindow]]]:
+    """Per-sol windows where each body's window moves by ``drift[body]`` minutes per sol.
+
+    Bodies missing from ``drift`` keep their window. Without ``sols`` the
+    stream is infinite.
+    """
+    unknown = set(drift) - set(windows)
+    if unknown:
+        raise ValueError(f"Drift given for unknown bodies: {sorted(unknown)}")
+    for sol in count() if sols is None else range(sols):
+        yield {body: [shift_window(window, drift.get(body, 0) * sol)] for body, window in windows.items()}
+
+
+# ===== Timeline =====
+
+def timeline(sols: Iterable[Sol], first_sol: int = 0) -> Iterator[SolVisibility]:
+    """Lazily yield per-sol and cumulative joint visibility for a stream of sols."""
+    cumulative = 0
+    for sol, bodies in enumerate(sols, start=first_sol):
+        minutes = joint_visibility(bodies)
+        cumulative += minutes
+        yield SolVisibility(sol=sol, minutes=minutes, cumulative_minutes=cumulative)
+
+
+# ===== Examples =====
+
+if __name__ == "__main__":
+    # Phobos rises 37 Mars-minutes earlier every sol; Deimos keeps its window.
+    stream = drifting_sols(
+        {"Deimos": TimeWindow(13, 91, 23, 5), "Phobos": TimeWindow(22, 5, 24, 45)},
+        drift={"Phobos": -37},
+    )
+    for entry in islice(timeline(stream), 5):
+        print(f"Sol {entry.sol}: {entry.minutes:>4} minutes (cumulative {entry.cumulative_minutes})")
+
+    three_years = drifting_sols(
+        {"Deimos": TimeWindow(13, 91, 23, 5), "Phobos": TimeWindow(22, 5, 24, 45)},
+        drift={"Phobos": -37},
+        sols=3 * 669,
+    )
+    last = None
+    for last in timeline(three_years):
+        pass
+    print(f"After {last.sol + 1} sols: {last.cumulative_minutes} minutes of joint visibility")
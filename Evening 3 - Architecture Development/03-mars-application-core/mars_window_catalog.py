@@ -0,0 +1,176 @@
+"""Mars Moon Visibility Calculator - window catalog
+
+A mutable catalog of many visibility windows that answers "which windows
+cover minute t" and "which windows overlap this window". Windows are stored
+as their normalized half-open intervals (TimeWindowNormalizer rules, so a
+wraparound window is two intervals) in an interval tree: a treap ordered by
+interval start where every node also knows the largest end in its subtree.
+Insert and delete take expected O(log n); queries take O(log n + k) for k hits.
+"""
+
+import random
+from collections.abc import Hashable, Iterator, Mapping
+
+from mars_moon_core import MARS_MINUTES_PER_DAY, Interval, TimeWindow, TimeWindowNormalizer
+
+_normalizer = TimeWindowNormalizer()
+
+SortKey = tuple[int, int, int]
+
+
+# ===== Interval tree (augmented treap) =====
+
+class _Node:
+    __slots__ = ("start", "end", "order", "key", "priority", "max_end", "left", "right")
+
+    def __init__(self, start: int, end: int, order: int, key: Hashable, priority: float):
+        self.start = start
+        self.end = end
+        self.order = order
+        self.key = key
+        self.priority = priority
+        self.max_end = end
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+
+    @property
+    def sort_key(self) -> SortKey:
+        return self.start, self.end, self.order
+
+    def update(self) -> None:
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+def _split(node: _Node | None, sort_key: SortKey) -> tuple[_Node | None, _Node | None]:
+    """Split into nodes ordered before ``sort_key`` and the rest."""
+    if node is None:
+        return None, None
+    if node.sort_key < sort_key:
+        node.right, rest = _split(node.right, sort_key)
+        node.update()
+        return node, rest
+    before, node.left = _split(node.left, sort_key)
+    node.update()
+    return before, node
+
+
+def _merge(left: _Node | None, right: _Node | None) -> _Node | None:
+    """Join two treaps where every node of ``left`` is ordered before ``right``."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+def _collect_overlapping(node: _Node | None, start: int, end: int, found: set[Hashable]) -> None:
+    """Add keys of all intervals intersecting [start, end)."""
+    while node is not None:
+        if node.max_end <= start:
+            return
+        _collect_overlapping(node.left, start, end, found)
+        if node.start >= end:
+            # Everything to the right starts even later.
+            return
+        if node.end > start:
+            found.add(node.key)
+        node = node.right
+
+
+# ===== Public catalog =====
+
+class WindowCatalog:
+    """Visibility windows by key, indexed for coverage and overlap queries.
+
+    Overlap is geometric: windows that only share a boundary point (the
+    Twilight Rule case) do not overlap.
+    """
+    __slots__ = ("_root", "_windows", "_nodes", "_order", "_random")
+
+    def __init__(self, windows: Mapping[Hashable, TimeWindow] | None = None, seed: int | None = None):
+        self._root: _Node | None = None
+        self._windows: dict[Hashable, TimeWindow] = {}
+        self._nodes: dict[Hashable, list[SortKey]] = {}
+        self._order = 0
+        self._random = random.Random(seed)
+        for key, window in (windows or {}).items():
+            self.add(key, window)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._windows
+
+    def __getitem__(self, key: Hashable) -> TimeWindow:
+        return self._windows[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._windows)
+
+    def add(self, key: Hashable, window: TimeWindow) -> None:
+        """Insert a window; keys must be unique."""
+        if key in self._windows:
+            raise KeyError(f"Window {key!r} is already in the catalog")
+        sort_keys = []
+        for start, end in _normalizer.normalize_window(window):
+            node = _Node(start, end, self._order, key, self._random.random())
+            self._order += 1
+            before, after = _split(self._root, node.sort_key)
+            self._root = _merge(_merge(before, node), after)
+            sort_keys.append(node.sort_key)
+        self._windows[key] = window
+        self._nodes[key] = sort_keys
+
+    def remove(self, key: Hashable) -> TimeWindow:
+        """Delete a window and return it."""
+        window = self._windows.pop(key)
+        for start, end, order in self._nodes.pop(key):
+            before, rest = _split(self._root, (start, end, order))
+            _, after = _split(rest, (start, end, order + 1))
+            self._root = _merge(before, after)
+        return window
+
+    def covering(self, minute: int) -> set[Hashable]:
+        """Keys of windows visible during ``minute`` (taken modulo one sol)."""
+        minute %= MARS_MINUTES_PER_DAY
+        found: set[Hashable] = set()
+        _collect_overlapping(self._root, minute, minute + 1, found)
+        return found
+
+    def overlapping_intervals(self, intervals: list[Interval]) -> set[Hashable]:
+        """Keys of windows sharing at least one minute with any of ``intervals``."""
+        found: set[Hashable] = set()
+        for start, end in intervals:
+            _collect_overlapping(self._root, start, end, found)
+        return found
+
+    def overlapping(self, window: TimeWindow) -> set[Hashable]:
+        """Keys of windows sharing at least one minute with ``window``."""
+        return self.overlapping_intervals(_normalizer.normalize_window(window))
+
+
+# ===== Examples =====
+
+if __name__ == "__main__":
+    catalog = WindowCatalog({
+        "deimos-1": TimeWindow(24, 53, 7, 12),
+        "phobos-1": TimeWindow(5, 12, 8, 45),
+        "phobos-2": TimeWindow(17, 6, 19, 78),
+    })
+    print("Covering 6:00  ->", sorted(catalog.covering(600)))
+    print("Covering 0:10  ->", sorted(catalog.covering(10)))
+    print("Overlapping [17:00, 18:00] ->", sorted(catalog.overlapping(TimeWindow(17, 0, 18, 0))))
+    catalog.remove("phobos-1")
+    print("Covering 6:00 after removing phobos-1 ->", sorted(catalog.covering(600)))
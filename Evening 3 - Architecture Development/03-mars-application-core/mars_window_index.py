@@ -0,0 +1,98 @@
+"""Mars Moon Visibility Calculator - prefix-sum index for one window versus many
+
+Fixes one window (e.g. Deimos) and answers ``moon(...)`` for any other window
+in constant time: a cumulative coverage array gives the overlap of any
+interval with two lookups, and a boundary table answers the Twilight Rule.
+Bulk scans over candidate windows run as NumPy gathers on those two arrays.
+"""
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from mars_moon_core import (
+    MARS_MINUTES_PER_DAY,
+    MARS_MINUTES_PER_HOUR,
+    DurationExtractor,
+    TimeWindow,
+    TimeWindowNormalizer,
+)
+
+_normalizer = TimeWindowNormalizer()
+
+
+class WindowIndex:
+    """Precomputed coverage of one fixed window over the 2500 minutes of a sol.
+
+    ``coverage[t]`` is the number of visible minutes in [0, t), so the overlap
+    with [start, end) is ``coverage[end] - coverage[start]``. ``boundary[t]``
+    is set where the fixed window has a boundary point in circular time.
+    """
+    __slots__ = ("window", "coverage", "boundary", "_coverage_list", "_boundary_list")
+
+    def __init__(self, window: TimeWindow):
+        self.window = window
+        visible = np.zeros(MARS_MINUTES_PER_DAY, dtype=np.int32)
+        self.boundary = np.zeros(MARS_MINUTES_PER_DAY, dtype=bool)
+        for start, end in _normalizer.normalize_window(window):
+            visible[start:end] = 1
+            self.boundary[start % MARS_MINUTES_PER_DAY] = True
+            self.boundary[end % MARS_MINUTES_PER_DAY] = True
+        self.coverage = np.zeros(MARS_MINUTES_PER_DAY + 1, dtype=np.int32)
+        np.cumsum(visible, out=self.coverage[1:])
+        # Plain lists for scalar queries: indexing them is far cheaper than indexing NumPy arrays.
+        self._coverage_list: list[int] = self.coverage.tolist()
+        self._boundary_list: list[bool] = self.boundary.tolist()
+
+    @classmethod
+    def from_values(cls, start_h: int, start_m: int, end_h: int, end_m: int) -> "WindowIndex":
+        return cls(TimeWindow(start_h, start_m, end_h, end_m))
+
+    def query(self, start_h: int, start_m: int, end_h: int, end_m: int) -> int:
+        """Joint visibility of the fixed window and one other window, as ``moon(...)`` computes it."""
+        start = (start_h * MARS_MINUTES_PER_HOUR + start_m) % MARS_MINUTES_PER_DAY
+        end = (end_h * MARS_MINUTES_PER_HOUR + end_m) % MARS_MINUTES_PER_DAY
+        coverage = self._coverage_list
+        total = coverage[MARS_MINUTES_PER_DAY]
+
+        if start == end:
+            # A full sol overlaps every window, so the Twilight Rule never applies.
+            return total
+        if start < end:
+            minutes = coverage[end] - coverage[start]
+        else:
+            minutes = total - coverage[start] + coverage[end]
+        if minutes > 0:
+            return minutes
+
+        boundary = self._boundary_list
+        if boundary[start] or boundary[end] or (start > end and boundary[0]):
+            return DurationExtractor.TWILIGHT_MINUTES
+        return 0
+
+    def query_batch(self, windows: ArrayLike) -> NDArray[np.int64]:
+        """Joint visibility for every row of an (N, 4) array of start_h, start_m, end_h, end_m."""
+        rows = np.asarray(windows, dtype=np.int64)
+        if rows.ndim != 2 or rows.shape[1] != 4:
+            raise ValueError(f"Expected an (N, 4) array of integers, got shape {rows.shape}")
+
+        start = (rows[:, 0] * MARS_MINUTES_PER_HOUR + rows[:, 1]) % MARS_MINUTES_PER_DAY
+        end = (rows[:, 2] * MARS_MINUTES_PER_HOUR + rows[:, 3]) % MARS_MINUTES_PER_DAY
+        wraps = start > end
+        total = self.coverage[MARS_MINUTES_PER_DAY]
+
+        covered_start = self.coverage[start]
+        covered_end = self.coverage[end]
+        minutes = np.where(wraps, total - covered_start + covered_end, covered_end - covered_start)
+        minutes = np.where(start == end, total, minutes).astype(np.int64)
+
+        twilight = (minutes == 0) & (self.boundary[start] | self.boundary[end] | (wraps & self.boundary[0]))
+        return np.where(twilight, DurationExtractor.TWILIGHT_MINUTES, minutes)
+
+
+# ===== Examples =====
+
+if __name__ == "__main__":
+    deimos = WindowIndex.from_values(12, 32, 17, 6)
+    print("D[12:32, 17:06] vs P[17:06, 19:78] ->", deimos.query(17, 6, 19, 78))
+    print("D[12:32, 17:06] vs P[15:00, 16:00], P[5:00, 13:00], P[20:00, 1:00] ->",
+          deimos.query_batch([[15, 0, 16, 0], [5, 0, 13, 0], [20, 0, 1, 0]]).tolist())
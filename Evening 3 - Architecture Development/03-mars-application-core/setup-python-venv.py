@@ -4,11 +4,24 @@ setup-python-venv.py — one-time bootstrap for a solution's Python virtual envi
 
 Usage:
   python3 setup-python-venv.py path/to/solution [--recreate] [--no-requirements]
+  python3 setup-python-venv.py --all path/to/root [...] [--wheelhouse DIR] [--jobs N] [--recreate] [--no-requirements]
 
 What it does:
   - Creates (or reuses) a virtual environment at: path/to/solution/venv
   - Uses the same Python interpreter that's running this script (sys.executable)
   - If a requirements.txt exists and is non-empty, installs dependencies
+  - Records a hash of requirements.txt (and any files it includes with -r/-c)
+    and the venv's Python version in venv/.requirements-stamp, and skips the install on later runs while both
+    are unchanged (re-running on an up-to-date solution starts no subprocess)
+  - --recreate deletes the existing venv and builds a fresh one
+
+With --all, every folder below the given roots that contains a requirements.txt
+is a solution. All their requirements are built once into a shared local
+wheelhouse (default: <first root>/.wheelhouse, rebuilt only when a requirements
+file or the interpreter changes), then the venvs are created/updated
+concurrently with `pip install --no-index --find-links <wheelhouse>`, so only
+the wheelhouse build may touch the network. Copy a built wheelhouse to offline
+machines and pass it with --wheelhouse. Per-solution timings are reported.
 
 After running once per solution, you can either:
   - Activate in a terminal:  source path/to/solution/venv/bin/activate
@@ -20,9 +33,21 @@ This keeps setup fully local and does not require admin privileges.
 from __future__ import annotations
 
 import argparse
+import hashlib
+import os
+import re
+import shutil
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
+
+STAMP_NAME = ".requirements-stamp"
+SKIP_DIRS = {"venv", ".venv", "__pycache__", "node_modules"}
+# A line pulling another requirements or constraints file in: "-r base.txt", "-cconstraints.txt", "--requirement=x".
+INCLUDE_LINE = re.compile(r"^\s*(?:--requirement|--constraint|-r|-c)[\s=]*([^\s#]+)")
 
 
 def _python_in_venv(venv_dir: Path) -> Path | None:
@@ -45,20 +70,24 @@ def _requirements_non_empty(req_file: Path) -> bool:
     return False
 
 
-def create_or_reuse_venv(solution_dir: Path, recreate: bool = False) -> Path:
+def create_or_reuse_venv(
+    solution_dir: Path,
+    recreate: bool = False,
+    capture: bool = False,
+    log: Callable[[str], None] = print,
+) -> Path:
     venv_dir = solution_dir / "venv"
     if recreate and venv_dir.exists():
-        print(f"[setup-python-venv] --recreate requested; removing existing venv: {venv_dir}")
-        # Keep it simple and portable: recreate by invoking 'venv' into the same path; no manual rm -rf.
-        # If Python's venv module can't reuse the directory cleanly, user can remove it manually.
-        # To stay safe, only recreate if directory is empty or contains a typical venv structure.
-        # Here we just proceed to re-run creation, which refreshes scripts/interpreter.
+        if not (venv_dir / "pyvenv.cfg").exists():
+            raise SystemExit(f"Refusing to remove {venv_dir}: it does not look like a virtual environment (no pyvenv.cfg)")
+        log(f"[setup-python-venv] --recreate requested; removing existing venv: {venv_dir}")
+        shutil.rmtree(venv_dir)
 
     if not venv_dir.exists():
-        print(f"[setup-python-venv] Creating virtual environment at {venv_dir}")
-        subprocess.run([sys.executable, "-m", "venv", str(venv_dir)], check=True)
+        log(f"[setup-python-venv] Creating virtual environment at {venv_dir}")
+        subprocess.run([sys.executable, "-m", "venv", str(venv_dir)], check=True, capture_output=capture)
     else:
-        print(f"[setup-python-venv] Reusing existing virtual environment at {venv_dir}")
+        log(f"[setup-python-venv] Reusing existing virtual environment at {venv_dir}")
 
     python = _python_in_venv(venv_dir)
     if python is None:
@@ -66,33 +95,201 @@ def create_or_reuse_venv(solution_dir: Path, recreate: bool = False) -> Path:
     return python
 
 
-def maybe_install_requirements(solution_dir: Path, python: Path, skip: bool) -> None:
+def _venv_python_version(venv_dir: Path) -> str:
+    """Python version recorded in pyvenv.cfg (read instead of starting the interpreter)."""
+    try:
+        for line in (venv_dir / "pyvenv.cfg").read_text(encoding="utf-8").splitlines():
+            key, _, value = line.partition("=")
+            if key.strip() in ("version", "version_info"):
+                return value.strip()
+    except FileNotFoundError:
+        pass
+    return ""
+
+
+def _included_files(req_file: Path) -> list[Path]:
+    """The requirements file followed by every file it pulls in with -r/-c, recursively, each once."""
+    files: list[Path] = []
+    pending = [req_file.resolve()]
+    while pending:
+        current = pending.pop(0)
+        if current in files or not current.is_file():
+            continue
+        files.append(current)
+        for line in current.read_text(encoding="utf-8").splitlines():
+            if match := INCLUDE_LINE.match(line):
+                pending.append((current.parent / match.group(1)).resolve())
+    return files
+
+
+def _hash_requirements(digest, req_file: Path) -> None:
+    """Feed the requirements file and the files it includes into ``digest``."""
+    for path in _included_files(req_file):
+        digest.update(b"\0" + path.read_bytes())
+
+
+def requirements_stamp(req_file: Path, venv_dir: Path) -> str:
+    """Hash of the requirements file, the files it includes and the venv's Python version."""
+    digest = hashlib.sha256()
+    _hash_requirements(digest, req_file)
+    digest.update(b"\0" + _venv_python_version(venv_dir).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def maybe_install_requirements(
+    solution_dir: Path,
+    python: Path,
+    skip: bool,
+    wheelhouse: Path | None = None,
+    capture: bool = False,
+    log: Callable[[str], None] = print,
+) -> None:
     req = solution_dir / "requirements.txt"
     if skip:
-        print("[setup-python-venv] Skipping requirements installation (--no-requirements)")
+        log("[setup-python-venv] Skipping requirements installation (--no-requirements)")
         return
     if not req.exists():
-        print("[setup-python-venv] No requirements.txt found — nothing to install")
+        log("[setup-python-venv] No requirements.txt found — nothing to install")
         return
     if not _requirements_non_empty(req):
-        print("[setup-python-venv] requirements.txt is empty — nothing to install")
+        log("[setup-python-venv] requirements.txt is empty — nothing to install")
+        return
+
+    venv_dir = solution_dir / "venv"
+    stamp_file = venv_dir / STAMP_NAME
+    stamp = requirements_stamp(req, venv_dir)
+    if stamp_file.exists() and stamp_file.read_text(encoding="utf-8").strip() == stamp:
+        log("[setup-python-venv] requirements.txt unchanged since last install — skipping")
+        return
+
+    log(f"[setup-python-venv] Installing dependencies from {req}")
+    offline = ["--no-index", "--find-links", str(wheelhouse)] if wheelhouse else []
+    subprocess.run([str(python), "-m", "pip", "install", *offline, "-r", str(req)], check=True, capture_output=capture)
+    # Written only after a successful install, so a failed one is retried next time.
+    stamp_file.write_text(stamp + "\n", encoding="utf-8")
+
+
+def discover_solutions(roots: list[Path]) -> list[Path]:
+    """Folders below ``roots`` that contain a requirements.txt, skipping venvs and hidden folders."""
+    solutions: set[Path] = set()
+    for root in roots:
+        for current, dirs, files in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+            if "requirements.txt" in files:
+                solutions.add(Path(current).resolve())
+    return sorted(solutions)
+
+
+def build_wheelhouse(solutions: list[Path], wheelhouse: Path) -> None:
+    """Build wheels for every solution's requirements once; skipped while they and the interpreter are unchanged."""
+    reqs = [s / "requirements.txt" for s in solutions if _requirements_non_empty(s / "requirements.txt")]
+    if not reqs:
+        print("[setup-python-venv] No requirements to build — wheelhouse not needed")
+        return
+
+    digest = hashlib.sha256(sys.version.encode("utf-8"))
+    for req in reqs:
+        _hash_requirements(digest, req)
+    stamp = digest.hexdigest()
+    stamp_file = wheelhouse / STAMP_NAME
+    if stamp_file.exists() and stamp_file.read_text(encoding="utf-8").strip() == stamp:
+        print(f"[setup-python-venv] Wheelhouse up to date: {wheelhouse}")
         return
 
-    print(f"[setup-python-venv] Installing dependencies from {req}")
-    subprocess.run([str(python), "-m", "pip", "install", "-r", str(req)], check=True)
+    print(f"[setup-python-venv] Building wheelhouse for {len(reqs)} requirements file(s) at {wheelhouse}")
+    wheelhouse.mkdir(parents=True, exist_ok=True)
+    # One pip run per file: solutions may pin conflicting versions, which a single resolve would reject.
+    for req in reqs:
+        print(f"[setup-python-venv] Building wheels for {req}")
+        subprocess.run(
+            [sys.executable, "-m", "pip", "wheel", "--find-links", str(wheelhouse), "-w", str(wheelhouse),
+             "-r", str(req)],
+            check=True,
+        )
+    stamp_file.write_text(stamp + "\n", encoding="utf-8")
+
+
+def bootstrap_solution(solution_dir: Path, recreate: bool, skip: bool, wheelhouse: Path | None) -> tuple[float, str]:
+    """Create/update one solution's venv quietly; returns (seconds, error message or "").
+
+    Progress lines are prefixed with the solution name, as several solutions run at once.
+    """
+    def log(message: str) -> None:
+        sys.stdout.write(f"[{solution_dir.name}] {message.removeprefix('[setup-python-venv] ')}\n")
+
+    started = time.perf_counter()
+    try:
+        python = create_or_reuse_venv(solution_dir, recreate=recreate, capture=True, log=log)
+        maybe_install_requirements(solution_dir, python, skip=skip, wheelhouse=wheelhouse, capture=True, log=log)
+    except subprocess.CalledProcessError as error:
+        output = (error.stdout or b"").decode(errors="replace") + (error.stderr or b"").decode(errors="replace")
+        lines = output.strip().splitlines()
+        return time.perf_counter() - started, lines[-1] if lines else str(error)
+    except (OSError, SystemExit) as error:
+        return time.perf_counter() - started, str(error)
+    return time.perf_counter() - started, ""
+
+
+def bootstrap_all(roots: list[Path], wheelhouse: Path, jobs: int, recreate: bool, skip: bool) -> int:
+    solutions = discover_solutions(roots)
+    if not solutions:
+        print(f"[setup-python-venv] No solution folders with a requirements.txt below: {', '.join(map(str, roots))}")
+        return 2
+    print(f"[setup-python-venv] Found {len(solutions)} solution folder(s)")
+
+    started = time.perf_counter()
+    if not skip:
+        try:
+            build_wheelhouse(solutions, wheelhouse)
+        except subprocess.CalledProcessError:
+            print("[setup-python-venv] ERROR: Building the wheelhouse failed (see pip output above)")
+            return 1
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(
+            lambda solution: bootstrap_solution(solution, recreate, skip, None if skip else wheelhouse), solutions))
+    elapsed = time.perf_counter() - started
+
+    width = max(len(str(s)) for s in solutions)
+    print()
+    print(f"{'Solution':<{width}}  {'Seconds':>8}  Result")
+    for solution, (seconds, error) in zip(solutions, results):
+        print(f"{str(solution):<{width}}  {seconds:>8.2f}  {'FAILED: ' + error if error else 'ok'}")
+    failed = sum(1 for _, error in results if error)
+    print()
+    print(f"[setup-python-venv] {len(solutions) - failed}/{len(solutions)} solution(s) ready in {elapsed:.2f}s")
+    return 1 if failed else 0
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Bootstrap a Python venv for a solution folder")
-    parser.add_argument("solution_path", help="Path to the solution folder (will create/use solution_path/venv)")
-    parser.add_argument("--recreate", action="store_true", help="Recreate the venv even if it already exists")
+    parser.add_argument("solution_path", nargs="+",
+                        help="Path to the solution folder (will create/use solution_path/venv); "
+                             "with --all, folders to search for solutions")
+    parser.add_argument("--recreate", action="store_true", help="Delete the existing venv and create a fresh one")
     parser.add_argument(
         "--no-requirements",
         action="store_true",
         help="Do not install requirements.txt even if present",
     )
+    parser.add_argument("--all", action="store_true",
+                        help="Bootstrap every folder with a requirements.txt below the given paths, concurrently")
+    parser.add_argument("--wheelhouse", help="Shared wheel folder for --all (default: <first path>/.wheelhouse)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Solutions bootstrapped at once with --all")
     args = parser.parse_args(argv)
 
+    if args.all:
+        roots = [Path(p).expanduser().resolve() for p in args.solution_path]
+        missing = [r for r in roots if not r.is_dir()]
+        if missing:
+            print(f"[setup-python-venv] ERROR: Directory not found: {missing[0]}")
+            return 2
+        wheelhouse = Path(args.wheelhouse).expanduser().resolve() if args.wheelhouse else roots[0] / ".wheelhouse"
+        return bootstrap_all(roots, wheelhouse, max(1, args.jobs), args.recreate, args.no_requirements)
+    if len(args.solution_path) > 1:
+        parser.error("several solution paths need --all")
+    args.solution_path = args.solution_path[0]
+
     solution_dir = Path(args.solution_path).expanduser().resolve()
     if not solution_dir.exists() or not solution_dir.is_dir():
         print(f"[setup-python-venv] ERROR: Solution directory not found: {solution_dir}")
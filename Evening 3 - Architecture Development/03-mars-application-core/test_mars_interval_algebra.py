@@ -0,0 +1,139 @@
+"""
+Test suite for mars_interval_algebra.py
+
+Tests unions, sweep-line intersections and multi-body joint visibility,
+and checks the two-body case against moon().
+"""
+
+import random
+import unittest
+
+from mars_interval_algebra import (
+    boundary_points,
+    duration,
+    intersection,
+    joint_intervals,
+    joint_visibility,
+    normalize_windows,
+    union,
+    visible_minutes,
+)
+from mars_moon_core import moon, TimeWindow, MARS_MINUTES_PER_DAY
+
+
+class TestUnion(unittest.TestCase):
+    """Test interval unions"""
+
+    def test_merges_overlapping_and_touching(self):
+        """Test that overlapping and touching intervals merge, gaps stay."""
+        self.assertEqual(union([(50, 60), (0, 10), (5, 20), (20, 30)]), [(0, 30), (50, 60)])
+
+    def test_contained_interval(self):
+        """Test that an interval inside another disappears."""
+        self.assertEqual(union([(0, 100), (10, 20)]), [(0, 100)])
+
+    def test_empty(self):
+        """Test that the union of nothing is empty."""
+        self.assertEqual(union([]), [])
+
+
+class TestIntersection(unittest.TestCase):
+    """Test sweep-line intersections"""
+
+    def test_two_sets(self):
+        """Test intersecting two sets of intervals."""
+        self.assertEqual(intersection([(0, 100), (200, 300)], [(50, 250)]), [(50, 100), (200, 250)])
+
+    def test_touching_intervals_do_not_intersect(self):
+        """Test that half-open intervals sharing an endpoint have no common minute."""
+        self.assertEqual(intersection([(500, 1000)], [(1000, 1500)]), [])
+
+    def test_three_sets(self):
+        """Test that only minutes covered by every set remain."""
+        self.assertEqual(intersection([(0, 100)], [(50, 150)], [(90, 200)]), [(90, 100)])
+
+    def test_overlapping_intervals_within_one_set(self):
+        """Test that overlaps inside one set are not counted as a second set."""
+        self.assertEqual(intersection([(0, 100), (50, 150)], [(200, 300)]), [])
+
+    def test_requires_a_set(self):
+        """Test that at least one interval set is required."""
+        with self.assertRaises(ValueError):
+            intersection()
+
+
+class TestJointVisibility(unittest.TestCase):
+    """Test joint visibility for named bodies with several windows"""
+
+    def test_wraparound_windows_of_three_bodies(self):
+        """Test intersecting bodies whose windows cross midnight."""
+        bodies = {
+            "Deimos": [TimeWindow(1, 0, 4, 0), TimeWindow(20, 0, 2, 0)],
+            "Phobos": [TimeWindow(3, 0, 6, 0), TimeWindow(24, 0, 0, 50)],
+            "Sun": [TimeWindow(0, 30, 12, 30)],
+        }
+        self.assertEqual(joint_intervals(bodies), [(30, 50), (300, 400)])
+        self.assertEqual(joint_visibility(bodies), 120)
+
+    def test_twilight_shared_by_all_bodies(self):
+        """Test the Twilight Rule when every body has a boundary at 7:00."""
+        bodies = {
+            "Deimos": [TimeWindow(5, 0, 7, 0)],
+            "Phobos": [TimeWindow(7, 0, 9, 0), TimeWindow(12, 0, 13, 0)],
+            "Sun": [TimeWindow(7, 0, 8, 0)],
+        }
+        self.assertEqual(joint_visibility(bodies), 1)
+
+    def test_twilight_at_midnight(self):
+        """Test that 0 and 2500 are the same boundary point."""
+        bodies = {"Deimos": [TimeWindow(10, 0, 25, 0)], "Phobos": [TimeWindow(0, 0, 5, 0)]}
+        self.assertEqual(joint_visibility(bodies), 1)
+
+    def test_no_common_minute_or_boundary(self):
+        """Test that pairwise overlaps alone give 0."""
+        bodies = {
+            "Deimos": [TimeWindow(5, 0, 7, 0)],
+            "Phobos": [TimeWindow(6, 0, 9, 0)],
+            "Sun": [TimeWindow(8, 0, 10, 0)],
+        }
+        self.assertEqual(joint_visibility(bodies), 0)
+
+    def test_body_without_windows(self):
+        """Test that a body that is never visible gives 0."""
+        self.assertEqual(joint_visibility({"Deimos": [TimeWindow(5, 0, 7, 0)], "Phobos": []}), 0)
+
+    def test_requires_a_body(self):
+        """Test that at least one body is required."""
+        with self.assertRaises(ValueError):
+            joint_visibility({})
+
+    def test_matches_moon_on_random_inputs(self):
+        """Test that one Deimos and one Phobos window agree with the component pipeline."""
+        rng = random.Random(37)
+        for _ in range(5000):
+            values = [rng.randint(0, 25) if i % 2 == 0 else rng.randint(0, 99) for i in range(8)]
+            bodies = {"Deimos": [TimeWindow(*values[:4])], "Phobos": [TimeWindow(*values[4:])]}
+            self.assertEqual(joint_visibility(bodies), moon(*values), values)
+
+
+class TestHelpers(unittest.TestCase):
+    """Test normalization, boundaries and durations"""
+
+    def test_normalize_windows_flattens_wraparound(self):
+        """Test that every window of a body is normalized and flattened."""
+        windows = [TimeWindow(24, 53, 7, 12), TimeWindow(10, 0, 11, 0)]
+        self.assertEqual(normalize_windows(windows), [(2453, 2500), (0, 712), (1000, 1100)])
+
+    def test_boundary_points_circular(self):
+        """Test that 2500 is reported as 0."""
+        self.assertEqual(boundary_points([(1000, MARS_MINUTES_PER_DAY)]), {0, 1000})
+
+    def test_duration_and_visible_minutes(self):
+        """Test durations of disjoint intervals and of overlapping windows."""
+        self.assertEqual(duration([(0, 10), (20, 25)]), 15)
+        self.assertEqual(visible_minutes([TimeWindow(1, 0, 3, 0), TimeWindow(2, 0, 4, 0)]), 300)
+        self.assertEqual(visible_minutes([TimeWindow(5, 0, 5, 0)]), MARS_MINUTES_PER_DAY)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
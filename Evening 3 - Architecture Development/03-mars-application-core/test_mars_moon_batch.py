@@ -0,0 +1,81 @@
+"""
+Test suite for mars_moon_batch.py
+
+Checks moon_batch() against the component pipeline moon() row by row.
+"""
+
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the application core itself is stdlib-only
+    np = None
+
+from mars_moon_core import moon
+
+if np is not None:
+    from mars_moon_batch import moon_batch
+
+
+def random_rows(count, seed):
+    """Random valid Mars timestamps (hours 0-25, minutes 0-99)."""
+    rng = random.Random(seed)
+    return [[rng.randint(0, 25) if i % 2 == 0 else rng.randint(0, 99) for i in range(8)] for _ in range(count)]
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestMoonBatch(unittest.TestCase):
+    """Test the vectorised moon_batch() function"""
+
+    def assertMatchesMoon(self, rows):
+        expected = [moon(*row) for row in rows]
+        self.assertEqual(moon_batch(np.array(rows)).tolist(), expected)
+
+    def test_requirement_examples(self):
+        """Test the REQ2/REQ3 examples from the README."""
+        rows = [
+            [13, 91, 23, 5, 22, 5, 24, 45],
+            [24, 53, 7, 12, 5, 12, 8, 45],
+            [12, 32, 17, 6, 17, 6, 19, 78],
+            [22, 11, 0, 36, 7, 0, 22, 11],
+            [5, 0, 6, 0, 7, 0, 8, 0],
+            [10, 0, 25, 0, 0, 0, 5, 0],
+        ]
+        self.assertEqual(moon_batch(np.array(rows)).tolist(), [100, 200, 1, 1, 0, 1])
+
+    def test_edge_cases(self):
+        """Test full sols, midnight endpoints and twilight at midnight in both directions."""
+        self.assertMatchesMoon([
+            [5, 0, 5, 0, 10, 0, 15, 0],  # Deimos visible all sol
+            [5, 0, 5, 0, 7, 0, 7, 0],  # both visible all sol
+            [0, 0, 25, 0, 3, 0, 4, 0],  # 0:00 == 25:00 -> full sol
+            [0, 0, 5, 0, 20, 0, 0, 0],  # Phobos ends exactly at midnight
+            [20, 0, 25, 0, 25, 0, 3, 0],  # touch at midnight written as 25:00
+            [22, 0, 1, 0, 1, 0, 22, 0],  # two shared boundaries, no overlap
+            [22, 0, 1, 0, 0, 50, 2, 0],  # both wrap past midnight, overlap
+            [3, 0, 3, 1, 3, 1, 3, 2],  # one-minute windows touching
+        ])
+
+    def test_matches_moon_on_random_inputs(self):
+        """Test that random window pairs agree with the component pipeline."""
+        self.assertMatchesMoon(random_rows(5000, seed=35))
+
+    def test_accepts_nested_lists(self):
+        """Test that any (N, 8) array-like is accepted."""
+        self.assertEqual(moon_batch([[13, 91, 23, 5, 22, 5, 24, 45]]).tolist(), [100])
+
+    def test_empty_batch(self):
+        """Test that an empty (0, 8) batch yields an empty result."""
+        self.assertEqual(moon_batch(np.empty((0, 8), dtype=np.int64)).shape, (0,))
+
+    def test_rejects_wrong_shape(self):
+        """Test that rows must have exactly 8 integers."""
+        with self.assertRaises(ValueError):
+            moon_batch(np.zeros((4, 7), dtype=np.int64))
+        with self.assertRaises(ValueError):
+            moon_batch(np.zeros(8, dtype=np.int64))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
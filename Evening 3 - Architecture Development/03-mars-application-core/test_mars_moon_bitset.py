@@ -0,0 +1,106 @@
+"""
+Test suite for mars_moon_bitset.py
+
+Checks the bitset engine against the component pipeline and covers
+intersections of more than two windows.
+"""
+
+import unittest
+
+from mars_moon_bitset import (
+    DAY_MASK,
+    WindowBits,
+    interval_mask,
+    joint_visibility,
+    moon_bitset,
+    random_queries,
+    window_bits,
+)
+from mars_moon_core import moon, MARS_MINUTES_PER_DAY
+
+
+class TestEncoding(unittest.TestCase):
+    """Test window -> bitset encoding"""
+
+    def test_interval_mask(self):
+        """Test that [start, end) sets exactly end - start bits from start."""
+        self.assertEqual(interval_mask(3, 6), 0b111000)
+
+    def test_simple_window(self):
+        """Test coverage and boundaries of a window inside one sol."""
+        bits = window_bits(5, 0, 10, 0)
+        self.assertEqual(bits.coverage, interval_mask(500, 1000))
+        self.assertEqual(bits.boundaries, (1 << 500) | (1 << 1000))
+
+    def test_wraparound_window(self):
+        """Test that a wraparound window covers [start, 2500) and [0, end) with midnight as boundary."""
+        bits = window_bits(24, 53, 7, 12)
+        self.assertEqual(bits.coverage, interval_mask(2453, MARS_MINUTES_PER_DAY) | interval_mask(0, 712))
+        self.assertEqual(bits.boundaries, (1 << 2453) | (1 << 712) | 1)
+
+    def test_full_sol_window(self):
+        """Test that start == end covers the whole sol."""
+        bits = window_bits(10, 0, 10, 0)
+        self.assertEqual(bits.coverage, DAY_MASK)
+        self.assertEqual(bits.boundaries, 1)
+
+
+class TestMoonBitset(unittest.TestCase):
+    """Test moon_bitset() against moon()"""
+
+    def test_requirement_examples(self):
+        """Test the REQ2/REQ3 examples from the README."""
+        self.assertEqual(moon_bitset(13, 91, 23, 5, 22, 5, 24, 45), 100)
+        self.assertEqual(moon_bitset(24, 53, 7, 12, 5, 12, 8, 45), 200)
+        self.assertEqual(moon_bitset(12, 32, 17, 6, 17, 6, 19, 78), 1)
+        self.assertEqual(moon_bitset(5, 0, 6, 0, 7, 0, 8, 0), 0)
+        self.assertEqual(moon_bitset(10, 0, 25, 0, 0, 0, 5, 0), 1)
+
+    def test_matches_moon_on_random_inputs(self):
+        """Test that random window pairs agree with the component pipeline."""
+        for query in random_queries(5000, seed=36):
+            self.assertEqual(moon_bitset(*query), moon(*query), query)
+
+
+class TestJointVisibility(unittest.TestCase):
+    """Test intersections of any number of windows"""
+
+    def test_three_windows_overlap(self):
+        """Test that the overlap of three windows is their common minutes."""
+        result = joint_visibility(window_bits(5, 0, 9, 0), window_bits(6, 0, 8, 0), window_bits(7, 50, 12, 0))
+        self.assertEqual(result, 50)
+
+    def test_three_windows_common_boundary(self):
+        """Test the Twilight Rule when all windows share one boundary point."""
+        result = joint_visibility(window_bits(5, 0, 7, 0), window_bits(7, 0, 9, 0), window_bits(7, 0, 8, 0))
+        self.assertEqual(result, 1)
+
+    def test_pairwise_overlap_without_common_minute(self):
+        """Test that pairwise overlaps do not count when no minute is common to all windows."""
+        result = joint_visibility(window_bits(5, 0, 7, 0), window_bits(6, 0, 9, 0), window_bits(8, 0, 10, 0))
+        self.assertEqual(result, 0)
+
+    def test_body_with_several_windows(self):
+        """Test intersecting a body whose windows are OR-ed together."""
+        body = window_bits(1, 0, 2, 0) | window_bits(4, 0, 5, 0)
+        self.assertEqual(joint_visibility(body, window_bits(1, 50, 4, 30)), 80)
+
+    def test_single_window(self):
+        """Test that one window yields its own duration."""
+        self.assertEqual(joint_visibility(window_bits(3, 0, 4, 0)), 100)
+
+    def test_no_windows(self):
+        """Test that at least one window is required."""
+        with self.assertRaises(ValueError):
+            joint_visibility()
+
+    def test_window_bits_combine(self):
+        """Test & and | on WindowBits."""
+        a = WindowBits(0b1100, 0b0001)
+        b = WindowBits(0b0110, 0b0011)
+        self.assertEqual(a & b, WindowBits(0b0100, 0b0001))
+        self.assertEqual(a | b, WindowBits(0b1110, 0b0011))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,183 @@
+"""
+Test suite for mars_moon_cli.py
+
+Tests parsing, chunked and parallel evaluation in input order, and the
+command line entry point.
+"""
+
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the application core itself is stdlib-only
+    np = None
+
+from mars_moon_core import moon
+
+if np is not None:
+    from mars_moon_cli import Chunk, evaluate_chunk, main, parse_text, process, read_chunks
+
+
+def random_records(count, seed):
+    rng = random.Random(seed)
+    return [[rng.randint(0, 25) if i % 2 == 0 else rng.randint(0, 99) for i in range(8)] for _ in range(count)]
+
+
+def as_text(records):
+    return "".join(" ".join(map(str, record)) + "\n" for record in records).encode("ascii")
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestParsing(unittest.TestCase):
+    """Test record parsing"""
+
+    def test_whitespace_commas_and_blank_lines(self):
+        """Test that separators may be mixed and blank lines are skipped."""
+        rows = parse_text(b"13,91,23,5,22,5,24,45\n\n12 32 17 6\t17 6 19 78\n")
+        self.assertEqual(rows.tolist(), [[13, 91, 23, 5, 22, 5, 24, 45], [12, 32, 17, 6, 17, 6, 19, 78]])
+
+    def test_wrong_value_count(self):
+        """Test that a line without 8 integers is rejected."""
+        with self.assertRaises(ValueError):
+            parse_text(b"1 2 3\n")
+
+    def test_malformed_value(self):
+        """Test that non-integer tokens are rejected."""
+        with self.assertRaises(ValueError):
+            parse_text(b"1 2 3 4 x 6 7 8\n")
+
+    def test_ragged_lines(self):
+        """Test that lines of 9 and 7 values are not read as two records and the line is named."""
+        with self.assertRaisesRegex(ValueError, "Line 1: expected 8 integers, got 9"):
+            parse_text(b"1 2 3 4 5 6 7 8 9\n1 2 3 4 5 6 7\n")
+        with self.assertRaisesRegex(ValueError, "Line 4: expected 8 integers, got 7"):
+            parse_text(b"1 2 3 4 5 6 7 8\n\n1,2,3,4,5,6,7,8\n1 2 3 4 5 6 7\n")
+
+    def test_non_numeric_token(self):
+        """Test that a non-numeric token is reported with its line."""
+        with self.assertRaisesRegex(ValueError, "Line 2: '5.5' is not a 64-bit integer"):
+            parse_text(b"1 2 3 4 5 6 7 8\n1 2 3 4 5.5 6 7 8\n")
+        with self.assertRaisesRegex(ValueError, "Line 1: 'x' is not a 64-bit integer"):
+            parse_text(b"1 2 3 4 x 6 7 8\n")
+
+    def test_line_numbers_start_at_first_line(self):
+        """Test that a chunk's errors count lines from where the chunk starts in its input."""
+        with self.assertRaisesRegex(ValueError, "Line 12: expected 8 integers, got 7"):
+            parse_text(b"1 2 3 4 5 6 7 8\n1 2 3 4 5 6 7\n", first_line=11)
+        with self.assertRaisesRegex(ValueError, "^records.txt: Line 3: 'x'"):
+            evaluate_chunk(Chunk(b"1 2 3 4 x 6 7 8\n", "records.txt", 3), "text", "text")
+
+    def test_empty_input(self):
+        """Test that blank input yields no records."""
+        self.assertEqual(parse_text(b"\n \n").shape, (0, 8))
+
+    def test_truncated_binary_record(self):
+        """Test that binary input must hold whole records."""
+        with self.assertRaises(ValueError):
+            evaluate_chunk(Chunk(b"\x00" * 15), "binary", "text")
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestProcess(unittest.TestCase):
+    """Test chunked evaluation"""
+
+    def setUp(self):
+        self.records = random_records(2000, seed=42)
+        self.expected = [moon(*record) for record in self.records]
+
+    def test_text_in_process(self):
+        """Test text input and output without a pool."""
+        output = io.BytesIO()
+        chunks = read_chunks([io.BytesIO(as_text(self.records))], "text", chunk_size=300)
+        self.assertEqual(process(chunks, output), len(self.records))
+        self.assertEqual(list(map(int, output.getvalue().split())), self.expected)
+
+    def test_process_pool_keeps_input_order(self):
+        """Test that parallel chunks are written in input order."""
+        output = io.BytesIO()
+        chunks = read_chunks([io.BytesIO(as_text(self.records))], "text", chunk_size=37)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            process(chunks, output, executor=executor, max_in_flight=3)
+        self.assertEqual(list(map(int, output.getvalue().split())), self.expected)
+
+    def test_binary_round_trip(self):
+        """Test int16 input and output."""
+        data = np.array(self.records, dtype="<i2").tobytes()
+        output = io.BytesIO()
+        chunks = read_chunks([io.BytesIO(data)], "binary", chunk_size=128)
+        process(chunks, output, "binary", "binary")
+        self.assertEqual(np.frombuffer(output.getvalue(), dtype="<i2").tolist(), self.expected)
+
+    def test_chunks_know_where_they_start(self):
+        """Test that every chunk carries its stream's name and first line."""
+        stream = io.BytesIO(as_text(self.records[:5]))
+        stream.name = "records.txt"
+        chunks = list(read_chunks([stream, io.BytesIO(as_text(self.records[:3]))], "text", chunk_size=2))
+        self.assertEqual([(chunk.source, chunk.first_line) for chunk in chunks],
+                         [("records.txt", 1), ("records.txt", 3), ("records.txt", 5), ("", 1), ("", 3)])
+
+    def test_several_streams_in_order(self):
+        """Test that inputs are processed one after another."""
+        first, second = self.records[:700], self.records[700:]
+        output = io.BytesIO()
+        chunks = read_chunks([io.BytesIO(as_text(first)), io.BytesIO(as_text(second))], "text", chunk_size=500)
+        process(chunks, output)
+        self.assertEqual(list(map(int, output.getvalue().split())), self.expected)
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestMain(unittest.TestCase):
+    """Test the command line entry point"""
+
+    def test_files_to_output_file(self):
+        """Test reading files and writing results with records/sec on stderr."""
+        records = random_records(500, seed=7)
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "records.txt")
+            target = os.path.join(tmp, "results.txt")
+            with open(source, "wb") as stream:
+                stream.write(as_text(records))
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                status = main([source, "--output", target, "--chunk-size", "64", "--workers", "2"])
+            with open(target, "rb") as stream:
+                results = list(map(int, stream.read().split()))
+        self.assertEqual(status, 0)
+        self.assertEqual(results, [moon(*record) for record in records])
+        self.assertIn("records/sec", stderr.getvalue())
+
+    def test_invalid_input_exit_status(self):
+        """Test that malformed input yields exit status 1."""
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "records.txt")
+            with open(source, "wb") as stream:
+                stream.write(b"1 2 3\n")
+            with contextlib.redirect_stderr(io.StringIO()):
+                status = main([source, "--output", os.path.join(tmp, "out.txt"), "--workers", "0"])
+        self.assertEqual(status, 1)
+
+    def test_error_names_the_line_in_the_file(self):
+        """Test that a bad record past the first chunk is reported with its line in the file."""
+        lines = as_text(random_records(4, seed=3)) + b"1 2 3 4 5 6 7\n" + as_text(random_records(3, seed=4))
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "records.txt")
+            with open(source, "wb") as stream:
+                stream.write(lines)
+            for workers in ("0", "2"):
+                with self.subTest(workers=workers):
+                    stderr = io.StringIO()
+                    with contextlib.redirect_stderr(stderr):
+                        status = main([source, "--output", os.path.join(tmp, "out.txt"), "--chunk-size", "2",
+                                       "--workers", workers])
+                    self.assertEqual(status, 1)
+                    self.assertIn(f"{source}: Line 5: expected 8 integers, got 7", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
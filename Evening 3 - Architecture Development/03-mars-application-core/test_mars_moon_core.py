@@ -4,10 +4,14 @@ Comprehensive test suite for mars_moon_core.py
 Tests all components (A, B, C, D) individually and the integrated moon() function.
 """
 
+import itertools
+import random
 import unittest
 
 from mars_moon_core import (
     moon,
+    moon_fast,
+    moon_pipeline,
     TimeWindowParser,
     TimeWindowNormalizer,
     OverlapCalculator,
@@ -252,5 +256,52 @@ class TestMoonFunction(unittest.TestCase):
         self.assertEqual(result, 500)
 
 
+class TestMoonFastPath(unittest.TestCase):
+    """Differential test: moon_fast() against the component pipeline moon_pipeline()"""
+
+    # Timestamps around midnight, the start/end of a Mars hour and mid-sol.
+    EDGE_TIMESTAMPS = [(0, 0), (0, 1), (0, 99), (1, 0), (12, 50), (24, 99), (25, 0)]
+
+    def assertSameAsPipeline(self, values):
+        self.assertEqual(moon_fast(*values), moon_pipeline(*values), values)
+
+    def test_requirement_examples(self):
+        """Test the REQ2/REQ3 examples."""
+        for values in [
+            (13, 91, 23, 5, 22, 5, 24, 45),
+            (24, 53, 7, 12, 5, 12, 8, 45),
+            (12, 32, 17, 6, 17, 6, 19, 78),
+            (22, 11, 0, 36, 7, 0, 22, 11),
+            (5, 0, 6, 0, 7, 0, 8, 0),
+            (10, 0, 25, 0, 0, 0, 5, 0),
+            (5, 0, 5, 0, 10, 0, 15, 0),
+        ]:
+            self.assertSameAsPipeline(values)
+
+    def test_all_edge_timestamp_combinations(self):
+        """Test every window pair built from the edge timestamps (full sols, wraparound, midnight)."""
+        windows = [start + end for start, end in itertools.product(self.EDGE_TIMESTAMPS, repeat=2)]
+        for deimos, phobos in itertools.product(windows, repeat=2):
+            self.assertSameAsPipeline(deimos + phobos)
+
+    def test_random_inputs(self):
+        """Test random valid timestamps."""
+        rng = random.Random(39)
+        for _ in range(100_000):
+            self.assertSameAsPipeline(
+                tuple(rng.randint(0, 25) if i % 2 == 0 else rng.randint(0, 99) for i in range(8))
+            )
+
+    def test_random_touching_windows(self):
+        """Test random window pairs that share a boundary, where the Twilight Rule decides."""
+        rng = random.Random(390)
+        for _ in range(20_000):
+            a, b, c = (rng.randint(0, 25) * 100 + rng.randint(0, 99) for _ in range(3))
+            deimos = (a // 100, a % 100, b // 100, b % 100)
+            phobos = (b // 100, b % 100, c // 100, c % 100)
+            self.assertSameAsPipeline(deimos + phobos)
+            self.assertSameAsPipeline(phobos + deimos)
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
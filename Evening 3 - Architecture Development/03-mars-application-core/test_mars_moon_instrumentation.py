@@ -0,0 +1,96 @@
+"""
+Test suite for mars_moon_instrumentation.py
+
+Tests call counts, branch outcomes and enabling/disabling of the instrumented pipeline.
+"""
+
+import json
+import unittest
+
+import mars_moon_core
+from mars_moon_core import moon_pipeline
+from mars_moon_instrumentation import Instrumentation, disable, enable, instrumented, is_enabled
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test per-component statistics of moon_pipeline"""
+
+    def tearDown(self):
+        disable()
+
+    def test_counts_calls_of_every_component(self):
+        """Test that each component is counted once per pipeline call."""
+        with instrumented() as stats:
+            for _ in range(3):
+                moon_pipeline(13, 91, 23, 5, 22, 5, 24, 45)
+        snapshot = stats.snapshot()
+        self.assertEqual({name: entry["calls"] for name, entry in snapshot.items()}, {
+            "TimeWindowParser": 3, "TimeWindowNormalizer": 3, "OverlapCalculator": 3, "DurationExtractor": 3,
+        })
+        self.assertTrue(all(entry["seconds"] >= 0 for entry in snapshot.values()))
+
+    def test_normalizer_branches(self):
+        """Test that every window is classified by its normalization case."""
+        with instrumented() as stats:
+            moon_pipeline(10, 0, 10, 0, 24, 53, 7, 12)   # full sol, wraparound split
+            moon_pipeline(10, 0, 0, 0, 5, 0, 6, 0)       # wraparound to midnight, simple
+        self.assertEqual(stats.snapshot()["TimeWindowNormalizer"]["branches"], {
+            "full_sol": 1, "simple": 1, "wraparound_split": 1, "wraparound_to_midnight": 1,
+        })
+
+    def test_overlap_and_twilight_branches(self):
+        """Test overlap, Twilight Rule and no-visibility outcomes."""
+        with instrumented() as stats:
+            moon_pipeline(13, 91, 23, 5, 22, 5, 24, 45)  # overlap
+            moon_pipeline(12, 32, 17, 6, 17, 6, 19, 78)  # twilight
+            moon_pipeline(5, 0, 6, 0, 7, 0, 8, 0)        # nothing
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["OverlapCalculator"]["branches"], {"no_overlap": 2, "overlap": 1})
+        self.assertEqual(snapshot["DurationExtractor"]["branches"],
+                         {"no_visibility": 1, "overlap": 1, "twilight_hit": 1})
+
+    def test_results_unchanged(self):
+        """Test that instrumented components return the same results."""
+        cases = [(13, 91, 23, 5, 22, 5, 24, 45), (24, 53, 7, 12, 5, 12, 8, 45), (12, 32, 17, 6, 17, 6, 19, 78)]
+        expected = [moon_pipeline(*case) for case in cases]
+        with instrumented():
+            self.assertEqual([moon_pipeline(*case) for case in cases], expected)
+
+    def test_disable_restores_original_components(self):
+        """Test that disabling puts the plain components back and stops counting."""
+        original = mars_moon_core._normalizer
+        stats = enable()
+        self.assertTrue(is_enabled())
+        self.assertIsNot(mars_moon_core._normalizer, original)
+        disable()
+        self.assertFalse(is_enabled())
+        self.assertIs(mars_moon_core._normalizer, original)
+        moon_pipeline(5, 0, 6, 0, 7, 0, 8, 0)
+        self.assertEqual(stats.parser.calls, 0)
+
+    def test_moon_is_instrumented_while_enabled(self):
+        """Test that moon() runs the instrumented pipeline while enabled, whatever the engine, and is restored."""
+        original = mars_moon_core.moon
+        with instrumented() as stats:
+            self.assertEqual(mars_moon_core.moon(12, 32, 17, 6, 17, 6, 19, 78), 1)
+        self.assertIs(mars_moon_core.moon, original)
+        self.assertEqual(stats.parser.calls, 1)
+        self.assertEqual(stats.snapshot()["DurationExtractor"]["branches"], {"twilight_hit": 1})
+
+    def test_enable_twice_rejected(self):
+        """Test that nested enabling is an error."""
+        enable()
+        with self.assertRaises(RuntimeError):
+            enable()
+
+    def test_shared_instrumentation_accumulates(self):
+        """Test that passing the same Instrumentation keeps accumulating; snapshot is JSON."""
+        stats = Instrumentation()
+        for _ in range(2):
+            with instrumented(stats):
+                moon_pipeline(5, 0, 6, 0, 7, 0, 8, 0)
+        self.assertEqual(json.loads(stats.to_json())["TimeWindowParser"]["calls"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
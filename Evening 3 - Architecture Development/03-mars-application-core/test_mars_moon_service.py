@@ -0,0 +1,222 @@
+"""
+Test suite for mars_moon_service.py
+
+Tests micro-batching, the localhost TCP protocol and the latency histograms.
+"""
+
+import asyncio
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the application core itself is stdlib-only
+    np = None
+
+from mars_moon_core import moon
+
+if np is not None:
+    from mars_moon_service import (
+        MAX_LINE_BYTES,
+        Histogram,
+        MicroBatcher,
+        MoonService,
+        fetch_stats,
+        parse_request,
+        query,
+    )
+
+
+def random_records(count, seed):
+    rng = random.Random(seed)
+    return [[rng.randint(0, 25) if i % 2 == 0 else rng.randint(0, 99) for i in range(8)] for _ in range(count)]
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestHistogram(unittest.TestCase):
+    """Test bucket counts and quantiles"""
+
+    def test_buckets_and_quantiles(self):
+        """Test that observations land in the first bucket whose bound is not below them."""
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 5, 20):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["buckets"], {"le_1": 2, "le_10": 1, "inf": 1})
+        self.assertEqual(snapshot["count"], 4)
+        self.assertEqual(snapshot["max"], 20)
+        self.assertEqual(histogram.quantile(0.5), 1)
+        self.assertEqual(histogram.quantile(0.99), 20)
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestMicroBatcher(unittest.IsolatedAsyncioTestCase):
+    """Test coalescing of concurrent queries"""
+
+    async def test_concurrent_queries_share_a_batch(self):
+        """Test that queries submitted together are evaluated in one call with correct results."""
+        calls = []
+        batcher = MicroBatcher(max_batch_size=1000, max_delay=0.01,
+                               evaluate=lambda rows: calls.append(len(rows)) or np.asarray(
+                                   [moon(*row) for row in rows.tolist()]))
+        records = random_records(50, seed=1)
+        results = await asyncio.gather(*(batcher.evaluate(row) for row in records))
+        self.assertEqual(results, [moon(*row) for row in records])
+        self.assertEqual(calls, [50])
+        self.assertEqual(batcher.stats()["batch_size"]["count"], 1)
+        self.assertEqual(batcher.stats()["latency_ms"]["count"], 50)
+
+    async def test_max_batch_size_flushes_early(self):
+        """Test that a full batch is evaluated without waiting for the delay."""
+        batcher = MicroBatcher(max_batch_size=8, max_delay=10.0)
+        records = random_records(24, seed=2)
+        results = await asyncio.wait_for(asyncio.gather(*(batcher.evaluate(row) for row in records)), timeout=1)
+        self.assertEqual(results, [moon(*row) for row in records])
+        self.assertEqual(batcher.stats()["batch_size"]["count"], 3)
+
+    async def test_evaluation_error_reaches_every_caller(self):
+        """Test that a failing batch fails all of its futures."""
+        def fail(rows):
+            raise ValueError("boom")
+        batcher = MicroBatcher(max_delay=0, evaluate=fail)
+        futures = [batcher.submit([0] * 8), batcher.submit([0] * 8)]
+        for future in futures:
+            with self.assertRaises(ValueError):
+                await future
+
+    async def test_bad_row_fails_only_its_own_request(self):
+        """Test that a row the vectorised call rejects does not fail the rest of its batch."""
+        batcher = MicroBatcher(max_batch_size=100, max_delay=0.01)
+        records = random_records(5, seed=3)
+        bad = batcher.submit([10 ** 20, 0, 0, 0, 0, 0, 0, 0])
+        good = [batcher.submit(row) for row in records]
+        self.assertEqual(await asyncio.gather(*good), [moon(*row) for row in records])
+        with self.assertRaises(OverflowError):
+            await bad
+        self.assertEqual(batcher.stats()["batch_size"]["count"], 1)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            MicroBatcher(max_batch_size=0)
+        with self.assertRaises(ValueError):
+            MicroBatcher(max_delay=-1)
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestMoonService(unittest.IsolatedAsyncioTestCase):
+    """Test the TCP service on localhost"""
+
+    async def asyncSetUp(self):
+        self.service = MoonService(MicroBatcher(max_batch_size=256, max_delay=0.005))
+        self.host, self.port = await self.service.start("127.0.0.1", 0)
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def test_many_clients(self):
+        """Test that concurrent clients each get their own results in order."""
+        clients = [random_records(5, seed=seed) for seed in range(40)]
+        results = await asyncio.gather(*(query(self.host, self.port, rows) for rows in clients))
+        for rows, answers in zip(clients, results):
+            self.assertEqual(answers, [moon(*row) for row in rows])
+        stats = await fetch_stats(self.host, self.port)
+        self.assertEqual(stats["latency_ms"]["count"], 200)
+        self.assertLess(stats["batch_size"]["count"], 200)
+
+    async def test_readme_examples(self):
+        """Test the README examples over the wire, including the Twilight Rule."""
+        rows = [[13, 91, 23, 5, 22, 5, 24, 45], [24, 53, 7, 12, 5, 12, 8, 45], [12, 32, 17, 6, 17, 6, 19, 78]]
+        self.assertEqual(await query(self.host, self.port, rows), [100, 200, 1])
+
+    async def test_malformed_request(self):
+        """Test that a bad line gets an error and later lines are still answered."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(b"1 2 3\n5,0,6,0,7,0,8,0\nnot numbers\n")
+        await writer.drain()
+        lines = [(await reader.readline()).decode().strip() for _ in range(3)]
+        writer.close()
+        await writer.wait_closed()
+        self.assertTrue(lines[0].startswith("ERR"))
+        self.assertEqual(lines[1], "0")
+        self.assertTrue(lines[2].startswith("ERR"))
+
+    async def test_out_of_range_request_shares_batch_with_good_ones(self):
+        """Test that an out-of-range request gets ERR while the requests around it are answered."""
+        rows = random_records(4, seed=4)
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        lines = [" ".join(map(str, row)) for row in rows[:2]] + ["100000000000000000000 0 0 0 0 0 0 0"]
+        lines += [" ".join(map(str, row)) for row in rows[2:]]
+        writer.write(("\n".join(lines) + "\n").encode())
+        await writer.drain()
+        answers = [(await reader.readline()).decode().strip() for _ in lines]
+        writer.close()
+        await writer.wait_closed()
+        self.assertTrue(answers[2].startswith("ERR"))
+        self.assertEqual([int(a) for a in answers[:2] + answers[3:]], [moon(*row) for row in rows])
+
+    async def test_over_long_line(self):
+        """Test that a line over the stream limit gets an error and the connection is closed."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(b"1 " * MAX_LINE_BYTES + b"\n5,0,6,0,7,0,8,0\n")
+        await writer.drain()
+        answer = (await asyncio.wait_for(reader.readline(), 5)).decode().strip()
+        rest = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        await writer.wait_closed()
+        self.assertTrue(answer.startswith("ERR line too long"))
+        self.assertEqual(rest, b"")
+        self.assertEqual(await query(self.host, self.port, [[5, 0, 6, 0, 7, 0, 8, 0]]), [0])
+
+    async def test_client_disconnects_mid_pipeline(self):
+        """Test that a connection whose client vanishes with requests in flight is cleaned up."""
+        service = MoonService(MicroBatcher(max_batch_size=64, max_delay=0.001), max_pending=8)
+        host, port = await service.start("127.0.0.1", 0)
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.write(b"".join(b"5 0 6 0 7 0 8 0\n" for _ in range(50_000)))
+            await asyncio.sleep(0.05)
+            writer.transport.abort()
+            for _ in range(500):
+                if not service._connections:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(service._connections, set())
+            self.assertEqual(await query(host, port, [[5, 0, 6, 0, 7, 0, 8, 0]]), [0])
+        finally:
+            await service.close()
+
+    async def test_full_queue_waits_for_the_sender(self):
+        """Test that queueing blocks while the queue is full and gives up once the sender stops."""
+        responses = asyncio.Queue(maxsize=1)
+        responses.put_nowait("first")
+        stop = asyncio.Event()
+
+        async def sender():
+            await stop.wait()
+            await responses.get()
+
+        task = asyncio.create_task(sender())
+        queued = asyncio.create_task(MoonService._queue(responses, task, "second"))
+        await asyncio.sleep(0.01)
+        self.assertFalse(queued.done())
+        stop.set()
+        self.assertTrue(await queued)
+        await task
+        self.assertFalse(await MoonService._queue(responses, task, "third"))
+
+    def test_parse_request(self):
+        self.assertEqual(parse_request(b"1, 2 3,4 5 6 7 8"), [1, 2, 3, 4, 5, 6, 7, 8])
+        with self.assertRaises(ValueError):
+            parse_request(b"1 2")
+        with self.assertRaises(ValueError):
+            parse_request(str(10 ** 20).encode() + b" 0 0 0 0 0 0 0")
+        with self.assertRaises(ValueError):
+            parse_request(b"26 0 0 0 0 0 0 0")
+        with self.assertRaises(ValueError):
+            parse_request(b"0 100 0 0 0 0 0 0")
+        with self.assertRaises(ValueError):
+            parse_request(b"0 -1 0 0 0 0 0 0")
+
+
+if __name__ == "__main__":
+    unittest.main()
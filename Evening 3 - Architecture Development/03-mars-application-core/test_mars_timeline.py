@@ -0,0 +1,94 @@
+"""
+Test suite for mars_timeline.py
+
+Tests the drift rule and the streaming per-sol / cumulative timeline.
+"""
+
+import unittest
+from dataclasses import astuple
+from itertools import islice
+
+from mars_moon_core import moon, TimeWindow
+from mars_timeline import SolVisibility, drifting_sols, shift_window, timeline
+
+
+class TestShiftWindow(unittest.TestCase):
+    """Test moving windows by a number of Mars-minutes"""
+
+    def test_shift_forward_and_back(self):
+        """Test that shifting carries minutes into hours both ways."""
+        self.assertEqual(shift_window(TimeWindow(5, 90, 7, 0), 20), TimeWindow(6, 10, 7, 20))
+        self.assertEqual(shift_window(TimeWindow(5, 10, 7, 0), -20), TimeWindow(4, 90, 6, 80))
+
+    def test_shift_across_midnight(self):
+        """Test that shifted windows wrap around midnight."""
+        self.assertEqual(shift_window(TimeWindow(24, 50, 1, 0), 100), TimeWindow(0, 50, 2, 0))
+        self.assertEqual(shift_window(TimeWindow(0, 10, 1, 0), -20), TimeWindow(24, 90, 0, 80))
+
+    def test_full_sol_stays_full(self):
+        """Test that a full-sol window (start == end) keeps start == end."""
+        shifted = shift_window(TimeWindow(10, 0, 10, 0), 1234)
+        self.assertEqual((shifted.start_h, shifted.start_m), (shifted.end_h, shifted.end_m))
+
+
+class TestDriftingSols(unittest.TestCase):
+    """Test the drift rule stream"""
+
+    def test_drift_per_sol(self):
+        """Test that sol n is shifted by n times the drift; bodies without drift stay put."""
+        sols = list(drifting_sols({"Deimos": TimeWindow(1, 0, 2, 0), "Phobos": TimeWindow(3, 0, 4, 0)},
+                                  drift={"Phobos": -50}, sols=3))
+        self.assertEqual([sol["Deimos"] for sol in sols], [[TimeWindow(1, 0, 2, 0)]] * 3)
+        self.assertEqual([sol["Phobos"] for sol in sols],
+                         [[TimeWindow(3, 0, 4, 0)], [TimeWindow(2, 50, 3, 50)], [TimeWindow(2, 0, 3, 0)]])
+
+    def test_infinite_stream_is_lazy(self):
+        """Test that an unbounded drift stream can be sliced."""
+        stream = drifting_sols({"Deimos": TimeWindow(1, 0, 2, 0)}, drift={"Deimos": 1})
+        self.assertEqual(len(list(islice(stream, 1000))), 1000)
+
+    def test_unknown_body_in_drift(self):
+        """Test that drift for a body without a window is rejected."""
+        with self.assertRaises(ValueError):
+            next(drifting_sols({"Deimos": TimeWindow(1, 0, 2, 0)}, drift={"Phobos": 5}))
+
+
+class TestTimeline(unittest.TestCase):
+    """Test per-sol and cumulative joint visibility"""
+
+    def test_constant_windows_accumulate(self):
+        """Test that an unchanged pattern adds the same minutes each sol."""
+        sols = [{"Deimos": [TimeWindow(13, 91, 23, 5)], "Phobos": [TimeWindow(22, 5, 24, 45)]}] * 4
+        self.assertEqual([entry.cumulative_minutes for entry in timeline(sols)], [100, 200, 300, 400])
+
+    def test_matches_moon_per_sol(self):
+        """Test each sol against moon() and the running total against their sum."""
+        windows = {"Deimos": TimeWindow(12, 32, 17, 6), "Phobos": TimeWindow(15, 0, 19, 78)}
+        entries = list(timeline(drifting_sols(windows, drift={"Phobos": 7}, sols=2500)))
+        total = 0
+        for entry, sol in zip(entries, drifting_sols(windows, drift={"Phobos": 7}, sols=2500)):
+            expected = moon(*astuple(sol["Deimos"][0]), *astuple(sol["Phobos"][0]))
+            total += expected
+            self.assertEqual((entry.minutes, entry.cumulative_minutes), (expected, total))
+
+    def test_twilight_sol(self):
+        """Test that a sol where the windows only touch counts 1 minute."""
+        sols = [{"Deimos": [TimeWindow(12, 32, 17, 6)], "Phobos": [TimeWindow(17, 6, 19, 78)]}]
+        self.assertEqual(list(timeline(sols)), [SolVisibility(sol=0, minutes=1, cumulative_minutes=1)])
+
+    def test_first_sol_numbering(self):
+        """Test that sol numbers start at first_sol."""
+        sols = [{"Deimos": [TimeWindow(1, 0, 2, 0)]}] * 2
+        self.assertEqual([entry.sol for entry in timeline(sols, first_sol=668)], [668, 669])
+
+    def test_consumes_lazily(self):
+        """Test that the timeline only pulls the sols it yields from an infinite stream."""
+        stream = drifting_sols({"Deimos": TimeWindow(1, 0, 5, 0), "Phobos": TimeWindow(3, 0, 9, 0)},
+                               drift={"Phobos": 1})
+        entries = list(islice(timeline(stream), 3))
+        self.assertEqual([entry.minutes for entry in entries], [200, 199, 198])
+        self.assertEqual(next(stream)["Phobos"], [TimeWindow(3, 3, 9, 3)])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
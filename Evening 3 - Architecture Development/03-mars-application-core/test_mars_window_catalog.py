@@ -0,0 +1,117 @@
+"""
+Test suite for mars_window_catalog.py
+
+Tests coverage and overlap queries, insertion and deletion, and compares the
+interval tree with a brute-force scan under random updates.
+"""
+
+import random
+import unittest
+
+from mars_moon_core import TimeWindow, TimeWindowNormalizer
+from mars_window_catalog import WindowCatalog
+
+normalizer = TimeWindowNormalizer()
+
+
+def random_window(rng):
+    return TimeWindow(rng.randint(0, 25), rng.randint(0, 99), rng.randint(0, 25), rng.randint(0, 99))
+
+
+def brute_covering(windows, minute):
+    return {key for key, window in windows.items()
+            if any(start <= minute < end for start, end in normalizer.normalize_window(window))}
+
+
+def brute_overlapping(windows, query):
+    query_intervals = normalizer.normalize_window(query)
+    return {key for key, window in windows.items()
+            if any(max(a_start, b_start) < min(a_end, b_end)
+                   for a_start, a_end in normalizer.normalize_window(window)
+                   for b_start, b_end in query_intervals)}
+
+
+class TestWindowCatalog(unittest.TestCase):
+    """Test WindowCatalog queries and updates"""
+
+    def setUp(self):
+        self.catalog = WindowCatalog({
+            "deimos-1": TimeWindow(24, 53, 7, 12),  # wraparound: [2453, 2500) + [0, 712)
+            "phobos-1": TimeWindow(5, 12, 8, 45),
+            "phobos-2": TimeWindow(17, 6, 19, 78),
+        }, seed=40)
+
+    def test_covering_minute(self):
+        """Test stabbing queries, including both parts of a wraparound window."""
+        self.assertEqual(self.catalog.covering(600), {"deimos-1", "phobos-1"})
+        self.assertEqual(self.catalog.covering(2460), {"deimos-1"})
+        self.assertEqual(self.catalog.covering(1000), set())
+
+    def test_covering_half_open_ends(self):
+        """Test that a window covers its start minute but not its end minute."""
+        self.assertIn("phobos-2", self.catalog.covering(1706))
+        self.assertNotIn("phobos-2", self.catalog.covering(1978))
+
+    def test_covering_minute_modulo_sol(self):
+        """Test that minute 2500 is midnight of the next sol."""
+        self.assertEqual(self.catalog.covering(2500), self.catalog.covering(0))
+
+    def test_overlapping_window(self):
+        """Test overlap queries, with and without wraparound on the query side."""
+        self.assertEqual(self.catalog.overlapping(TimeWindow(17, 0, 18, 0)), {"phobos-2"})
+        self.assertEqual(self.catalog.overlapping(TimeWindow(20, 0, 6, 0)), {"deimos-1", "phobos-1"})
+
+    def test_touching_windows_do_not_overlap(self):
+        """Test that sharing only a boundary point is not an overlap."""
+        self.assertEqual(self.catalog.overlapping(TimeWindow(12, 32, 17, 6)), set())
+
+    def test_full_sol_window(self):
+        """Test that a full-sol window covers every minute and overlaps everything."""
+        self.catalog.add("sun", TimeWindow(3, 0, 3, 0))
+        self.assertIn("sun", self.catalog.covering(1234))
+        self.assertEqual(self.catalog.overlapping(TimeWindow(3, 0, 3, 0)), set(self.catalog))
+
+    def test_remove(self):
+        """Test that removed windows no longer match and are returned."""
+        self.assertEqual(self.catalog.remove("deimos-1"), TimeWindow(24, 53, 7, 12))
+        self.assertEqual(self.catalog.covering(600), {"phobos-1"})
+        self.assertEqual(self.catalog.covering(2460), set())
+        self.assertNotIn("deimos-1", self.catalog)
+        self.assertEqual(len(self.catalog), 2)
+
+    def test_duplicate_and_missing_keys(self):
+        """Test that keys are unique and removing an unknown key fails."""
+        with self.assertRaises(KeyError):
+            self.catalog.add("phobos-1", TimeWindow(1, 0, 2, 0))
+        with self.assertRaises(KeyError):
+            self.catalog.remove("unknown")
+
+    def test_identical_windows_under_different_keys(self):
+        """Test that equal windows are stored and removed independently."""
+        self.catalog.add("copy", TimeWindow(5, 12, 8, 45))
+        self.assertEqual(self.catalog.covering(600), {"deimos-1", "phobos-1", "copy"})
+        self.catalog.remove("phobos-1")
+        self.assertEqual(self.catalog.covering(600), {"deimos-1", "copy"})
+
+    def test_matches_brute_force_under_random_updates(self):
+        """Test queries against a linear scan while windows are added and removed."""
+        rng = random.Random(400)
+        catalog = WindowCatalog(seed=4)
+        windows = {}
+        for step in range(3000):
+            if windows and rng.random() < 0.3:
+                key = rng.choice(list(windows))
+                self.assertEqual(catalog.remove(key), windows.pop(key))
+            else:
+                windows[step] = random_window(rng)
+                catalog.add(step, windows[step])
+            if step % 50 == 0:
+                minute = rng.randint(0, 2499)
+                self.assertEqual(catalog.covering(minute), brute_covering(windows, minute))
+                query = random_window(rng)
+                self.assertEqual(catalog.overlapping(query), brute_overlapping(windows, query))
+        self.assertEqual(len(catalog), len(windows))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
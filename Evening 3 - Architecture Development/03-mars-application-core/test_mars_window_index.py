@@ -0,0 +1,77 @@
+"""
+Test suite for mars_window_index.py
+
+Checks WindowIndex.query() and query_batch() against moon() for a fixed window.
+"""
+
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the application core itself is stdlib-only
+    np = None
+
+from mars_moon_core import moon, TimeWindow
+
+if np is not None:
+    from mars_window_index import WindowIndex
+
+FIXED_WINDOWS = [
+    (12, 32, 17, 6),  # simple
+    (24, 53, 7, 12),  # wraparound
+    (10, 0, 25, 0),  # ends at midnight
+    (0, 0, 5, 0),  # starts at midnight
+    (5, 0, 5, 0),  # full sol
+]
+
+
+def random_windows(count, seed):
+    rng = random.Random(seed)
+    return [[rng.randint(0, 25) if i % 2 == 0 else rng.randint(0, 99) for i in range(4)] for _ in range(count)]
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestWindowIndex(unittest.TestCase):
+    """Test the prefix-sum index for one fixed window"""
+
+    def test_coverage_and_boundaries(self):
+        """Test the cumulative coverage array and boundary table of a wraparound window."""
+        index = WindowIndex(TimeWindow(24, 53, 7, 12))
+        self.assertEqual(index.coverage[0], 0)
+        self.assertEqual(index.coverage[712], 712)
+        self.assertEqual(index.coverage[-1], 712 + 47)
+        self.assertEqual(np.flatnonzero(index.boundary).tolist(), [0, 712, 2453])
+
+    def test_requirement_examples(self):
+        """Test the REQ2/REQ3 examples with Deimos as the fixed window."""
+        self.assertEqual(WindowIndex.from_values(13, 91, 23, 5).query(22, 5, 24, 45), 100)
+        self.assertEqual(WindowIndex.from_values(24, 53, 7, 12).query(5, 12, 8, 45), 200)
+        self.assertEqual(WindowIndex.from_values(12, 32, 17, 6).query(17, 6, 19, 78), 1)
+        self.assertEqual(WindowIndex.from_values(5, 0, 6, 0).query(7, 0, 8, 0), 0)
+        self.assertEqual(WindowIndex.from_values(10, 0, 25, 0).query(0, 0, 5, 0), 1)
+
+    def test_query_matches_moon(self):
+        """Test scalar queries against the component pipeline."""
+        candidates = random_windows(2000, seed=38) + [[0, 0, 0, 0], [25, 0, 12, 0], [7, 12, 24, 53]]
+        for fixed in FIXED_WINDOWS:
+            index = WindowIndex.from_values(*fixed)
+            for candidate in candidates:
+                self.assertEqual(index.query(*candidate), moon(*fixed, *candidate), (fixed, candidate))
+
+    def test_query_batch_matches_moon(self):
+        """Test batched queries against the component pipeline."""
+        candidates = random_windows(2000, seed=380)
+        for fixed in FIXED_WINDOWS:
+            index = WindowIndex.from_values(*fixed)
+            expected = [moon(*fixed, *candidate) for candidate in candidates]
+            self.assertEqual(index.query_batch(np.array(candidates)).tolist(), expected)
+
+    def test_query_batch_rejects_wrong_shape(self):
+        """Test that batched queries need exactly 4 integers per row."""
+        with self.assertRaises(ValueError):
+            WindowIndex.from_values(1, 0, 2, 0).query_batch(np.zeros((3, 8), dtype=np.int64))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,190 @@
+"""
+Test suite for setup-python-venv.py
+
+Tests when requirements are (re)installed, what goes into the requirements stamp,
+the --recreate safety check, and the --all mode: discovering solutions, offline
+installs from the wheelhouse and per-solution failures. subprocess.run is mocked,
+so no venv is created and pip never runs.
+"""
+
+import contextlib
+import importlib.util
+import io
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# The script's file name is not a valid module name, so it is loaded from its path.
+_spec = importlib.util.spec_from_file_location("setup_python_venv", Path(__file__).with_name("setup-python-venv.py"))
+setup_python_venv = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(setup_python_venv)
+
+
+def fake_venv(command, **kwargs):
+    """Stand-in for ``python -m venv DIR``: lays out just what the script looks for."""
+    venv_dir = Path(command[-1])
+    (venv_dir / "bin").mkdir(parents=True)
+    (venv_dir / "bin" / "python3").touch()
+    (venv_dir / "pyvenv.cfg").write_text("version = 3.12.1\n", encoding="utf-8")
+    return subprocess.CompletedProcess(command, 0)
+
+
+class SolutionTestCase(unittest.TestCase):
+    """A temporary solution folder with a requirements.txt and an existing venv"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.solution = Path(tmp.name)
+        self.requirements = self.solution / "requirements.txt"
+        self.requirements.write_text("numpy>=1.26\n", encoding="utf-8")
+        self.venv = self.solution / "venv"
+        fake_venv([str(self.venv)])
+        self.python = self.venv / "bin" / "python3"
+
+    def install(self):
+        """Run maybe_install_requirements with pip mocked; returns the mock."""
+        with mock.patch.object(setup_python_venv.subprocess, "run") as run:
+            setup_python_venv.maybe_install_requirements(self.solution, self.python, skip=False, log=lambda _: None)
+        return run
+
+
+class TestRequirementsStamp(SolutionTestCase):
+    """Test that pip runs only when the requirements or the interpreter changed"""
+
+    def test_skips_install_on_matching_stamp(self):
+        self.assertEqual(self.install().call_count, 1)
+        self.assertTrue((self.venv / setup_python_venv.STAMP_NAME).exists())
+        self.install().assert_not_called()
+
+    def test_reinstalls_when_requirements_change(self):
+        self.install()
+        self.requirements.write_text("numpy>=2.0\n", encoding="utf-8")
+        self.assertEqual(self.install().call_count, 1)
+
+    def test_reinstalls_when_python_version_changes(self):
+        self.install()
+        (self.venv / "pyvenv.cfg").write_text("version = 3.13.0\n", encoding="utf-8")
+        self.assertEqual(self.install().call_count, 1)
+
+    def test_reinstalls_when_an_included_file_changes(self):
+        """Test that files pulled in with -r and -c are part of the stamp."""
+        (self.solution / "base.txt").write_text("-c constraints.txt\nrequests\n", encoding="utf-8")
+        (self.solution / "constraints.txt").write_text("requests==2.31.0\n", encoding="utf-8")
+        self.requirements.write_text("-r base.txt\nnumpy\n", encoding="utf-8")
+        self.install()
+        self.install().assert_not_called()
+        (self.solution / "constraints.txt").write_text("requests==2.32.0\n", encoding="utf-8")
+        self.assertEqual(self.install().call_count, 1)
+
+    def test_include_forms_and_cycles(self):
+        for name in ("a.txt", "b.txt", "c.txt"):
+            (self.solution / name).write_text("-r requirements.txt\n", encoding="utf-8")
+        self.requirements.write_text("-ra.txt\n--requirement=b.txt\n--constraint c.txt  # pins\n",
+                                     encoding="utf-8")
+        included = setup_python_venv._included_files(self.requirements)
+        self.assertEqual([path.name for path in included], ["requirements.txt", "a.txt", "b.txt", "c.txt"])
+
+    def test_failed_install_is_retried(self):
+        with mock.patch.object(setup_python_venv.subprocess, "run",
+                               side_effect=subprocess.CalledProcessError(1, "pip")):
+            with self.assertRaises(subprocess.CalledProcessError):
+                setup_python_venv.maybe_install_requirements(self.solution, self.python, skip=False,
+                                                             log=lambda _: None)
+        self.assertFalse((self.venv / setup_python_venv.STAMP_NAME).exists())
+        self.assertEqual(self.install().call_count, 1)
+
+
+class TestRecreate(SolutionTestCase):
+    """Test --recreate"""
+
+    def recreate(self):
+        with mock.patch.object(setup_python_venv.subprocess, "run", side_effect=fake_venv) as run:
+            python = setup_python_venv.create_or_reuse_venv(self.solution, recreate=True, log=lambda _: None)
+        return python, run
+
+    def test_rebuilds_a_virtual_environment(self):
+        (self.venv / "leftover").touch()
+        python, run = self.recreate()
+        self.assertEqual(python, self.python)
+        self.assertEqual(run.call_args.args[0][1:], ["-m", "venv", str(self.venv)])
+        self.assertFalse((self.venv / "leftover").exists())
+
+    def test_refuses_a_folder_without_pyvenv_cfg(self):
+        (self.venv / "pyvenv.cfg").unlink()
+        with self.assertRaisesRegex(SystemExit, "pyvenv.cfg"):
+            self.recreate()
+        self.assertTrue(self.python.exists())
+
+
+class TestAll(unittest.TestCase):
+    """Test the --all mode on a tree of solution folders"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name).resolve()
+        self.wheelhouse = self.root / ".wheelhouse"
+        for name in ("alpha", "beta", "nested/gamma"):
+            (self.root / name).mkdir(parents=True)
+            (self.root / name / "requirements.txt").write_text(f"{name.rsplit('/')[-1]}-lib\n", encoding="utf-8")
+        self.solutions = [self.root / "alpha", self.root / "beta", self.root / "nested" / "gamma"]
+
+    def test_discovers_solutions(self):
+        """Test that venvs, hidden folders and folders without a requirements.txt are skipped."""
+        for skipped in ("alpha/venv", ".hidden", "node_modules/pkg"):
+            (self.root / skipped).mkdir(parents=True)
+            (self.root / skipped / "requirements.txt").touch()
+        (self.root / "docs").mkdir()
+        self.assertEqual(setup_python_venv.discover_solutions([self.root, self.root / "beta"]), self.solutions)
+
+    def test_installs_offline_from_the_wheelhouse(self):
+        fake_venv([str(self.root / "alpha" / "venv")])
+        python = self.root / "alpha" / "venv" / "bin" / "python3"
+        with mock.patch.object(setup_python_venv.subprocess, "run") as run:
+            setup_python_venv.maybe_install_requirements(self.root / "alpha", python, skip=False,
+                                                         wheelhouse=self.wheelhouse, log=lambda _: None)
+        self.assertEqual(run.call_args.args[0], [
+            str(python), "-m", "pip", "install", "--no-index", "--find-links", str(self.wheelhouse),
+            "-r", str(self.root / "alpha" / "requirements.txt"),
+        ])
+
+    def test_builds_wheels_once_per_requirements_file(self):
+        with mock.patch.object(setup_python_venv.subprocess, "run") as run, \
+                contextlib.redirect_stdout(io.StringIO()):
+            setup_python_venv.build_wheelhouse(self.solutions, self.wheelhouse)
+            self.assertEqual([call.args[0][-1] for call in run.call_args_list],
+                             [str(solution / "requirements.txt") for solution in self.solutions])
+            self.assertEqual(run.call_args.args[0][:4], [sys.executable, "-m", "pip", "wheel"])
+            run.reset_mock()
+            setup_python_venv.build_wheelhouse(self.solutions, self.wheelhouse)
+            run.assert_not_called()
+
+    def test_failed_solution_does_not_stop_the_others(self):
+        """Test that one failing pip install is reported in the table while the other solutions finish."""
+        def run(command, **kwargs):
+            if command[1:3] == ["-m", "venv"]:
+                return fake_venv(command)
+            if command[3] == "install" and "beta" in command[-1]:
+                raise subprocess.CalledProcessError(1, command, output=b"Collecting beta-lib\n",
+                                                    stderr=b"ERROR: No matching distribution found for beta-lib\n")
+            return subprocess.CompletedProcess(command, 0)
+
+        output = io.StringIO()
+        with mock.patch.object(setup_python_venv.subprocess, "run", side_effect=run), \
+                contextlib.redirect_stdout(output):
+            status = setup_python_venv.bootstrap_all([self.root], self.wheelhouse, jobs=3, recreate=False,
+                                                     skip=False)
+        self.assertEqual(status, 1)
+        report = output.getvalue()
+        self.assertIn("FAILED: ERROR: No matching distribution found for beta-lib", report)
+        self.assertIn("2/3 solution(s) ready", report)
+        for solution in self.solutions:
+            self.assertEqual((solution / "venv" / setup_python_venv.STAMP_NAME).exists(), solution.name != "beta")
+
+
+if __name__ == "__main__":
+    unittest.main()